@@ -0,0 +1,163 @@
+"""Candidate retrieval for very large catalogs: an inverted-file index.
+
+Most of the fit score is mean absolute difference over P and A, plus a
+capability term over C, so jobs close to the user under the weighted L1
+distance
+
+    W_P/|P| * |P_user - P_job|_1  +  W_A/|A| * |A_user - A_job|_1  +  W_C/|C| * |C_user - C_job|_1
+
+(weights of the scoring config the index is built for, see scoring.py)
+tend to score highest. `build_index` clusters jobs with k-medians (the L1 centre of a
+cluster is its per-dimension median) and keeps one inverted list of job ids
+per cluster. The centres form a small `JobMatrix` (X is the
+per-list majority), so `CandidateIndex.search` ranks lists by the ordinary
+`fit_scores` of their centre under the same config and takes whole lists
+until enough candidates are collected; only those jobs then get the full
+score (capability, exclusions, education, alignment, skills).
+
+The result is approximate: a job can reach the top through adjustments
+while sitting in a low-ranked list. Measure recall against exhaustive
+scoring with `python -m benchmarks.bench_ann`.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from matcher import JobMatrix, fit_scores
+from scoring import DEFAULT_CONFIG, ScoringConfig
+
+N_CANDIDATES = 5000  # default jobs returned per query
+ANN_MIN_JOBS = 100_000  # below this, exhaustive scoring is cheap enough
+_ASSIGN_BLOCK = 1 << 20  # distances per block while assigning jobs to clusters
+
+
+@dataclass(frozen=True)
+class CandidateIndex:
+    """Inverted lists over the P/A/C vectors of a `JobMatrix`."""
+
+    centroids: JobMatrix  # one representative job per list
+    offsets: np.ndarray  # (n_lists + 1,) list boundaries in `order`
+    order: np.ndarray  # job ids grouped by list, ascending within a list
+    weights: tuple[float, float, float]  # P, A, C weights the jobs were clustered with
+
+    def __len__(self) -> int:
+        return int(self.order.shape[0])
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+    def search(
+        self,
+        user: dict,
+        n_candidates: int = N_CANDIDATES,
+        mask: np.ndarray | None = None,
+        config: ScoringConfig = DEFAULT_CONFIG,
+    ) -> np.ndarray:
+        """Catalog indices (ascending) of about `n_candidates` jobs likely to fit `user` best.
+
+        Whole lists are taken, best centre first under `config` (whose
+        weights should be the ones the index was built with), until
+        `n_candidates` jobs are collected. With `mask` (one bool per job, e.g.
+        jobs that escape heavy penalties), lists keep being taken until
+        `n_candidates` masked jobs are collected too, keeping only masked jobs
+        from the extra lists. Returns every job if the index holds fewer.
+        """
+        lists = np.argsort(-fit_scores(user, self.centroids, config), kind="stable")
+        taken = self._lists_for(lists, np.diff(self.offsets), n_candidates)
+        out = self._jobs(lists[:taken])
+        if mask is not None:
+            hits = np.concatenate([[0], np.cumsum(mask[self.order])])
+            extra = self._lists_for(lists, hits[self.offsets[1:]] - hits[self.offsets[:-1]], n_candidates)
+            if extra > taken:
+                more = self._jobs(lists[taken:extra])
+                out = np.concatenate([out, more[mask[more]]])
+        out.sort()
+        return out
+
+    @staticmethod
+    def _lists_for(lists: np.ndarray, sizes: np.ndarray, n: int) -> int:
+        """How many of `lists` (in order) it takes to collect `n` jobs."""
+        return int(np.searchsorted(np.cumsum(sizes[lists]), n)) + 1
+
+    def _jobs(self, lists: np.ndarray) -> np.ndarray:
+        if not len(lists):
+            return np.empty(0, dtype=self.order.dtype)
+        return np.concatenate([self.order[self.offsets[c]:self.offsets[c + 1]] for c in lists.tolist()])
+
+
+def _vectors(matrix: JobMatrix) -> np.ndarray:
+    v = np.concatenate([matrix.P, matrix.A, matrix.C], axis=1).astype(np.float32)
+    nan = np.isnan(v)
+    if nan.any():
+        # Missing keys: place the job at the column median so it stays reachable.
+        v[nan] = np.take(np.nanmedian(v, axis=0), np.nonzero(nan)[1])
+    return v
+
+
+def _assign(v: np.ndarray, centroids: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Nearest centre of each row of `v` under weighted L1."""
+    out = np.empty(len(v), dtype=np.int32)
+    step = max(1, _ASSIGN_BLOCK // len(centroids))
+    for s in range(0, len(v), step):
+        block = v[s:s + step]
+        dist = np.zeros((len(block), len(centroids)), dtype=np.float32)
+        diff = np.empty_like(dist)
+        for j, w in enumerate(weights.tolist()):
+            np.subtract(block[:, j, None], centroids[None, :, j], out=diff)
+            np.abs(diff, out=diff)
+            diff *= w
+            dist += diff
+        out[s:s + step] = dist.argmin(axis=1)
+    return out
+
+
+def build_index(
+    matrix: JobMatrix,
+    n_lists: int | None = None,
+    iters: int = 8,
+    sample_per_list: int = 64,
+    seed: int = 0,
+    config: ScoringConfig = DEFAULT_CONFIG,
+) -> CandidateIndex:
+    """Cluster the jobs of `matrix` into `n_lists` (default ~sqrt(N)) inverted lists.
+
+    Centres are trained with k-medians on a sample of `sample_per_list`
+    jobs per list, then every job is assigned to its nearest centre, under
+    the distance weighted by `config.weights`.
+    """
+    v = _vectors(matrix)
+    n = len(v)
+    n_lists = max(1, min(n, n_lists or int(np.sqrt(n))))
+    dims = zip((matrix.p_keys, matrix.a_keys, matrix.c_keys), config.weights)
+    weights = np.concatenate([np.full(len(keys), w / max(1, len(keys))) for keys, w in dims]).astype(np.float32)
+
+    rng = np.random.default_rng(seed)
+    sample = n_lists * sample_per_list
+    train = v[rng.choice(n, size=sample, replace=False)] if n > sample else v
+    centres = train[rng.choice(len(train), size=n_lists, replace=False)].copy()
+    for _ in range(iters):
+        assign = _assign(train, centres, weights)
+        by_list = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(assign[by_list], np.arange(n_lists + 1))
+        for c in range(n_lists):
+            if bounds[c + 1] > bounds[c]:  # empty clusters keep their centre
+                centres[c] = np.median(train[by_list[bounds[c]:bounds[c + 1]]], axis=0)
+
+    assign = _assign(v, centres, weights)
+    order = np.argsort(assign, kind="stable").astype(np.int64)
+    offsets = np.searchsorted(assign[order], np.arange(n_lists + 1)).astype(np.int64)
+
+    # Exclusion flags of a list's centre: the majority of its jobs.
+    votes = np.concatenate([np.zeros((1, matrix.X.shape[1]), dtype=np.int64), np.cumsum(matrix.X[order], axis=0)])
+    x = (votes[offsets[1:]] - votes[offsets[:-1]]) * 2 > np.diff(offsets)[:, None]
+    p, a = len(matrix.p_keys), len(matrix.a_keys)
+    centroids = JobMatrix(
+        matrix.p_keys, matrix.a_keys, matrix.c_keys, matrix.x_keys,
+        P=centres[:, :p].astype(np.float64),
+        A=centres[:, p:p + a].astype(np.float64),
+        C=centres[:, p + a:].astype(np.float64),
+        X=x,
+    )
+    return CandidateIndex(centroids=centroids, offsets=offsets, order=order, weights=config.weights)
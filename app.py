@@ -1,8 +1,31 @@
+import importlib
+import logging
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
-import json
-import re
-from pathlib import Path
-from matcher import fit_score
+import telemetry
+from background import BackgroundJob
+from cache import ResultCache
+from inputs import (
+    SKILL_CHIPS,
+    edu_to_01,
+    exp_to_01,
+    extract_domains_from_text,
+    extract_other_tags,
+    extract_skills_from_text,
+    learning_to_01,
+)
+
+RESULT_CACHE_ENTRIES = 32
+RESULT_CACHE_BYTES = 8 * 1024 * 1024
+DEBUG_TRACES = 20  # compute requests kept per session for the debug panel
+COMPUTE_WORKERS = 4  # background scoring threads shared by all sessions (and the startup load)
+RESULT_PAGES = 10  # pages ranked per section when results are computed
+
+logger = logging.getLogger(__name__)
 
 # -----------------------------
 # Page setup
@@ -12,205 +35,58 @@ st.title("Career Fit")
 st.caption("Profile → match → explainable recommendations")
 
 # -----------------------------
-# Load jobs (robust paths)
-# -----------------------------
-@st.cache_data
-def load_jobs():
-    candidates = [
-        Path("jobs_onet_mvp.json"),
-        Path("jobs_onet_mvp_v2.json"),
-        Path("data/jobs_onet_mvp.json"),
-        Path("data/jobs_onet_mvp_v2.json"),
-    ]
-    for p in candidates:
-        if p.exists():
-            with p.open("r", encoding="utf-8") as f:
-                return json.load(f), p.name
-    st.error("Jobs dataset not found. Put jobs_onet_mvp.json in the same folder as app.py.")
-    st.stop()
-
-jobs, jobs_filename = load_jobs()
-
-# -----------------------------
-# Normalizers
-# -----------------------------
-def edu_to_01(level: str) -> float:
-    mapping = {
-        "High school": 0.25,
-        "Associate / Diploma": 0.40,
-        "Bachelor’s": 0.55,
-        "Master’s": 0.70,
-        "PhD / Doctorate": 0.90,
-        "Other / Prefer not to say": 0.50,
-    }
-    return mapping.get(level, 0.50)
-
-
-def exp_to_01(bucket: str) -> float:
-    mapping = {"0–2": 0.20, "3–5": 0.40, "6–10": 0.60, "10+": 0.80}
-    return mapping.get(bucket, 0.40)
-
-
-def learning_to_01(choice: str) -> float:
-    mapping = {
-        "Prefer mastery of what I know": 0.30,
-        "Comfortable learning gradually": 0.60,
-        "Actively seek steep learning curves": 0.90,
-    }
-    return mapping.get(choice, 0.60)
-
-
-def jobzone_required_edu(job_zone: int) -> float:
-    return {1: 0.30, 2: 0.45, 3: 0.60, 4: 0.75, 5: 0.90}.get(int(job_zone), 0.60)
-
-
-def categorize(score_pct: float) -> str:
-    if score_pct >= 80:
-        return "Best Fit"
-    if score_pct >= 65:
-        return "Strong Fit"
-    if score_pct >= 55:
-        return "Safe Fit"
-    return "Low Fit"
-
-# -----------------------------
-# Domain extraction (Education/Training → domain tags)
+# Scoring engine (loaded in the background)
 # -----------------------------
-DOMAIN_PATTERNS = {
-    "Construction / Infrastructure": [
-        r"civil", r"construction", r"infrastructure", r"structural", r"geotechn", r"transport", r"highway", r"bridge", r"tunnel",
-        r"architecture", r"real estate", r"facility", r"facilities", r"building", r"bim", r"project controls",
-    ],
-    "Engineering": [r"engineering", r"mechanical", r"electrical", r"industrial", r"chemical", r"manufact", r"systems"],
-    "Business / Operations": [r"business", r"management", r"operations", r"strategy", r"mba", r"supply chain", r"logistics"],
-    "Finance": [r"finance", r"accounting", r"cfa", r"audit", r"econom"],
-    "Policy / Public": [r"policy", r"public", r"government", r"regulation", r"urban", r"planning"],
-    "Sustainability / ESG": [r"sustain", r"esg", r"climate", r"circular"],
-    "Technology / IT": [r"computer", r"software", r"data", r"ai", r"machine learning", r"it", r"cyber", r"cloud"],
-    "Health": [r"nursing", r"medical", r"health", r"clinic", r"pharm"],
-    "Education": [r"teacher", r"teaching", r"education", r"curriculum"],
-    "Writing / Communication": [r"writing", r"writer", r"communication", r"proposal", r"report", r"editor", r"journal"],
-}
-
-
-def extract_domains_from_text(text: str) -> list[str]:
-    if not text:
-        return []
-    t = text.lower()
-    found = []
-    for domain, pats in DOMAIN_PATTERNS.items():
-        for pat in pats:
-            if re.search(pat, t):
-                found.append(domain)
-                break
-    # de-duplicate while preserving order
-    seen = set()
-    out = []
-    for d in found:
-        if d not in seen:
-            seen.add(d)
-            out.append(d)
-    return out
-
-
-def job_domains(job: dict) -> list[str]:
-    """Derive rough domains from job family + title keywords (MVP)."""
-    fam = (job.get("job_family") or "").lower()
-    title = (job.get("title") or "").lower()
-    d = []
-
-    # family-based
-    if any(k in fam for k in ["construction", "architecture", "maintenance", "facility", "real estate", "building", "engineering"]):
-        d.append("Construction / Infrastructure")
-    if any(k in fam for k in ["engineering", "production", "installation", "repair"]):
-        d.append("Engineering")
-    if any(k in fam for k in ["business", "finance", "management", "office", "administration"]):
-        d.append("Business / Operations")
-    if "finance" in fam:
-        d.append("Finance")
-    if any(k in fam for k in ["education", "training", "library"]):
-        d.append("Education")
-    if any(k in fam for k in ["health", "medical", "healthcare"]):
-        d.append("Health")
-    if any(k in fam for k in ["computer", "it", "technology"]):
-        d.append("Technology / IT")
-    if any(k in fam for k in ["legal", "protective", "public", "community", "social"]):
-        d.append("Policy / Public")
-
-    # title keywords
-    if any(k in title for k in ["policy", "compliance", "planner", "planning", "regulatory"]):
-        d.append("Policy / Public")
-    if any(k in title for k in ["sustain", "esg", "environment", "climate", "circular"]):
-        d.append("Sustainability / ESG")
-    if any(k in title for k in ["writer", "writing", "editor", "proposal", "report", "communications"]):
-        d.append("Writing / Communication")
-    if any(k in title for k in ["software", "developer", "data", "analyst", "cyber", "network"]):
-        d.append("Technology / IT")
-
-    # de-duplicate
-    seen = set()
-    out = []
-    for x in d:
-        if x not in seen:
-            seen.add(x)
-            out.append(x)
-    return out
-
-# -----------------------------
-# Skills selection (chips + free text)
-# -----------------------------
-SKILL_CHIPS = [
-    "Writing / Communication",
-    "Research",
-    "Project Management",
-    "Stakeholder Management",
-    "Analytical Thinking",
-    "Finance / Budgeting",
-    "Operations",
-    "Leadership",
-    "Technical Engineering",
-    "Design / Creative",
-    "Data / Coding",
-]
-
-SKILL_PATTERNS = {
-    "Writing / Communication": [r"writing", r"writer", r"proposal", r"report", r"communication", r"editing", r"editor"],
-    "Research": [r"research", r"academic", r"publication", r"journal", r"study"],
-    "Project Management": [r"project", r"pmp", r"schedule", r"controls", r"planning"],
-    "Stakeholder Management": [r"stakeholder", r"client", r"negotiat", r"facilitat"],
-    "Analytical Thinking": [r"analysis", r"analytical", r"data", r"model"],
-    "Finance / Budgeting": [r"budget", r"finance", r"cost", r"capex", r"opex"],
-    "Operations": [r"operations", r"process", r"delivery", r"lean"],
-    "Leadership": [r"leader", r"manage", r"director"],
-    "Technical Engineering": [r"engineering", r"civil", r"mechanical", r"electrical", r"structural"],
-    "Design / Creative": [r"design", r"creative", r"ux", r"graphic"],
-    "Data / Coding": [r"python", r"sql", r"coding", r"software", r"developer"],
-}
-
-
-def extract_skills_from_text(text: str) -> list[str]:
-    if not text:
-        return []
-    t = text.lower()
-    found = []
-    for skill, pats in SKILL_PATTERNS.items():
-        for pat in pats:
-            if re.search(pat, t):
-                found.append(skill)
-                break
-    seen = set()
-    out = []
-    for s in found:
-        if s not in seen:
-            seen.add(s)
-            out.append(s)
-    return out
+# Only Streamlit and the form helpers are imported up front. numpy, the
+# engine, the catalog and the scoring config load on a pool thread started
+# by the first run of each process, so the form is drawn right away; the
+# first "Compute results" waits for the load if it is still running.
+@st.cache_resource
+def compute_pool():
+    # Shared by every session; numpy releases the GIL while scoring.
+    return ThreadPoolExecutor(max_workers=COMPUTE_WORKERS, thread_name_prefix="compute")
+
+
+def start_engine():
+    """Import the compute path and load the catalog and scoring config; returns both stores.
+
+    Load errors are not kept: the run that needs the data calls `.current()`
+    again, which retries and raises them.
+    """
+    importlib.import_module("whatif")  # imports engine, numpy and the rest of the compute path
+    from scoring import ConfigStore
+    from store import CatalogStore
+
+    stores = CatalogStore(), ConfigStore()
+    for store in stores:
+        try:
+            store.current()
+        except (OSError, ValueError):
+            pass
+    return stores
+
+
+@st.cache_resource
+def engine_stores():
+    # One catalog store and one scoring config store per process, shared by
+    # every session. The catalog and feature arrays are memory-mapped from
+    # files built once per host (see store.py); a changed dataset or
+    # scoring.json is picked up by the next run without a restart.
+    return compute_pool().submit(start_engine)
+
+engine_loading = engine_stores()
+
+# Stage timings are recorded only for sessions that can see them (?debug=1)
+# or when CAREER_FIT_TELEMETRY=1; otherwise spans are no-ops.
+debug = telemetry.ENABLED or st.query_params.get("debug") == "1"
+if debug and "telemetry" not in st.session_state:
+    st.session_state.telemetry = {"traces": deque(maxlen=DEBUG_TRACES), "counters": {}}
 
 # -----------------------------
 # UI — Assessment
 # -----------------------------
 st.subheader("Assessment")
-st.caption(f"Dataset: {jobs_filename} · Occupations loaded: {len(jobs)}")
+dataset_caption = st.empty()  # filled in once the catalog is loaded
 
 with st.expander("1) Work style & personality", expanded=True):
     P_user = {
@@ -251,16 +127,8 @@ with st.expander("3) Education/Training", expanded=True):
 
     # Interpret tags (MVP: deterministic keyword extraction)
     inferred_domains = extract_domains_from_text(edu_free_text)
-    inferred_other = []
     # show degree/cert info as 'other' (not used for strict alignment)
-    if re.search(r"\bphd\b|doctor", (edu_free_text or "").lower()):
-        inferred_other.append("PhD-level")
-    if re.search(r"\bmsc\b|master", (edu_free_text or "").lower()):
-        inferred_other.append("Master’s")
-    if re.search(r"\bbsc\b|bachelor", (edu_free_text or "").lower()):
-        inferred_other.append("Bachelor’s")
-    if re.search(r"\bpmp\b", (edu_free_text or "").lower()):
-        inferred_other.append("PMP")
+    inferred_other = extract_other_tags(edu_free_text)
 
     st.markdown("**Interpreted tags (preview)**")
     if inferred_domains:
@@ -305,13 +173,18 @@ with st.expander("3) Education/Training", expanded=True):
         "Education flexibility",
         ["Strict", "Flexible", "Transform"],
         index=0,
-        help="Strict: only current education. Flexible: allow certifications/short training. Transform: allow new degree if match is excellent.",
+        help=(
+            "Strict: only current education. Flexible: allow certifications/short training. "
+            "Transform: allow new degree if match is excellent."
+        ),
     )
     time_months = st.slider("Willing to invest time in learning (months)", 0, 24, 6)
 
 with st.expander("4) Skills to Consider", expanded=True):
     skills_selected = st.multiselect("Select strengths to prioritize (up to 5)", SKILL_CHIPS, default=[], max_selections=5)
-    skills_free_text = st.text_input("Add another skill (free text)", placeholder="e.g., technical writing, proposal writing, academic publishing")
+    skills_free_text = st.text_input(
+        "Add another skill (free text)", placeholder="e.g., technical writing, proposal writing, academic publishing"
+    )
 
     inferred_skills = extract_skills_from_text(skills_free_text)
     all_skills = []
@@ -338,184 +211,402 @@ C_user = {
 
 user = {"P": P_user, "A": A_user, "C": C_user, "X": X_user}
 
-# Debug line so you can confirm UI is live
-st.caption(
-    f"Debug: income={A_user['income']:.2f} | purpose={A_user['purpose']:.2f} | learning={C_user['learning']:.2f} | strict_alignment={strict_alignment}"
-)
+# Debug panel (filled in at the end of the run, once this run's timings exist)
+debug_panel = st.container() if debug else None
 
 st.divider()
 
-# -----------------------------
-# Scoring helpers: strict alignment + skills boosts
-# -----------------------------
-def alignment_penalty(job_dom: list[str], user_dom: list[str], enabled: bool) -> float:
-    if not enabled:
-        return 0.0
-    if not user_dom:
-        # If user gave no domains, do not suppress.
-        return 0.0
-    if any(d in job_dom for d in user_dom):
-        return 0.0
-    # strong suppression (not absolute zero so list isn't empty)
-    return 0.85
-
-
-def skill_boost(job: dict, user_skills: list[str]) -> float:
-    """Return multiplicative boost factor, e.g., 1.00–1.12."""
-    if not user_skills:
-        return 1.0
-    title = (job.get("title") or "").lower()
-    fam = (job.get("job_family") or "").lower()
-    boost = 1.0
-
-    # Writing/communication boost
-    if "Writing / Communication" in user_skills:
-        if any(k in title for k in ["writer", "writing", "proposal", "editor", "communications", "report"]):
-            boost *= 1.10
-        elif any(k in fam for k in ["legal", "education", "community", "social", "business"]):
-            boost *= 1.04
-
-    # Project management boost
-    if "Project Management" in user_skills:
-        if any(k in title for k in ["project", "manager", "planner", "controls", "coordinator"]):
-            boost *= 1.08
-
-    # Technical engineering boost
-    if "Technical Engineering" in user_skills:
-        if any(k in title for k in ["engineer", "engineering", "architect", "surveyor"]):
-            boost *= 1.06
-
-    # Research boost
-    if "Research" in user_skills:
-        if any(k in title for k in ["research", "scientist", "economist", "analyst"]):
-            boost *= 1.05
-
-    # Cap boost to avoid distortion
-    return min(boost, 1.15)
-
-
-def education_penalty(gap: float, mode: str) -> float:
-    if gap <= 0:
-        return 0.0
-    if mode == "Strict":
-        return 0.60
-    if mode == "Flexible":
-        return min(0.35, gap * 0.35)
-    return min(0.15, gap * 0.15)
-
 # -----------------------------
 # Compute results
 # -----------------------------
-if st.button("Compute results"):
-    # Use edited domains if present
-    user_domains = st.session_state.get("domains", inferred_domains)
-
-    results = []
-    for job in jobs:
-        base = fit_score(user, job)  # 0–100
-
-        jz = int(job.get("job_zone", 3))
-        required = jobzone_required_edu(jz)
-        gap = max(0.0, required - C_user["education"])
-        epen = education_penalty(gap, edu_mode)
-
-        jdom = job_domains(job)
-        apen = alignment_penalty(jdom, user_domains, strict_alignment)
-
-        boosted = base * (1.0 - epen) * (1.0 - apen)
-        boosted = boosted * skill_boost(job, all_skills)
-
-        final = round(min(100.0, boosted), 1)
-
-        results.append({
-            "title": job.get("title", "Unknown"),
-            "family": job.get("job_family", "Unknown"),
-            "job_zone": jz,
-            "score": final,
-            "edu_gap": round(gap, 2),
-            "domains": jdom,
-            "category": categorize(final),
-        })
-
-    results.sort(key=lambda x: x["score"], reverse=True)
-
-    st.subheader("Your Results")
-
-    # Summary chips
-    col1, col2 = st.columns(2)
-    with col1:
-        st.markdown("**Education/Training domains (alignment):**")
-        st.write(", ".join(user_domains) if user_domains else "(none)")
-    with col2:
-        st.markdown("**Skills prioritized:**")
-        st.write(", ".join(all_skills) if all_skills else "(none)")
-
-    # Ready Now vs Best Potential
-    ready_now = [r for r in results if r["edu_gap"] <= 0.01]
-    best_potential = [r for r in results if r["edu_gap"] > 0.01]
-
-    st.markdown("## ✅ Best Fit (Aligned)")
-    shown = 0
-    for r in results:
-        if strict_alignment and user_domains and not any(d in r["domains"] for d in user_domains):
-            continue
-        st.metric(f"{r['title']} · {r['family']}", f"{r['score']}%")
-        st.caption(f"Fit: {r['category']} | Job Zone: {r['job_zone']} | Domains: {', '.join(r['domains']) if r['domains'] else '—'}")
-        shown += 1
-        if shown >= 5:
-            break
-    if shown == 0:
+def keep_results():
+    # Opening the suppressed expander reruns the script: keep the results up.
+    st.session_state.keep_results = True
+
+
+def page_size(name):
+    # ranking imports numpy, so it is not imported at startup.
+    from ranking import SECTION_SIZE, SUPPRESSED_SIZE
+
+    return SUPPRESSED_SIZE if name == "suppressed" else SECTION_SIZE
+
+
+@st.cache_resource
+def assessment_store():
+    # Shared by every session; None when CAREER_FIT_ASSESSMENTS="" turns saving off.
+    from assessments import ASSESSMENTS_PATH, AssessmentStore
+
+    return AssessmentStore(ASSESSMENTS_PATH) if ASSESSMENTS_PATH else None
+
+
+def save_assessment(profile, scores, ranked):
+    """Keep the session's latest profile and top results, so they are re-ranked when the catalog changes.
+
+    Skipped when neither changed since this session last saved them (e.g. a
+    repeated press that hits the result cache).
+    """
+    import sqlite3
+
+    from assessments import TOP_K, Assessment, top_sections
+
+    store = assessment_store()
+    if store is None:
+        return
+    if "assessment_id" not in st.session_state:
+        st.session_state.assessment_id = uuid.uuid4().hex
+    assessment = Assessment(
+        st.session_state.assessment_id, profile, top_sections(jobs, scores, ranked, TOP_K), catalog_id, scoring_config.digest
+    )
+    if st.session_state.get("saved_assessment") == assessment:
+        return
+    try:
+        with telemetry.span("persist"):
+            store.save([assessment])
+        st.session_state.saved_assessment = assessment
+    except sqlite3.Error as e:
+        # Results are shown either way; only the follow-up re-scoring misses this one.
+        logger.warning("assessment %s not saved: %s", assessment.profile_id, e)
+
+
+def compute_sections(cancelled, user, user_domains, skills, edu_mode, strict_alignment, cached, scorer):
+    """Score and rank, yielding `(section, (scores, ranked indices))` as soon as each section is known.
+
+    Sections are ranked `RESULT_PAGES` pages deep, so later pages render
+    from the cached ranking. Runs inline or on a background thread, so it
+    reads no session state: `cached` is a result-cache hit (or None) and
+    `scorer` the session's `(scorer_rows, IncrementalScorer)`. The last item
+    is `("done", (scores, ranked, candidates, scorer))`. Stops early once
+    `cancelled` is set.
+    """
+    if cached is None:
+        candidates = None
+        if candidate_index is not None:
+            # Very large catalog: fully score only the nearest candidates.
+            candidates = find_candidates(
+                candidate_index, user, job_features, user_domains, strict_alignment, edu_mode, config=scoring_config
+            )
+        # Strict alignment: score only the user's domain partitions; the
+        # suppressed section is scored when its expander is opened.
+        rows = aligned_partition(job_features, user_domains, strict_alignment, candidates)
+        if candidates is not None:
+            scores = score_jobs(
+                user, jobs, job_features, user_domains, skills, edu_mode, strict_alignment,
+                candidates=candidates if rows is None else rows, config=scoring_config,
+            )
+        else:
+            # Keep per-job partial sums between presses; moving one slider rescores one column.
+            scorer_rows = f"{catalog_id}:{scoring_config.digest}:{'all' if rows is None else domain_mask(user_domains)}"
+            if scorer[0] != scorer_rows:
+                matrix = jobs.matrix if rows is None else jobs.matrix.take(rows)
+                scorer = (scorer_rows, IncrementalScorer(matrix, scoring_config))
+            scores = score_jobs(
+                user, jobs, job_features, user_domains, skills, edu_mode, strict_alignment,
+                scorer=scorer[1], candidates=rows, config=scoring_config,
+            )
+        sections = iter_rank(
+            scores, user_domains, strict_alignment,
+            size=page_size("best") * RESULT_PAGES,
+            suppressed_size=page_size("suppressed") * RESULT_PAGES,
+            with_suppressed=strict_alignment and rows is None,
+        )
+    else:
+        scores, ranked, candidates = cached
+        sections = iter(ranked.items())
+
+    ranked = {}
+    while not cancelled.is_set():
+        with telemetry.span("rank"):
+            section = next(sections, None)
+        if section is None:
+            yield "done", (scores, ranked, candidates, scorer)
+            return
+        name, idx = section
+        ranked[name] = idx
+        yield name, (scores, idx)
+
+
+def show_best(rows):
+    for r in rows:
+        st.metric(f"{r.title} · {r.family}", f"{r.score}%")
+        st.caption(f"Fit: {r.category} | Job Zone: {r.job_zone} | Domains: {', '.join(r.domains) if r.domains else '—'}")
+    if not rows:
         st.info("No aligned matches found with the current domain tags. Edit domains or turn off Strict alignment.")
 
-    st.markdown("## ✍️ Best Fit using your strengths (Aligned + Skills)")
-    # prioritize roles likely to use writing if selected
-    def strength_rank(r):
-        t = r["title"].lower()
-        score = r["score"]
-        if "Writing / Communication" in all_skills and any(k in t for k in ["writer", "proposal", "editor", "communications", "report"]):
-            score += 5
-        return score
-
-    strength_sorted = sorted(results, key=strength_rank, reverse=True)
-    shown = 0
-    for r in strength_sorted:
-        if strict_alignment and user_domains and not any(d in r["domains"] for d in user_domains):
-            continue
-        st.metric(f"{r['title']} · {r['family']}", f"{r['score']}%")
+
+def show_strengths(rows):
+    for r in rows:
+        st.metric(f"{r.title} · {r.family}", f"{r.score}%")
         st.caption("Aligned to your background · Uses selected strengths")
-        shown += 1
-        if shown >= 5:
-            break
 
-    st.markdown("## ⭐ Best Potential (Aligned, requires upskilling)")
-    if edu_mode == "Strict":
-        st.info("Education flexibility is set to Strict. Switch to Flexible/Transform to see upskilling pathways.")
-    else:
-        shown = 0
-        for r in best_potential:
-            if strict_alignment and user_domains and not any(d in r["domains"] for d in user_domains):
-                continue
-            label = "Requires upskilling" if r["edu_gap"] <= 0.15 else "Requires new education"
-            st.metric(f"{r['title']} · {r['family']}", f"{r['score']}%")
-            st.caption(f"{label} | Education gap: {r['edu_gap']} | Time willing: {time_months} months")
-            shown += 1
-            if shown >= 5:
-                break
-        if shown == 0:
-            st.info("No aligned best-potential roles identified beyond Ready Now.")
-
-    if strict_alignment:
-        st.divider()
-        with st.expander("Show unrelated roles (suppressed)", expanded=False):
-            shown = 0
-            for r in results:
-                if user_domains and any(d in r["domains"] for d in user_domains):
-                    continue
-                st.metric(f"{r['title']} · {r['family']}", f"{r['score']}%")
-                shown += 1
-                if shown >= 10:
-                    break
-
-    st.caption("Disclaimer: MVP decision-support tool. Not hiring advice.")
+
+def show_potential(rows):
+    for r in rows:
+        label = "Requires upskilling" if r.edu_gap <= 0.15 else "Requires new education"
+        st.metric(f"{r.title} · {r.family}", f"{r.score}%")
+        st.caption(f"{label} | Education gap: {r.edu_gap} | Time willing: {time_months} months")
+    if not rows:
+        st.info("No aligned best-potential roles identified beyond Ready Now.")
+
+
+def show_suppressed(rows):
+    for r in rows:
+        st.metric(f"{r.title} · {r.family}", f"{r.score}%")
+
+
+def show_what_if(w):
+    titles = [f"{c + 1}. {jobs.titles[j] or 'Unknown'}" for c, j in enumerate(w.jobs.tolist())]
+    table = []
+    for v, variant in enumerate(w.variants):
+        row = {"Change": variant.label}
+        for c, title in enumerate(titles):
+            moved = int(w.rank[0, c] - w.rank[v, c])
+            shift = f" ({'▲' if moved > 0 else '▼'}{abs(moved)})" if moved else ""
+            row[title] = f"{w.score[v, c]:.1f}% · #{w.rank[v, c]}{shift}"
+        row["Top match"] = (jobs.titles[w.best[v]] or "Unknown") if w.best[v] >= 0 else "—"
+        table.append(row)
+    st.caption("Score and Best Fit position of your current top matches when one input changes (▲/▼: places gained/lost).")
+    st.dataframe(table, hide_index=True)
+
+
+SHOW_SECTION = {"best": show_best, "strengths": show_strengths, "potential": show_potential, "suppressed": show_suppressed}
+
+
+def turn_page(name, delta):
+    st.session_state[f"page_{name}"] = st.session_state.get(f"page_{name}", 0) + delta
+    keep_results()  # in case this triggers a full rerun
+
+
+@st.fragment
+def show_section(name, scores, idx):
+    # A fragment: paging reruns only this section, from the ranking computed
+    # with the results, so nothing is rescored and only one page is re-sent.
+    # A fragment-only rerun never reaches the compute branch: drop the flag.
+    st.session_state.pop("keep_results", None)
+    size = page_size(name)
+    pages = max(1, -(-len(idx) // size))
+    page = min(st.session_state.get(f"page_{name}", 0), pages - 1)
+    with telemetry.span("result_rows"):
+        rows = [result_row(jobs, job_features, scores, i) for i in idx[page * size:(page + 1) * size].tolist()]
+    SHOW_SECTION[name](rows)
+    if pages > 1:
+        prev, shown, more = st.columns([1, 3, 1])
+        prev.button("‹ Previous", key=f"prev_{name}", disabled=page == 0, on_click=turn_page, args=(name, -1))
+        shown.caption(f"Showing {page * size + 1}–{page * size + len(rows)} of {len(idx)}")
+        more.button("Next ›", key=f"next_{name}", disabled=page == pages - 1, on_click=turn_page, args=(name, 1))
+
+progressive = st.toggle(
+    "Show results progressively",
+    value=True,
+    help="Score in the background and show Best Fit as soon as it is ranked. Changing an input cancels a run in progress.",
+)
+compute_pressed = st.button("Compute results")
+compute_requested = compute_pressed or st.session_state.pop("keep_results", False)
+
+# Until the startup load is done, only a compute request waits for it.
+engine_ready = compute_requested or engine_loading.done()
+if engine_ready:
+    with st.spinner("Loading the job catalog…"):
+        catalog_store, scoring_store = engine_loading.result()
+    try:
+        snapshot = catalog_store.current()
+    except FileNotFoundError as e:
+        dataset_caption.error(str(e))
+        st.stop()
+
+    jobs, jobs_filename = snapshot.catalog, snapshot.name
+    catalog_id = snapshot.id  # keys everything derived from this version
+    dataset_caption.caption(f"Dataset: {jobs_filename} · Occupations loaded: {len(jobs)}")
+
+    # ?scoring=<variant> selects scoring.<variant>.json (see scoring.py).
+    scoring_variant = st.query_params.get("scoring")
+    try:
+        scoring_config = scoring_store.current(scoring_variant)
+    except (OSError, ValueError) as e:
+        if scoring_variant is None:
+            st.error(f"Scoring config could not be loaded: {e}")
+            st.stop()
+        st.warning(f"Scoring variant {scoring_variant!r} is unavailable ({e}); using the default.")
+        scoring_variant, scoring_config = None, scoring_store.current()
+    job_features = snapshot.features_for(scoring_config)  # keyword flags of this config
+    candidate_index = snapshot.index_for(scoring_config)  # only built for very large catalogs
+else:
+    dataset_caption.caption("Dataset: loading…")
+
+if compute_requested:
+    # Imported by the startup load; these just bind the names.
+    from engine import aligned_partition, find_candidates, iter_rank, rank_suppressed, result_row, score_jobs, scoring_key
+    from features import domain_mask
+    from matcher import IncrementalScorer
+    from whatif import what_if
+
+    # A new request supersedes any run still in flight (and must not share its scorer).
+    if "compute_job" in st.session_state:
+        st.session_state.pop("compute_job").cancel(wait=True)
+    with telemetry.trace("compute", sink=st.session_state.telemetry["traces"] if debug else None, enabled=debug) as compute_trace:
+        # Use edited domains if present
+        user_domains = st.session_state.get("domains", inferred_domains)
+
+        # Memoize per session: unchanged scoring inputs skip rescoring entirely.
+        if "result_cache" not in st.session_state:
+            st.session_state.result_cache = ResultCache(max_entries=RESULT_CACHE_ENTRIES, max_bytes=RESULT_CACHE_BYTES)
+        result_cache = st.session_state.result_cache
+        with telemetry.span("cache_lookup"):
+            key = scoring_key(
+                user, user_domains, all_skills, edu_mode, strict_alignment, catalog_id=catalog_id, config=scoring_config
+            )
+            cached = result_cache.get(key)
+        telemetry.count("cache_miss" if cached is None else "cache_hit")
+        if st.session_state.get("pages_key") != key:
+            # New results start on page one.
+            for name in SHOW_SECTION:
+                st.session_state.pop(f"page_{name}", None)
+            st.session_state.pages_key = key
+
+        args = (user, user_domains, all_skills, edu_mode, strict_alignment, cached,
+                (st.session_state.get("scorer_rows"), st.session_state.get("scorer")))
+        if progressive and cached is None:
+            job = st.session_state.compute_job = BackgroundJob(compute_pool(), compute_sections, *args)
+            results = job.results()
+        else:
+            job, results = None, compute_sections(threading.Event(), *args)
+
+        with telemetry.span("render"):
+            st.subheader("Your Results")
+
+            # Summary chips
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown("**Education/Training domains (alignment):**")
+                st.write(", ".join(user_domains) if user_domains else "(none)")
+            with col2:
+                st.markdown("**Skills prioritized:**")
+                st.write(", ".join(all_skills) if all_skills else "(none)")
+
+            # One slot per section, filled in as sections arrive.
+            slots = {}
+            st.markdown("## ✅ Best Fit (Aligned)")
+            slots["best"] = st.empty()
+            st.markdown("## ✍️ Best Fit using your strengths (Aligned + Skills)")
+            slots["strengths"] = st.empty()
+            st.markdown("## ⭐ Best Potential (Aligned, requires upskilling)")
+            if edu_mode == "Strict":
+                st.info("Education flexibility is set to Strict. Switch to Flexible/Transform to see upskilling pathways.")
+            else:
+                slots["potential"] = st.empty()
+            if strict_alignment:
+                st.divider()
+                slots["suppressed"] = st.expander(
+                    "Show unrelated roles (suppressed)", expanded=False, key="show_suppressed", on_change=keep_results
+                ).empty()
+            what_if_slot = st.expander(
+                "What if…? See how your top matches shift", expanded=False, key="show_what_if", on_change=keep_results
+            ).empty()
+            status = st.empty()
+            if job is not None:
+                for slot in slots.values():
+                    slot.caption("Ranking…")
+
+        try:
+            for name, value in results:
+                if name == "done":
+                    scores, ranked, candidates, scorer = value
+                elif name == "suppressed" and not st.session_state.get("show_suppressed"):
+                    slots[name].empty()  # collapsed: send nothing
+                elif name in slots:
+                    with telemetry.span("render"), slots[name].container():
+                        show_section(name, *value)
+        finally:
+            # Also reached when an input change interrupts this run.
+            if job is not None:
+                job.cancel()
+                st.session_state.pop("compute_job", None)
+        if cached is None:
+            result_cache.put(
+                key,
+                (scores, ranked, candidates),
+                scores.nbytes + sum(idx.nbytes for idx in ranked.values()) + (0 if candidates is None else candidates.nbytes),
+            )
+            if scorer[1] is not None:
+                st.session_state.scorer_rows, st.session_state.scorer = scorer
+        if compute_pressed:
+            profile = {
+                **user, "domains": user_domains, "skills": all_skills, "edu_mode": edu_mode, "strict_alignment": strict_alignment,
+            }
+            save_assessment(profile, scores, ranked)
+
+        with telemetry.span("render"):
+            if strict_alignment and "suppressed" not in ranked and st.session_state.get("show_suppressed"):
+                suppressed = result_cache.get(key + ":suppressed")
+                if suppressed is None:
+                    suppressed = rank_suppressed(
+                        user, jobs, job_features, user_domains, all_skills, edu_mode,
+                        size=page_size("suppressed") * RESULT_PAGES, candidates=candidates, config=scoring_config,
+                    )
+                    result_cache.put(key + ":suppressed", suppressed, suppressed[0].nbytes + suppressed[1].nbytes)
+                with slots["suppressed"].container():
+                    show_section("suppressed", *suppressed)
+            elif "suppressed" in slots and "suppressed" not in ranked:
+                slots["suppressed"].empty()
+
+            if st.session_state.get("show_what_if"):
+                # Every education level/flexibility/experience choice and ±0.1 per slider, in one batch.
+                sensitivity = result_cache.get(key + ":what_if")
+                if sensitivity is None:
+                    with telemetry.span("what_if"):
+                        sensitivity = what_if(
+                            user, jobs, job_features, user_domains, all_skills, edu_mode, strict_alignment,
+                            candidates=candidates, config=scoring_config,
+                        )
+                    result_cache.put(key + ":what_if", sensitivity, sensitivity.score.nbytes + sensitivity.rank.nbytes)
+                with what_if_slot.container():
+                    show_what_if(sensitivity)
+
+            cache_stats = result_cache.stats()
+            work = ""
+            if cached is None:
+                work = f" · scored {len(scores.final):,} of {len(jobs):,} jobs"
+                if candidate_index is None:
+                    work += f" · rescored {scorer[1].recomputed}/{scorer[1].columns} feature columns"
+            with status.container():
+                st.caption(
+                    f"Result cache: {'hit' if cached is not None else 'miss'}"
+                    f" · {cache_stats['hits']} hits / {cache_stats['misses']} misses"
+                    f" · {cache_stats['entries']} entries · {cache_stats['bytes'] / 1024:.0f} KB" + work
+                )
+                st.caption("Disclaimer: MVP decision-support tool. Not hiring advice.")
+
+    if compute_trace is not None:
+        counters = st.session_state.telemetry["counters"]
+        counters["computes"] = counters.get("computes", 0) + 1
+        for name, n in compute_trace.counters.items():
+            counters[name] = counters.get(name, 0) + n
 else:
     st.info("Adjust inputs and click **Compute results**.")
+
+# -----------------------------
+# Debug panel (?debug=1 or CAREER_FIT_TELEMETRY=1)
+# -----------------------------
+if debug:
+    with debug_panel, st.expander("Debug: stage timings", expanded=False):
+        st.caption(
+            f"Inputs: income={A_user['income']:.2f} | purpose={A_user['purpose']:.2f}"
+            f" | learning={C_user['learning']:.2f} | strict_alignment={strict_alignment}"
+        )
+        if engine_ready:
+            st.caption(f"Catalog: {jobs_filename} · version {snapshot.version} · {catalog_store.reloads} reloads in this process")
+            st.caption(
+                f"Scoring: {scoring_variant or 'default'} · version {scoring_config.version} ({scoring_config.digest})"
+                f" · {scoring_store.reloads} reloads in this process"
+            )
+        else:
+            st.caption("Catalog: loading…")
+        session = st.session_state.telemetry
+        st.caption("Session counters: " + (" · ".join(f"{k}={v}" for k, v in sorted(session["counters"].items())) or "(none yet)"))
+        traces = list(session["traces"])[::-1]
+        if traces:
+            st.markdown(f"**Last {len(traces)} compute requests (ms, newest first)**")
+            st.dataframe(
+                [{"total": round(t.total_ms, 2), **{k: round(v, 2) for k, v in t.stage_ms().items()}, **t.counters} for t in traces]
+            )
+        st.markdown("**Process-wide stage timings**")
+        st.dataframe([{"stage": name, **stats} for name, stats in telemetry.summary().items()])
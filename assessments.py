@@ -0,0 +1,332 @@
+"""Persistent assessment store: submitted profiles, their top results, and bulk re-scoring.
+
+    python assessments.py rescore [--db assessments.db] [--jobs data/jobs.json] [--scoring scoring.json]
+    python assessments.py stats [--db assessments.db]
+
+One local SQLite file (stdlib `sqlite3` in WAL mode, so the app, the
+service and a re-score run can use it at the same time):
+
+    profiles     id -> profile JSON (shape documented in engine.py)
+    rankings     per profile: the top-K (job id, score) of the Best Fit,
+                 Strengths and Potential sections, and the catalog version and
+                 scoring config they were ranked with (sections `null` if the
+                 stored profile could not be read)
+    new_matches  per profile and catalog version: jobs that entered Best Fit at
+                 Strong Fit or better, for notifications
+
+`rescore` re-ranks every profile whose ranking comes from another catalog
+version or scoring config. Profiles are read in chunks; the base fit scores
+of a chunk come from one `matcher.fit_scores_many` pass. Only rankings that
+changed are rewritten; unchanged ones just get the new version stamp.
+Profiles that cannot be read are marked and skipped until they are saved
+again. Each chunk commits on its own, so an interrupted run resumes where it
+stopped.
+Re-scoring is exhaustive, even for catalogs large enough for the app to
+score only candidates.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from catalog import Catalog
+from engine import CATALOG_CANDIDATES, Scores, adjust_scores, profile_options, rank
+from features import JobFeatures
+from matcher import fit_scores_many, user_vectors
+from scoring import DEFAULT_CONFIG, DEFAULT_PATH as DEFAULT_SCORING, ScoringConfig, load_config
+
+ASSESSMENTS_PATH = os.environ.get("CAREER_FIT_ASSESSMENTS", "assessments.db")  # "" disables saving in the app
+PERSISTED_SECTIONS = ("best", "strengths", "potential")
+TOP_K = 10  # results kept per section
+NEW_MATCH_MIN_SCORE = 65.0  # "Strong Fit" or better
+RESCORE_VALUES = 1 << 24  # base scores held per chunk (profiles x jobs)
+MAX_CHUNK = 1024  # profiles per chunk
+BUSY_TIMEOUT = 30.0  # seconds to wait for another writer
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id TEXT PRIMARY KEY,
+    profile TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rankings (
+    profile_id TEXT PRIMARY KEY REFERENCES profiles(id) ON DELETE CASCADE,
+    catalog TEXT NOT NULL,
+    scoring TEXT NOT NULL,
+    top_k INTEGER NOT NULL,
+    sections TEXT NOT NULL,
+    ranked REAL NOT NULL,
+    checked REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS new_matches (
+    profile_id TEXT NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    catalog TEXT NOT NULL,
+    job_ids TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (profile_id, catalog)
+);
+"""
+
+_SAVE_PROFILE = (
+    "INSERT INTO profiles (id, profile, updated) VALUES (?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET profile = excluded.profile, updated = excluded.updated"
+)
+_SAVE_RANKING = (
+    "INSERT OR REPLACE INTO rankings (profile_id, catalog, scoring, top_k, sections, ranked, checked) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_STAMP_RANKING = "UPDATE rankings SET catalog = ?, scoring = ?, checked = ? WHERE profile_id = ?"
+_SAVE_MATCHES = "INSERT OR REPLACE INTO new_matches (profile_id, catalog, job_ids, created) VALUES (?, ?, ?, ?)"
+_STALE = """
+SELECT p.id, p.profile, r.sections, r.top_k
+FROM profiles p LEFT JOIN rankings r ON r.profile_id = p.id
+WHERE p.id > ? AND (r.profile_id IS NULL OR (r.sections != 'null' AND (r.catalog != ? OR r.scoring != ?)))
+ORDER BY p.id LIMIT ?
+"""
+
+
+def _dumps(obj) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def top_sections(catalog: Catalog, scores: Scores, ranked: dict[str, np.ndarray], top_k: int = TOP_K) -> dict[str, list]:
+    """`{section: [[job_id, score], ...]}` of the persisted sections of a `engine.rank` result."""
+    return {
+        name: [[catalog.job_ids[scores.row(i)], float(scores.final[i])] for i in ranked[name][:top_k].tolist()]
+        for name in PERSISTED_SECTIONS
+        if name in ranked
+    }
+
+
+def rows_sections(sections: dict[str, list[dict]], top_k: int = TOP_K) -> dict[str, list]:
+    """`top_sections` of `engine.rank_profile` output (result-row dicts)."""
+    return {
+        name: [[row["job_id"], row["score"]] for row in sections[name][:top_k]]
+        for name in PERSISTED_SECTIONS
+        if name in sections
+    }
+
+
+@dataclass(frozen=True)
+class Assessment:
+    """One profile to save, with its ranking."""
+
+    profile_id: str
+    profile: dict  # engine profile (P/A/C/X plus scoring options)
+    sections: dict[str, list]  # `top_sections` / `rows_sections`
+    catalog: str  # catalog version id (`store.Snapshot.id`)
+    scoring: str  # `ScoringConfig.digest`
+    top_k: int = TOP_K
+
+
+@dataclass(frozen=True)
+class RescoreReport:
+    profiles: int  # re-scored
+    changed: int  # rankings rewritten
+    notified: int  # profiles with new matches
+    errors: int  # stored profiles found unreadable (marked; later runs skip them)
+    seconds: float
+
+    @property
+    def profiles_per_sec(self) -> float:
+        return self.profiles / self.seconds if self.seconds > 0 else 0.0
+
+
+class AssessmentStore:
+    """Profiles and their latest rankings in one SQLite file; the file is created on first use."""
+
+    def __init__(self, path: str | Path = ASSESSMENTS_PATH):
+        self.path = Path(path)
+        self._ready = False
+
+    @contextmanager
+    def connect(self):
+        """A connection whose `with` block is one transaction. Raises sqlite3.Error."""
+        db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT)
+        try:
+            db.execute("PRAGMA foreign_keys = ON")
+            if not self._ready:
+                self._migrate(db)
+            yield db
+        finally:
+            db.close()
+
+    def _migrate(self, db: sqlite3.Connection) -> None:
+        version = db.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise sqlite3.DatabaseError(f"{self.path} has schema {version}; this code supports up to {SCHEMA_VERSION}")
+        db.execute("PRAGMA journal_mode = WAL")  # readers never block the writer
+        with db:
+            db.executescript(_SCHEMA)
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._ready = True
+
+    def save(self, assessments: list[Assessment]) -> None:
+        """Insert or replace profiles and their rankings, in one transaction."""
+        now = time.time()
+        with self.connect() as db, db:
+            db.executemany(_SAVE_PROFILE, [(a.profile_id, _dumps(a.profile), now) for a in assessments])
+            db.executemany(_SAVE_RANKING, [
+                (a.profile_id, a.catalog, a.scoring, a.top_k, _dumps(a.sections), now, now) for a in assessments
+            ])
+
+    def delete(self, profile_id: str) -> bool:
+        """Forget a profile, its ranking and its new matches."""
+        with self.connect() as db, db:
+            return db.execute("DELETE FROM profiles WHERE id = ?", (profile_id,)).rowcount > 0
+
+    def ranking(self, profile_id: str) -> dict | None:
+        """Latest ranking of a profile: catalog, scoring, top_k and sections (None if unknown).
+
+        `sections` is None when re-scoring found the stored profile unreadable.
+        """
+        with self.connect() as db:
+            row = db.execute(
+                "SELECT catalog, scoring, top_k, sections FROM rankings WHERE profile_id = ?", (profile_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"catalog": row[0], "scoring": row[1], "top_k": row[2], "sections": json.loads(row[3])}
+
+    def new_matches(self, catalog: str) -> list[tuple[str, list[str]]]:
+        """`(profile_id, job_ids)` of the profiles that gained Best Fit matches in catalog version `catalog`."""
+        with self.connect() as db:
+            rows = db.execute(
+                "SELECT profile_id, job_ids FROM new_matches WHERE catalog = ? ORDER BY profile_id", (catalog,)
+            ).fetchall()
+        return [(pid, json.loads(job_ids)) for pid, job_ids in rows]
+
+    def stats(self) -> dict:
+        with self.connect() as db:
+            return {
+                "profiles": db.execute("SELECT COUNT(*) FROM profiles").fetchone()[0],
+                "rankings": dict(db.execute("SELECT catalog, COUNT(*) FROM rankings GROUP BY catalog").fetchall()),
+                "unreadable": db.execute("SELECT COUNT(*) FROM rankings WHERE sections = 'null'").fetchone()[0],
+                "new_matches": dict(db.execute("SELECT catalog, COUNT(*) FROM new_matches GROUP BY catalog").fetchall()),
+            }
+
+    # -- bulk re-scoring -----------------------------------------------
+    def rescore(
+        self,
+        catalog: Catalog,
+        features: JobFeatures,
+        catalog_id: str,
+        config: ScoringConfig = DEFAULT_CONFIG,
+        chunk: int | None = None,
+        progress=None,
+    ) -> RescoreReport:
+        """Re-rank every profile not yet ranked on `catalog_id` with `config`.
+
+        `progress(done, seconds)` is called after each chunk.
+        """
+        chunk = chunk or max(1, min(MAX_CHUNK, RESCORE_VALUES // max(1, len(catalog))))
+        t0 = time.perf_counter()
+        done = changed = notified = errors = 0
+        last = ""
+        with self.connect() as db:
+            while True:
+                rows = db.execute(_STALE, (last, catalog_id, config.digest, chunk)).fetchall()
+                if not rows:
+                    break
+                last = rows[-1][0]
+                c, n, e = self._rescore_chunk(db, rows, catalog, features, catalog_id, config)
+                done, changed, notified, errors = done + len(rows) - e, changed + c, notified + n, errors + e
+                if progress is not None:
+                    progress(done, time.perf_counter() - t0)
+        return RescoreReport(done, changed, notified, errors, time.perf_counter() - t0)
+
+    def _rescore_chunk(self, db, rows, catalog, features, catalog_id, config) -> tuple[int, int, int]:
+        now = time.time()
+        valid, stamps, rankings, matches = [], [], [], []
+        for pid, text, old, top_k in rows:
+            try:
+                profile = json.loads(text)
+                opts = profile_options(profile)
+                user = {k: profile.get(k, {}) for k in ("P", "A", "C", "X")}
+                user_vectors(user, catalog.matrix)  # raises for non-numeric values
+                education = float(user["C"]["education"])
+            except (ValueError, TypeError, KeyError):
+                # Mark it so later runs skip it until the profile is saved again.
+                rankings.append((pid, catalog_id, config.digest, top_k or TOP_K, "null", now, now))
+                continue
+            valid.append((pid, user, education, opts, json.loads(old) if old else None, top_k or TOP_K))
+        errors = len(rankings)
+
+        base = fit_scores_many([v[1] for v in valid], catalog.matrix, config)
+        for (pid, _, education, opts, old, top_k), b in zip(valid, base):
+            domains, strict = opts["domains"], opts["strict_alignment"]
+            scores = adjust_scores(
+                b, education, features, domains, opts["skills"], opts["edu_mode"], strict, config=config
+            )
+            ranked = rank(scores, domains, strict, size=top_k, suppressed_size=0, with_suppressed=False)
+            sections = top_sections(catalog, scores, ranked, top_k)
+            if old == sections:
+                stamps.append((catalog_id, config.digest, now, pid))
+                continue
+            rankings.append((pid, catalog_id, config.digest, top_k, _dumps(sections), now, now))
+            if old is not None:
+                before = {job_id for job_id, _ in old.get("best", [])}
+                new = [job_id for job_id, score in sections["best"] if score >= NEW_MATCH_MIN_SCORE and job_id not in before]
+                if new:
+                    matches.append((pid, catalog_id, _dumps(new), now))
+        with db:
+            db.executemany(_STAMP_RANKING, stamps)
+            db.executemany(_SAVE_RANKING, rankings)
+            db.executemany(_SAVE_MATCHES, matches)
+        return len(rankings) - errors, len(matches), errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Persisted assessments: re-rank them when the catalog changes")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rescore = commands.add_parser("rescore", help="re-rank every profile not ranked on the current catalog/config")
+    stats = commands.add_parser("stats", help="profiles, rankings and new matches per catalog version")
+    for command in (rescore, stats):
+        command.add_argument("--db", default=ASSESSMENTS_PATH or "assessments.db", help="assessment database")
+    rescore.add_argument("--jobs", type=Path, help="job dataset (JSON or compiled catalog source); default: app lookup")
+    rescore.add_argument("--scoring", type=Path, default=DEFAULT_SCORING, help="scoring config (default: scoring.json)")
+    rescore.add_argument("--chunk", type=int, help="profiles per vectorized chunk (default: from catalog size)")
+    rescore.add_argument("--progress-every", type=float, default=5.0, help="seconds between progress lines (0 = off)")
+    args = parser.parse_args()
+
+    store = AssessmentStore(args.db)
+    if args.command == "stats":
+        print(json.dumps(store.stats(), indent=2, ensure_ascii=False))
+        return
+
+    from store import CatalogStore  # builds/reuses the shared compiled catalog files
+
+    try:
+        config = load_config(args.scoring)
+    except (OSError, ValueError) as e:
+        parser.error(f"--scoring: {e}")
+    snapshot = CatalogStore([args.jobs] if args.jobs else CATALOG_CANDIDATES).current()
+    last_report = 0.0
+
+    def progress(done: int, seconds: float) -> None:
+        nonlocal last_report
+        if args.progress_every and seconds - last_report >= args.progress_every:
+            print(f"{done:,} profiles · {done / seconds:,.0f}/s", file=sys.stderr)
+            last_report = seconds
+
+    features = snapshot.features_for(config)
+    report = store.rescore(snapshot.catalog, features, snapshot.id, config, args.chunk, progress)
+    print(
+        f"Re-scored {report.profiles:,} profiles against {snapshot.id} (scoring {config.version}) in {report.seconds:.2f}s "
+        f"· {report.profiles_per_sec:,.0f} profiles/s · {report.changed:,} rankings changed "
+        f"· {report.notified:,} with new matches · {report.errors:,} newly unreadable",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Cancellable background jobs that stream partial results.
+
+A job runs a generator function on a shared executor and hands each item
+it yields to the caller through a queue, so a UI can render results as they
+arrive instead of waiting for the whole computation:
+
+    job = BackgroundJob(pool, compute, profile)   # compute(cancelled, profile) yields items
+    for item in job.results():
+        render(item)
+    job.cancel()                                  # e.g. when inputs change mid-run
+
+The generator receives a `threading.Event` and should return early once it
+is set; items yielded after cancellation are dropped. Exceptions raised in
+the worker are re-raised by `results()`. The worker runs in a copy of the
+caller's context, so telemetry spans land in the caller's trace.
+"""
+
+import contextvars
+import queue
+import threading
+from concurrent import futures
+from concurrent.futures import Executor
+
+_DONE = object()
+
+
+class _Failed:
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class BackgroundJob:
+    def __init__(self, executor: Executor, fn, *args, **kwargs):
+        self.cancelled = threading.Event()
+        self._queue: queue.Queue = queue.Queue()
+        ctx = contextvars.copy_context()
+        self.future = executor.submit(ctx.run, self._run, fn, args, kwargs)
+
+    def _run(self, fn, args, kwargs) -> None:
+        try:
+            for item in fn(self.cancelled, *args, **kwargs):
+                if self.cancelled.is_set():
+                    break
+                self._queue.put(item)
+        except BaseException as e:  # handed to the consumer
+            self._queue.put(_Failed(e))
+        finally:
+            self._queue.put(_DONE)
+
+    def cancel(self, wait: bool = False) -> None:
+        """Ask the worker to stop; with `wait`, block until it has."""
+        self.cancelled.set()
+        if not self.future.cancel() and wait:  # cancelled before it started: never runs
+            futures.wait([self.future])
+
+    @property
+    def done(self) -> bool:
+        return self.future.done()
+
+    def results(self, timeout: float | None = None):
+        """Yield items as the worker produces them, until it finishes or is cancelled.
+
+        Raises queue.Empty if no item arrives within `timeout` seconds.
+        """
+        while not (self.cancelled.is_set() and self._queue.empty()):
+            item = self._queue.get(timeout=timeout)
+            if item is _DONE:
+                return
+            if isinstance(item, _Failed):
+                raise item.error
+            yield item
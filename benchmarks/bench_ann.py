@@ -0,0 +1,87 @@
+"""Recall and speed of candidate retrieval (ann.py) against exhaustive scoring.
+
+    python -m benchmarks.bench_ann
+    python -m benchmarks.bench_ann --sizes 1000000 --candidates 2000,5000,20000 --queries 200
+
+For each catalog size and candidate budget, every synthetic profile is
+ranked twice, exhaustively and from the index's candidates, and reported:
+
+    recall@K   share of the exhaustive top-K jobs by final score that the
+               candidate run also puts in its top K (K = --k)
+    sections   share of section rows (best/strengths/potential/suppressed)
+               reproduced exactly
+    ms         mean latency per profile (score + rank), and speedup
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from ann import build_index
+from benchmarks.synthetic import synthetic_catalog, synthetic_profiles
+from engine import find_candidates, rank, score_jobs
+from features import build_job_features
+from ranking import top_k
+from scoring import DEFAULT_CONFIG
+
+
+def _run(profile, catalog, features, candidates=None):
+    opts = {k: profile[k] for k in ("domains", "skills", "edu_mode", "strict_alignment")}
+    scores = score_jobs(profile, catalog, features, **opts, candidates=candidates)
+    ranked = rank(scores, profile["domains"], profile["strict_alignment"])
+    return scores, {name: [scores.row(i) for i in idx.tolist()] for name, idx in ranked.items()}
+
+
+def _top(scores, k: int) -> set[int]:
+    return {scores.row(i) for i in top_k(scores.final, k).tolist()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure candidate-index recall against exhaustive scoring")
+    parser.add_argument("--sizes", default="100000,300000", help="comma-separated catalog sizes")
+    parser.add_argument("--candidates", default="1000,5000,20000", help="comma-separated candidate budgets")
+    parser.add_argument("--queries", type=int, default=100, help="synthetic profiles per configuration")
+    parser.add_argument("--k", type=int, default=50, help="K for recall@K")
+    parser.add_argument("--lists", type=int, help="inverted lists (default ~sqrt(N))")
+    args = parser.parse_args()
+
+    profiles = synthetic_profiles(args.queries, seed=1)
+    for n in [int(s) for s in args.sizes.split(",") if s]:
+        catalog = synthetic_catalog(n)
+        features = build_job_features(catalog, DEFAULT_CONFIG.keywords)
+        t0 = time.perf_counter()
+        index = build_index(catalog.matrix, n_lists=args.lists)
+        print(f"== {n:,} jobs · {index.n_lists} lists · built in {time.perf_counter() - t0:.2f}s")
+
+        exact, t_exact = [], 0.0
+        for p in profiles:
+            t0 = time.perf_counter()
+            exact.append(_run(p, catalog, features))
+            t_exact += time.perf_counter() - t0
+        ms_exact = t_exact / len(profiles) * 1000.0
+        print(f"  {'exhaustive':>12}  {'':>10} {'':>10} {ms_exact:>9.2f} ms")
+        print(f"  {'candidates':>12}  {'recall@' + str(args.k):>10} {'sections':>10} {'ms':>12} {'speedup':>8} {'scored':>9}")
+
+        for budget in [int(s) for s in args.candidates.split(",") if s]:
+            recalls, section_hits, section_rows, scored, t_ann = [], 0, 0, 0, 0.0
+            for p, (ex_scores, ex_sections) in zip(profiles, exact):
+                t0 = time.perf_counter()
+                cand = find_candidates(index, p, features, p["domains"], p["strict_alignment"], p["edu_mode"], budget)
+                scores, sections = _run(p, catalog, features, cand)
+                t_ann += time.perf_counter() - t0
+                scored += len(cand)
+                truth = _top(ex_scores, args.k)
+                recalls.append(len(truth & _top(scores, args.k)) / max(1, len(truth)))
+                for name, rows in ex_sections.items():
+                    section_rows += len(rows)
+                    section_hits += sum(a == b for a, b in zip(rows, sections.get(name, [])))
+            ms = t_ann / len(profiles) * 1000.0
+            print(
+                f"  {budget:>12,}  {np.mean(recalls):>10.3f} {section_hits / max(1, section_rows):>10.3f}"
+                f" {ms:>9.2f} ms {ms_exact / ms:>7.1f}x {scored / len(profiles):>9,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
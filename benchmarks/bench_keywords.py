@@ -0,0 +1,98 @@
+"""Benchmark: compiled keyword matcher vs the per-pattern `re.search` loops.
+
+    python -m benchmarks.bench_keywords [--bulk-kb 64] [--repeat 200]
+
+Checks both implementations agree on every input, then reports time per
+call for short form inputs and throughput on synthetic bulk CV text, per
+table and for all tables through one matcher.
+"""
+
+import argparse
+import random
+import re
+import timeit
+
+from inputs import DOMAIN_PATTERNS, OTHER_TAG_PATTERNS, SKILL_PATTERNS
+from keywords import KeywordMatcher
+
+FORM_INPUTS = [
+    "BSc Civil Engineering, PMP, Lean Six Sigma, PhD Business Engineering",
+    "technical writing, proposal writing, academic publishing",
+    "MSc Data Science; cloud + cyber security certificates",
+    "Nursing diploma",
+    "",
+]
+
+FILLER = (
+    "responsible for the team and worked with partners on several initiatives across regions "
+    "delivered results improved outcomes coordinated meetings handled documentation"
+).split()
+
+
+def per_pattern(text: str, table: dict[str, list[str]]) -> list[str]:
+    """The original extraction loop: one re.search per pattern."""
+    if not text:
+        return []
+    t = text.lower()
+    found = []
+    for tag, pats in table.items():
+        for pat in pats:
+            if re.search(pat, t):
+                found.append(tag)
+                break
+    return found
+
+
+def bulk_text(kb: int, seed: int = 0, keyword_rate: float = 0.002) -> str:
+    """Synthetic CV/transcript text: mostly filler with sparse keywords."""
+    rng = random.Random(seed)
+    vocab = [p.replace(r"\b", "") for table in (DOMAIN_PATTERNS, SKILL_PATTERNS, OTHER_TAG_PATTERNS)
+             for pats in table.values() for p in pats]
+    words, size = [], 0
+    while size < kb * 1024:
+        w = rng.choice(vocab) if rng.random() < keyword_rate else rng.choice(FILLER)
+        words.append(w)
+        size += len(w) + 1
+    return " ".join(words)
+
+
+def bench(label: str, fn, repeat: int, nbytes: int) -> float:
+    per_call = min(timeit.repeat(fn, number=repeat, repeat=3)) / repeat
+    rate = f"{nbytes / per_call / 1e6:8.1f} MB/s" if nbytes else ""
+    print(f"  {label:<18} {per_call * 1e6:10.1f} us/call {rate}")
+    return per_call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bulk-kb", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    tables = {"domains": DOMAIN_PATTERNS, "skills": SKILL_PATTERNS, "other": OTHER_TAG_PATTERNS}
+    combined = KeywordMatcher(tables)
+    texts = {
+        "form": FORM_INPUTS,
+        "sparse": [bulk_text(args.bulk_kb)],
+        "dense": [bulk_text(args.bulk_kb, seed=1, keyword_rate=0.05)],
+    }
+    for text in [t for group in texts.values() for t in group]:
+        assert combined.find(text) == {name: per_pattern(text, table) for name, table in tables.items()}, text[:80]
+
+    print(f"{sum(len(p) for t in tables.values() for p in t.values())} patterns in {len(tables)} tables")
+    for label, group in texts.items():
+        nbytes = sum(len(t) for t in group)
+        repeat = args.repeat if label == "form" else max(1, args.repeat // 20)
+        print(f"{label} ({nbytes:,} chars)")
+        for name, table in tables.items():
+            matcher = KeywordMatcher({name: table})
+            old = bench(f"{name}/loop", lambda: [per_pattern(t, table) for t in group], repeat, nbytes)
+            new = bench(f"{name}/compiled", lambda: [matcher.find(t) for t in group], repeat, nbytes)
+            print(f"  {'':<18} {old / new:10.1f}x")
+        old = bench("all/loop", lambda: [[per_pattern(t, table) for table in tables.values()] for t in group], repeat, nbytes)
+        new = bench("all/compiled", lambda: [combined.find(t) for t in group], repeat, nbytes)
+        print(f"  {'':<18} {old / new:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
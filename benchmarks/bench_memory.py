@@ -0,0 +1,105 @@
+"""Benchmark: memory of the dict shapes vs the compact records in models.py.
+
+    python -m benchmarks.bench_memory [--jobs 100000] [--profiles 10000] [--results 100000]
+
+Each row builds one representation from scratch under tracemalloc and
+reports the memory it holds once built (MB and bytes per item):
+
+    jobs        JSON-shaped dicts vs the packed `Catalog` vs `Job` records
+    profiles    user dicts vs `UserProfile`
+    results     result-row dicts vs `ScoredResult`
+
+It also times `fit_scores` for a dict user and a `UserProfile`, and checks
+that both give identical scores.
+"""
+
+import argparse
+import gc
+import json
+import timeit
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_jobs, synthetic_profiles
+from catalog import catalog_from_jobs
+from matcher import fit_scores
+from models import ScoredResult, UserProfile
+
+
+def _held(build, *args):
+    """(object, bytes still allocated by `build(*args)` once it returns)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        obj = build(*args)
+        gc.collect()
+        held, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return obj, held
+
+
+def _report(label: str, held: int, n: int, baseline: int | None = None) -> None:
+    ratio = f"{baseline / held:>7.1f}x" if baseline else ""
+    print(f"  {label:<34} {held / 2**20:>9.2f} MB {held / max(1, n):>9.0f} B/item {ratio}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memory of dict vs compact job/profile/result records")
+    parser.add_argument("--jobs", type=int, default=100_000, help="catalog size")
+    parser.add_argument("--profiles", type=int, default=10_000, help="user profiles")
+    parser.add_argument("--results", type=int, default=100_000, help="result rows")
+    args = parser.parse_args()
+
+    # Round-trip through JSON so the dicts look like a loaded dataset (no shared floats).
+    text = json.dumps(synthetic_jobs(args.jobs))
+    print(f"== {args.jobs:,} jobs")
+    jobs, held_dicts = _held(json.loads, text)
+    _report("JSON dicts", held_dicts, args.jobs)
+    catalog, held_catalog = _held(catalog_from_jobs, jobs)
+    _report("Catalog (packed arrays)", held_catalog, args.jobs, held_dicts)
+    del jobs, text
+    _, held = _held(lambda: [catalog.job(i) for i in range(len(catalog))])
+    _report("Catalog + Job record per job", held_catalog + held, args.jobs, held_dicts)
+
+    profiles = [{k: p[k] for k in "PACX"} for p in synthetic_profiles(args.profiles)]
+    print(f"== {args.profiles:,} profiles")
+    users, held_users = _held(lambda: json.loads(json.dumps(profiles)))
+    _report("user dicts", held_users, args.profiles)
+    compact, held = _held(lambda: [UserProfile.from_dict(u) for u in users])
+    _report("UserProfile", held, args.profiles, held_users)
+
+    titles = [catalog.titles[i] for i in range(min(len(catalog), 1000))]
+    domains = [("Engineering",), ("Business / Operations", "Finance"), ()]
+
+    def row(i: int) -> dict:
+        return {
+            "job_id": f"{i:08d}",
+            "title": titles[i % len(titles)],
+            "family": "Architecture & Engineering",
+            "job_zone": 3,
+            "score": float(i % 1000) / 10.0,
+            "edu_gap": round((i % 7) / 10.0, 2),
+            "domains": list(domains[i % 3]),
+            "category": "Moderate Fit",
+        }
+
+    print(f"== {args.results:,} result rows")
+    _, held_rows = _held(lambda: [row(i) for i in range(args.results)])
+    _report("result dicts", held_rows, args.results)
+    _, held = _held(
+        lambda: [ScoredResult(**{**row(i), "domains": domains[i % 3]}) for i in range(args.results)]
+    )
+    _report("ScoredResult", held, args.results, held_rows)
+
+    print(f"== fit_scores over {len(catalog):,} jobs")
+    user, profile = users[0], compact[0]
+    assert np.array_equal(fit_scores(user, catalog.matrix), fit_scores(profile, catalog.matrix))
+    for label, u in (("dict user", user), ("UserProfile", profile)):
+        calls, total = timeit.Timer(lambda: fit_scores(u, catalog.matrix)).autorange()
+        print(f"  {label:<34} {total / calls * 1000:>9.2f} ms/call")
+
+
+if __name__ == "__main__":
+    main()
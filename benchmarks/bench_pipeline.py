@@ -0,0 +1,204 @@
+"""Benchmark and profiling harness for the matching pipeline (no Streamlit).
+
+    python -m benchmarks.bench_pipeline                                   # 1,016 / 10k / 100k jobs
+    python -m benchmarks.bench_pipeline --sizes 1016,1000000 --save before.json
+    python -m benchmarks.bench_pipeline --compare before.json --threshold 0.25
+    python -m benchmarks.bench_pipeline --sizes 100000 --stages pipeline --profile prof/
+
+Each stage runs against synthetic catalogs scaled from the real dataset and
+synthetic user profiles. Reported per stage and size: latency percentiles,
+throughput (calls/s and jobs/s) and peak traced memory of one call.
+
+--save writes a JSON baseline; --compare diffs p50 latency against one and
+exits non-zero if any stage got slower than --threshold. --profile dumps one
+cProfile file per stage (view with snakeviz, or render a flamegraph with
+flameprof / gprof2dot).
+"""
+
+import argparse
+import cProfile
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_catalog, synthetic_jobs, synthetic_profiles
+from catalog import catalog_from_jobs, compile_catalog, load_catalog
+from engine import rank, result_row, score_jobs, skill_boosts
+from features import build_job_features, job_domains
+from matcher import IncrementalScorer, fit_score, fit_scores
+from scoring import DEFAULT_CONFIG
+
+DEFAULT_SIZES = (1016, 10_000, 100_000)
+REFERENCE_MAX_JOBS = 20_000  # the per-job Python reference path is skipped above this
+
+
+def _stages(catalog, features, jobs_dir: Path, profiles: list[dict]) -> dict:
+    """Stage name -> (callable taking a profile, jobs touched per call)."""
+    n = len(catalog)
+    json_path, compiled_path = jobs_dir / "jobs.json", jobs_dir / "jobs.cfcat"
+    scorer = IncrementalScorer(catalog.matrix)
+    scorer.score(profiles[0])
+
+    def run_pipeline(p):
+        scores = score_jobs(p, catalog, features, p["domains"], p["skills"], p["edu_mode"], p["strict_alignment"])
+        ranked = rank(scores, p["domains"], p["strict_alignment"])
+        return {name: [result_row(catalog, features, scores, i) for i in idx.tolist()] for name, idx in ranked.items()}
+
+    def run_incremental(p):
+        u = dict(scorer_user)
+        u["A"] = dict(u["A"], income=p["A"]["income"])  # one slider moved
+        return scorer.score(u)
+
+    scorer_user = {k: profiles[0][k] for k in ("P", "A", "C", "X")}
+    jobs = list(catalog) if n <= REFERENCE_MAX_JOBS else None
+    stages = {
+        "load_json": (lambda p: catalog_from_jobs(json.loads(json_path.read_bytes())), n),
+        "load_compiled": (lambda p: load_catalog(compiled_path), n),
+        "build_features": (lambda p: build_job_features(catalog, DEFAULT_CONFIG.keywords), n),
+        "fit_scores": (lambda p: fit_scores(p, catalog.matrix), n),
+        "fit_scores_incremental": (run_incremental, n),
+        "skill_boosts": (lambda p: skill_boosts(features.keyword_flags, p["skills"]), n),
+        "score_jobs": (
+            lambda p: score_jobs(p, catalog, features, p["domains"], p["skills"], p["edu_mode"], p["strict_alignment"]),
+            n,
+        ),
+        "pipeline": (run_pipeline, n),
+    }
+    if jobs is not None:
+        stages["fit_score_reference"] = (lambda p: [fit_score(p, job) for job in jobs], n)
+        stages["job_domains"] = (lambda p: [job_domains(job) for job in jobs], n)
+    return stages
+
+
+def _percentiles(samples: list[float]) -> dict:
+    a = np.array(samples) * 1000.0
+    return {
+        "p50_ms": round(float(np.percentile(a, 50)), 4),
+        "p95_ms": round(float(np.percentile(a, 95)), 4),
+        "p99_ms": round(float(np.percentile(a, 99)), 4),
+        "mean_ms": round(float(a.mean()), 4),
+    }
+
+
+def run_stage(fn, jobs_per_call: int, profiles: list[dict], min_time: float, max_calls: int) -> dict:
+    fn(profiles[0])  # warm-up
+    samples = []
+    start = time.perf_counter()
+    while len(samples) < max_calls and (time.perf_counter() - start < min_time or len(samples) < 5):
+        p = profiles[len(samples) % len(profiles)]
+        t0 = time.perf_counter()
+        fn(p)
+        samples.append(time.perf_counter() - t0)
+    stats = _percentiles(samples)
+    mean_s = stats["mean_ms"] / 1000.0
+    stats["calls"] = len(samples)
+    stats["calls_per_s"] = round(1.0 / mean_s, 1) if mean_s else None
+    stats["jobs_per_s"] = round(jobs_per_call / mean_s) if mean_s else None
+
+    tracemalloc.start()
+    fn(profiles[0])
+    stats["peak_mem_kb"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    tracemalloc.stop()
+    return stats
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Stages whose p50 latency grew by more than `threshold` (fraction) vs `baseline`."""
+    regressions = []
+    for size, stages in current["results"].items():
+        for stage, stats in stages.items():
+            before = baseline.get("results", {}).get(size, {}).get(stage)
+            if not before or not before.get("p50_ms"):
+                continue
+            change = stats["p50_ms"] / before["p50_ms"] - 1.0
+            marker = "REGRESSION" if change > threshold else ""
+            print(f"  {size:>9} {stage:<24} {before['p50_ms']:>10.3f} -> {stats['p50_ms']:>10.3f} ms  {change:+7.1%} {marker}")
+            if change > threshold:
+                regressions.append(f"{size}/{stage}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the matching pipeline")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma-separated catalog sizes")
+    parser.add_argument("--stages", help="comma-separated subset of stages (default: all)")
+    parser.add_argument("--profiles", type=int, default=200, help="synthetic user profiles to cycle through")
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds to sample each stage")
+    parser.add_argument("--max-calls", type=int, default=2000)
+    parser.add_argument("--save", type=Path, help="write results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare p50 latencies against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed p50 slowdown before flagging (0.25 = 25%%)")
+    parser.add_argument("--profile", type=Path, help="directory for per-stage cProfile dumps")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    wanted = set(args.stages.split(",")) if args.stages else None
+    profiles = synthetic_profiles(args.profiles)
+    if args.profile:
+        args.profile.mkdir(parents=True, exist_ok=True)
+
+    report = {
+        "commit": _git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": {},
+    }
+    for n in sizes:
+        catalog = synthetic_catalog(n)
+        features = build_job_features(catalog, DEFAULT_CONFIG.keywords)
+        print(f"== {n:,} jobs")
+        print(f"  {'stage':<24} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'calls/s':>10} {'jobs/s':>13} {'peak KB':>10}")
+        with tempfile.TemporaryDirectory() as tmp:
+            jobs_dir = Path(tmp)
+            (jobs_dir / "jobs.json").write_text(json.dumps(synthetic_jobs(n)), encoding="utf-8")
+            compile_catalog(jobs_dir / "jobs.json", jobs_dir / "jobs.cfcat")
+            results = {}
+            for name, (fn, jobs_per_call) in _stages(catalog, features, jobs_dir, profiles).items():
+                if wanted and name not in wanted:
+                    continue
+                stats = run_stage(fn, jobs_per_call, profiles, args.min_time, args.max_calls)
+                results[name] = stats
+                print(
+                    f"  {name:<24} {stats['p50_ms']:>10.3f} {stats['p95_ms']:>10.3f} {stats['p99_ms']:>10.3f}"
+                    f" {stats['calls_per_s']:>10,.1f} {stats['jobs_per_s']:>13,} {stats['peak_mem_kb']:>10,.0f}"
+                )
+                if args.profile:
+                    prof = cProfile.Profile()
+                    prof.enable()
+                    for p in profiles[:20]:
+                        fn(p)
+                    prof.disable()
+                    prof.dump_stats(args.profile / f"{name}-{n}.prof")
+        report["results"][str(n)] = results
+
+    if args.save:
+        args.save.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Saved {args.save}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        print(f"Compared with {args.compare} (commit {baseline.get('commit')}):")
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Benchmark: app cold start and rerun times against time budgets (Streamlit AppTest).
+
+    python -m benchmarks.bench_startup [--starts 5] [--reruns 10]
+    python -m benchmarks.bench_startup --budget first_run=400 --budget rerun=80
+
+Each cold start is a fresh interpreter that runs app.py under
+`streamlit.testing.v1.AppTest` (no server, no browser) and times, in
+wall-clock ms:
+
+    first_run       the first script run of the process: the assessment form.
+                    The engine, catalog and scoring config load on a
+                    background thread meanwhile.
+    first_compute   "Compute results" right after; waits for that load if
+                    it is still running.
+    rerun           a slider moved without computing (the common rerun)
+    cached_compute  "Compute results" with unchanged inputs (result-cache hit)
+
+Reported per phase: median and max over the cold starts (rerun and
+cached_compute use the median of --reruns runs per start). The run exits
+non-zero if a phase's median is over its budget (`BUDGETS_MS`; override
+with --budget phase=ms). AppTest's own start-up cost is part of first_run;
+`import_streamlit` (not budgeted) shows what the server pays before the
+first session.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "app.py"
+BUDGETS_MS = {"first_run": 400.0, "first_compute": 1500.0, "rerun": 150.0, "cached_compute": 300.0}
+RUN_TIMEOUT = 120  # seconds per script run
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def _checked(at):
+    if at.exception:
+        raise RuntimeError(f"app raised: {at.exception[0].message}")
+    return at
+
+
+def _measure(reruns: int) -> dict[str, float]:
+    """One cold start, in this (fresh) process."""
+    t0 = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    out = {"import_streamlit": (time.perf_counter() - t0) * 1000.0}
+    at = AppTest.from_file(str(APP), default_timeout=RUN_TIMEOUT)
+
+    def compute():
+        _checked(next(b for b in at.button if b.label == "Compute results").click().run())
+
+    out["first_run"] = _timed(lambda: _checked(at.run()))
+    out["first_compute"] = _timed(compute)
+
+    slider = at.slider[0]
+    moves = [_timed(lambda v=v: _checked(slider.set_value(v).run())) for v in [0.5, 0.6] * (reruns // 2 + 1)][:reruns]
+    out["rerun"] = statistics.median(moves)
+    compute()  # score the current inputs once; the runs below hit the result cache
+    out["cached_compute"] = statistics.median(_timed(compute) for _ in range(reruns))
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="App cold-start and rerun times against budgets")
+    parser.add_argument("--starts", type=int, default=5, help="cold starts (fresh processes)")
+    parser.add_argument("--reruns", type=int, default=10, help="timed reruns per start")
+    parser.add_argument("--budget", action="append", default=[], metavar="PHASE=MS", help="override a budget")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_measure(args.reruns)))
+        return
+
+    budgets = dict(BUDGETS_MS)
+    for item in args.budget:
+        phase, _, ms = item.partition("=")
+        if phase not in budgets:
+            parser.error(f"unknown phase {phase!r}; one of {', '.join(budgets)}")
+        budgets[phase] = float(ms)
+
+    starts = []
+    for _ in range(args.starts):
+        child = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_startup", "--child", "--reruns", str(args.reruns)],
+            cwd=ROOT, capture_output=True, text=True,
+            env={**os.environ, "CAREER_FIT_ASSESSMENTS": ""},  # don't save benchmark profiles
+        )
+        if child.returncode:
+            sys.exit(f"cold start failed:\n{child.stderr}")
+        starts.append(json.loads(child.stdout.strip().splitlines()[-1]))
+
+    print(f"== app.py, {args.starts} cold starts, {args.reruns} reruns each (ms)")
+    print(f"  {'phase':<18} {'median':>9} {'max':>9} {'budget':>9}")
+    over = []
+    for phase in starts[0]:
+        values = [s[phase] for s in starts]
+        median = statistics.median(values)
+        budget = budgets.get(phase)
+        status = ""
+        if budget is not None:
+            status = "ok" if median <= budget else "OVER"
+            if median > budget:
+                over.append(phase)
+        shown = f"{budget:>9.0f}" if budget is not None else f"{'-':>9}"
+        print(f"  {phase:<18} {median:>9.1f} {max(values):>9.1f} {shown}  {status}")
+    if over:
+        print(f"over budget: {', '.join(over)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Synthetic catalogs and profiles for benchmarks, scaled from the real dataset."""
+
+import json
+import random
+from pathlib import Path
+
+import numpy as np
+
+from catalog import Catalog, catalog_from_jobs
+from inputs import DOMAIN_PATTERNS, EDU_MODES, SKILL_CHIPS
+from matcher import JobMatrix
+
+DATASET = Path(__file__).resolve().parent.parent / "jobs_onet_mvp.json"
+
+
+def load_base_jobs() -> list[dict]:
+    with DATASET.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def synthetic_jobs(n: int, seed: int = 0, jitter: float = 0.05) -> list[dict]:
+    """`n` JSON-shaped jobs: real jobs resampled with jittered feature values."""
+    base = load_base_jobs()
+    if n == len(base) and jitter == 0:
+        return base
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        src = base[i] if i < len(base) else rng.choice(base)
+        job = {
+            "job_id": src["job_id"] if i < len(base) else f"SYN-{i:08d}",
+            "title": src["title"],
+            "job_family": src["job_family"],
+            "job_zone": src["job_zone"],
+        }
+        for field in ("P_job", "A_job", "C_job"):
+            job[field] = {k: min(1.0, max(0.0, round(v + rng.gauss(0, jitter), 3))) for k, v in src[field].items()}
+        job["X_job"] = {k: (not v) if rng.random() < 0.02 else v for k, v in src["X_job"].items()}
+        out.append(job)
+    return out
+
+
+def synthetic_catalog(n: int, seed: int = 0, jitter: float = 0.05) -> Catalog:
+    """Like `synthetic_jobs`, built directly as arrays (fast for millions of rows)."""
+    base = catalog_from_jobs(load_base_jobs())
+    rng = np.random.default_rng(seed)
+    idx = np.concatenate([np.arange(min(n, len(base))), rng.integers(0, len(base), max(0, n - len(base)))])
+    m = base.matrix
+
+    def jittered(a: np.ndarray) -> np.ndarray:
+        return np.clip(a[idx] + rng.normal(0.0, jitter, (n, a.shape[1])), 0.0, 1.0)
+
+    X = m.X[idx] ^ (rng.random((n, m.X.shape[1])) < 0.02)
+    matrix = JobMatrix(m.p_keys, m.a_keys, m.c_keys, m.x_keys, jittered(m.P), jittered(m.A), jittered(m.C), X)
+    titles, families = list(base.titles), list(base.families)
+    return Catalog(
+        job_ids=[f"SYN-{i:08d}" for i in range(n)],
+        titles=[titles[i] for i in idx.tolist()],
+        families=[families[i] for i in idx.tolist()],
+        job_zones=base.job_zones[idx],
+        matrix=matrix,
+    )
+
+
+def synthetic_profiles(n: int, seed: int = 0) -> list[dict]:
+    """`n` engine profiles with app-like values (slider steps of 0.01, form choices)."""
+    rng = random.Random(seed)
+    domains = list(DOMAIN_PATTERNS)
+    out = []
+    for i in range(n):
+        out.append({
+            "id": f"u{i}",
+            "P": {k: round(rng.random(), 2) for k in ("independence", "ambiguity", "structure", "cognitive", "pace")},
+            "A": {
+                "income": round(rng.random(), 2),
+                "purpose": round(rng.random(), 2),
+                "leadership": rng.choice([0.3, 0.8, 0.5]),
+                "flexibility": rng.choice([0.9, 0.7, 0.3, 0.6]),
+                "balance": round(rng.random(), 2),
+            },
+            "C": {
+                "education": rng.choice([0.25, 0.40, 0.55, 0.70, 0.90, 0.50]),
+                "experience": rng.choice([0.20, 0.40, 0.60, 0.80]),
+                "learning": rng.choice([0.30, 0.60, 0.90]),
+            },
+            "X": {k: rng.random() < 0.2 for k in ("sales", "political", "travel")},
+            "domains": rng.sample(domains, rng.choice([0, 1, 1, 2, 3])),
+            "skills": rng.sample(SKILL_CHIPS, rng.choice([0, 1, 2, 3, 5])),
+            "edu_mode": rng.choice(EDU_MODES),
+            "strict_alignment": rng.random() < 0.7,
+        })
+    return out
@@ -0,0 +1,174 @@
+"""Score a cohort of profiles offline across all cores.
+
+    python bulk_score.py profiles.jsonl -o results.jsonl
+    python bulk_score.py profiles.jsonl -o results.csv --format csv --top-k 10 --sections best,potential
+    cat profiles.jsonl | python bulk_score.py - > results.jsonl
+
+Input is JSONL, one profile per line (shape documented in engine.py; an
+optional "id" is carried through, otherwise the line number is used).
+Lines are shipped to a process pool in batches; each worker loads the job
+catalog once. At most a few batches are in flight, so memory stays bounded
+no matter how large the input is, and output is written in input order as
+it completes. Throughput is reported on stderr.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from engine import CATALOG_CANDIDATES, load_candidate_index, load_jobs, rank_profile
+from ranking import SECTIONS
+from scoring import DEFAULT_PATH as DEFAULT_SCORING, load_config
+
+CSV_FIELDS = ["profile_id", "section", "rank", "job_id", "title", "family", "score", "category", "edu_gap"]
+
+_catalog = None
+_features = None
+_index = None
+_config = None
+
+
+def _init_worker(candidates: list[Path], scoring: Path) -> None:
+    global _catalog, _features, _index, _config
+    _config = load_config(scoring)
+    _catalog, _features, _ = load_jobs(candidates, _config.keywords)
+    _index = load_candidate_index(_catalog, config=_config)
+
+
+def _score_batch(batch: list[tuple[int, str]], sections: tuple[str, ...], top_k: int) -> list[dict]:
+    out = []
+    for line_no, line in batch:
+        pid = line_no
+        try:
+            profile = json.loads(line)
+            if isinstance(profile, dict):
+                pid = profile.get("id", line_no)
+            ranked = rank_profile(
+                profile, _catalog, _features, size=top_k, suppressed_size=top_k, index=_index, config=_config,
+                sections=sections,
+            )
+            out.append({"id": pid, "sections": {name: ranked[name] for name in sections if name in ranked}})
+        except (ValueError, TypeError, KeyError) as e:
+            out.append({"id": pid, "error": str(e)})
+    return out
+
+
+def _batches(lines, batch_size: int):
+    batch = []
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        batch.append((line_no, line))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class _Writer:
+    def __init__(self, fh, fmt: str):
+        self.fmt = fmt
+        self.fh = fh
+        if fmt == "csv":
+            self.csv = csv.DictWriter(fh, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            self.csv.writeheader()
+
+    def write(self, result: dict) -> None:
+        if self.fmt == "jsonl":
+            self.fh.write(json.dumps(result, ensure_ascii=False) + "\n")
+            return
+        if "error" in result:
+            self.csv.writerow({"profile_id": result["id"], "section": "error", "title": result["error"]})
+            return
+        for section, rows in result["sections"].items():
+            for rank, row in enumerate(rows, start=1):
+                self.csv.writerow({"profile_id": result["id"], "section": section, "rank": rank, **row})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk-score assessment profiles against the job catalog")
+    parser.add_argument("input", help="profiles JSONL file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="output format (default: from extension, else jsonl)")
+    parser.add_argument("--jobs", type=Path, help="job dataset (JSON or compiled catalog source); default: app lookup")
+    parser.add_argument("--scoring", type=Path, default=DEFAULT_SCORING, help="scoring config (default: scoring.json)")
+    parser.add_argument("--top-k", type=int, default=5, help="results per section")
+    parser.add_argument("--sections", default="best", help=f"comma-separated: {','.join(SECTIONS)}")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=256, help="profiles per task")
+    parser.add_argument("--progress-every", type=float, default=5.0, help="seconds between progress lines (0 = off)")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.output.endswith(".csv") else "jsonl")
+    sections = tuple(s.strip() for s in args.sections.split(",") if s.strip())
+    unknown = [s for s in sections if s not in SECTIONS]
+    if unknown or not sections:
+        parser.error(f"--sections: unknown section {', '.join(unknown) or '(none)'}; choose from {','.join(SECTIONS)}")
+    # Fail before starting workers, where load errors would only surface as a broken pool.
+    try:
+        scoring = load_config(args.scoring)
+    except (OSError, ValueError) as e:
+        parser.error(f"--scoring: {e}")
+    dataset = next((p for p in ([args.jobs] if args.jobs else CATALOG_CANDIDATES) if p.exists()), None)
+    if dataset is None:
+        parser.error(f"--jobs: {args.jobs}: file not found" if args.jobs else "no jobs dataset found; pass --jobs")
+    try:
+        load_jobs([dataset], scoring.keywords)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        parser.error(f"--jobs: {dataset}: {e}")
+
+    src = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    writer = _Writer(dst, fmt)
+
+    t0 = time.perf_counter()
+    last_report = t0
+    done = errors = 0
+    max_in_flight = 2 * args.workers
+
+    def drain(future) -> None:
+        nonlocal done, errors, last_report
+        for result in future.result():
+            writer.write(result)
+            done += 1
+            errors += "error" in result
+        now = time.perf_counter()
+        if args.progress_every and now - last_report >= args.progress_every:
+            print(f"{done:,} profiles · {done / (now - t0):,.0f}/s", file=sys.stderr)
+            last_report = now
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=args.workers, initializer=_init_worker, initargs=([dataset], args.scoring)
+        ) as pool:
+            in_flight = deque()
+            for batch in _batches(src, args.batch_size):
+                in_flight.append(pool.submit(_score_batch, batch, sections, args.top_k))
+                if len(in_flight) >= max_in_flight:
+                    drain(in_flight.popleft())
+            while in_flight:
+                drain(in_flight.popleft())
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+    elapsed = time.perf_counter() - t0
+    rate = done / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Scored {done:,} profiles ({errors:,} errors) in {elapsed:.2f}s with {args.workers} workers "
+        f"· {rate:,.0f} profiles/s · {rate / args.workers:,.0f} profiles/s/worker · scoring config {scoring.version}",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
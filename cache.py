@@ -0,0 +1,69 @@
+"""Small LRU cache for scoring results, bounded by entry count and bytes."""
+
+import hashlib
+import json
+from collections import OrderedDict
+
+
+def canonical_hash(obj) -> str:
+    """Stable hash of a JSON-serializable object (key order does not matter)."""
+    blob = json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """LRU mapping of key -> value with a memory cap.
+
+    Callers pass each value's size in bytes; least recently used entries are
+    evicted until both `max_entries` and `max_bytes` hold. Values larger than
+    `max_bytes` are not cached at all.
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[str, tuple[object, int]] = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str):
+        """Return the cached value or None, updating hit/miss counters."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: str, value, nbytes: int) -> None:
+        if key in self._data:
+            self.nbytes -= self._data.pop(key)[1]
+        if nbytes > self.max_bytes:
+            return
+        self._data[key] = (value, nbytes)
+        self.nbytes += nbytes
+        while len(self._data) > self.max_entries or self.nbytes > self.max_bytes:
+            _, (_, size) = self._data.popitem(last=False)
+            self.nbytes -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.nbytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
@@ -0,0 +1,258 @@
+"""Compiled, columnar job catalog.
+
+`compile_catalog` turns jobs_onet_mvp.json into a compact binary file that
+`load_catalog` maps into memory without parsing, so several worker processes
+share one page-cache copy.
+
+Layout (little-endian, every section 8-byte aligned):
+
+    header      magic, version, n_jobs, n_strings, blob size, n_p, n_a, n_c, n_x,
+                source size, source mtime_ns (the JSON it was compiled from)
+    strings     uint32 offsets[n_strings + 1] + UTF-8 blob (interned, each string once)
+    keys        uint32 string ids of the P/A/C/X feature keys
+    job_id      uint32 string id per job
+    title       uint32 string id per job
+    family      uint32 string id per job
+    job_zone    int16 per job
+    P, A, C     float64 columns, one contiguous column per key (NaN = key missing)
+    X           bitset, ceil(n_x / 8) bytes per job (bit j = X key j)
+
+Build step:
+
+    python catalog.py jobs_onet_mvp.json        # writes jobs_onet_mvp.cfcat
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+from matcher import JobMatrix, pack_jobs
+from models import Job
+
+MAGIC = b"CFCAT\x00\x00\x00"
+VERSION = 3  # 2: float64 feature columns (float32 moved scores across rounding boundaries); 3: source stamp
+SUFFIX = ".cfcat"
+
+_HEADER = struct.Struct("<8sIIIIIIIIqq")
+
+
+class StringColumn(Sequence):
+    """Read-only column of strings stored as ids into an interned string table."""
+
+    def __init__(self, table: list[str], ids: np.ndarray):
+        self._table = table
+        self._ids = ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._table[k] for k in self._ids[i].tolist()]
+        return self._table[self._ids[i]]
+
+    def __iter__(self):
+        table = self._table
+        return (table[k] for k in self._ids.tolist())
+
+
+@dataclass(frozen=True)
+class Catalog:
+    """Job catalog as columns: identity/labels per job plus the packed feature matrix."""
+
+    job_ids: Sequence[str]
+    titles: Sequence[str]
+    families: Sequence[str]
+    job_zones: np.ndarray
+    matrix: JobMatrix
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    def __getitem__(self, i: int) -> dict:
+        """Rebuild job `i` in the JSON dict shape (for `fit_score` and friends)."""
+        return self.job(i).as_dict()
+
+    def job(self, i: int) -> Job:
+        """Job `i` as a compact record viewing the catalog's arrays."""
+        return Job(self.job_ids[i], self.titles[i], self.families[i], int(self.job_zones[i]), self.matrix, i)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+def catalog_from_jobs(jobs: list[dict]) -> Catalog:
+    """Build a catalog from parsed JSON job dicts."""
+    return Catalog(
+        job_ids=[job.get("job_id") or "" for job in jobs],
+        titles=[job.get("title") or "" for job in jobs],
+        families=[job.get("job_family") or "" for job in jobs],
+        job_zones=np.array([int(job.get("job_zone", 3)) for job in jobs], dtype=np.int16),
+        matrix=pack_jobs(jobs),
+    )
+
+
+def _pad(n: int) -> int:
+    return -n % 8
+
+
+def compile_catalog(src: Path, dst: Path | None = None) -> Path:
+    """Compile a JSON job list into the binary catalog format. Returns the output path."""
+    src = Path(src)
+    dst = Path(dst) if dst is not None else src.with_suffix(SUFFIX)
+    with src.open("r", encoding="utf-8") as f:
+        stamp = os.fstat(f.fileno())  # of the file actually read, even if `src` is replaced meanwhile
+        jobs = json.load(f)
+    cat = catalog_from_jobs(jobs)
+    m = cat.matrix
+
+    strings: list[str] = []
+    index: dict[str, int] = {}
+
+    def intern(s: str) -> int:
+        if s not in index:
+            index[s] = len(strings)
+            strings.append(s)
+        return index[s]
+
+    key_ids = np.array([intern(k) for k in m.p_keys + m.a_keys + m.c_keys + m.x_keys], dtype="<u4")
+    job_ids = np.array([intern(s) for s in cat.job_ids], dtype="<u4")
+    titles = np.array([intern(s) for s in cat.titles], dtype="<u4")
+    families = np.array([intern(s) for s in cat.families], dtype="<u4")
+
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    blob = b"".join(encoded)
+
+    sections = [
+        offsets.tobytes() + blob,
+        key_ids.tobytes(),
+        job_ids.tobytes(),
+        titles.tobytes(),
+        families.tobytes(),
+        cat.job_zones.astype("<i2").tobytes(),
+        np.ascontiguousarray(m.P.T, dtype="<f8").tobytes(),
+        np.ascontiguousarray(m.A.T, dtype="<f8").tobytes(),
+        np.ascontiguousarray(m.C.T, dtype="<f8").tobytes(),
+        np.packbits(m.X, axis=1, bitorder="little").tobytes(),
+    ]
+    header = _HEADER.pack(
+        MAGIC, VERSION, len(cat), len(strings), len(blob), len(m.p_keys), len(m.a_keys), len(m.c_keys), len(m.x_keys),
+        stamp.st_size, stamp.st_mtime_ns,
+    )
+
+    # Write to a temp file and rename so concurrent readers never see a partial catalog.
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as f:
+        f.write(header + b"\x00" * _pad(len(header)))
+        for section in sections:
+            f.write(section + b"\x00" * _pad(len(section)))
+    os.replace(tmp, dst)
+    return dst
+
+
+def load_catalog(path: Path) -> Catalog:
+    """Memory-map a compiled catalog. Raises ValueError if the file is not a valid catalog."""
+    with Path(path).open("rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(buf) < _HEADER.size:
+        raise ValueError(f"{path}: truncated catalog header")
+    magic, version, n, n_strings, blob_size, n_p, n_a, n_c, n_x, _, _ = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: not a version {VERSION} job catalog")
+
+    pos = _HEADER.size + _pad(_HEADER.size)
+
+    def take(dtype: str, count: int) -> np.ndarray:
+        nonlocal pos
+        arr = np.frombuffer(buf, dtype=dtype, count=count, offset=pos)
+        pos += arr.nbytes + _pad(arr.nbytes)
+        return arr
+
+    try:
+        # The string section is offsets immediately followed by the blob, padded as one unit.
+        offsets = np.frombuffer(buf, dtype="<u4", count=n_strings + 1, offset=pos).tolist()
+        size = 4 * (n_strings + 1) + blob_size
+        blob = buf[pos + 4 * (n_strings + 1):pos + size]
+        pos += size + _pad(size)
+        table = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(n_strings)]
+
+        keys = [table[k] for k in take("<u4", n_p + n_a + n_c + n_x).tolist()]
+        job_ids = take("<u4", n)
+        titles = take("<u4", n)
+        families = take("<u4", n)
+        job_zones = take("<i2", n)
+        P = take("<f8", n_p * n).reshape(n_p, n).T
+        A = take("<f8", n_a * n).reshape(n_a, n).T
+        C = take("<f8", n_c * n).reshape(n_c, n).T
+        x_bytes = (n_x + 7) // 8
+        X = np.unpackbits(take("u1", x_bytes * n).reshape(n, x_bytes), axis=1, count=n_x, bitorder="little")
+    except ValueError as e:
+        raise ValueError(f"{path}: truncated catalog ({e})") from e
+
+    matrix = JobMatrix(
+        p_keys=tuple(keys[:n_p]),
+        a_keys=tuple(keys[n_p:n_p + n_a]),
+        c_keys=tuple(keys[n_p + n_a:n_p + n_a + n_c]),
+        x_keys=tuple(keys[n_p + n_a + n_c:]),
+        P=P,
+        A=A,
+        C=C,
+        X=X.astype(bool),
+    )
+    return Catalog(
+        job_ids=StringColumn(table, job_ids),
+        titles=StringColumn(table, titles),
+        families=StringColumn(table, families),
+        job_zones=job_zones,
+        matrix=matrix,
+    )
+
+
+def source_stamp(compiled: Path) -> tuple[int, int] | None:
+    """(size, mtime_ns) of the JSON `compiled` was built from; None if it is not a current-version catalog."""
+    try:
+        with Path(compiled).open("rb") as f:
+            header = f.read(_HEADER.size)
+    except OSError:
+        return None
+    if len(header) < _HEADER.size:
+        return None
+    magic, version, *_, size, mtime_ns = _HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return size, mtime_ns
+
+
+def is_fresh(compiled: Path, source: Path) -> bool:
+    """True if `compiled` is a current-version catalog built from exactly this `source` (or `source` is gone).
+
+    Compares the size and mtime of `source` with the ones stamped at compile
+    time, so a dataset replaced by an older file (copied with its original
+    mtime) is still detected.
+    """
+    stamp = source_stamp(compiled)
+    if stamp is None:
+        return False
+    if Path(source) == Path(compiled):
+        return True  # served as compiled, without its JSON
+    try:
+        stat = Path(source).stat()
+    except FileNotFoundError:
+        return True
+    return (stat.st_size, stat.st_mtime_ns) == stamp
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        sys.exit("usage: python catalog.py JOBS_JSON [OUTPUT]")
+    out = compile_catalog(Path(sys.argv[1]), Path(sys.argv[2]) if len(sys.argv) == 3 else None)
+    print(f"Wrote {out} ({out.stat().st_size:,} bytes)")
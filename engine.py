@@ -0,0 +1,451 @@
+"""Career-fit scoring pipeline, independent of Streamlit.
+
+Catalog loading, education/alignment penalties, skill boosts and section
+ranking live here so the app, the HTTP service and batch tools all score
+profiles the same way. The weights, penalties and boosts come from a
+`scoring.ScoringConfig` (default: scoring.json); the form normalizers and
+tag extraction live in inputs.py.
+
+A profile is the `user` dict built by the app plus scoring options:
+
+    {"P": {...}, "A": {...}, "C": {...}, "X": {...},
+     "domains": [...], "skills": [...], "edu_mode": "Strict", "strict_alignment": true}
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from ann import ANN_MIN_JOBS, N_CANDIDATES, CandidateIndex, build_index
+from cache import canonical_hash
+from catalog import SUFFIX as CATALOG_SUFFIX, Catalog, catalog_from_jobs, is_fresh, load_catalog
+from features import JobFeatures, KeywordRules, build_job_features, domain_mask
+from inputs import EDU_MODES
+from matcher import IncrementalScorer, fit_scores, round1
+from models import ScoredResult, UserProfile
+from ranking import SECTION_SIZE, SECTIONS, SUPPRESSED_SIZE, iter_sections, top_k
+from scoring import DEFAULT_CONFIG, ScoringConfig
+from telemetry import span
+
+CATALOG_CANDIDATES = [
+    Path("jobs_onet_mvp.json"),
+    Path("jobs_onet_mvp_v2.json"),
+    Path("data/jobs_onet_mvp.json"),
+    Path("data/jobs_onet_mvp_v2.json"),
+]
+
+# -----------------------------
+# Catalog loading
+# -----------------------------
+def load_jobs(
+    candidates: list[Path] = CATALOG_CANDIDATES, keywords: KeywordRules = DEFAULT_CONFIG.keywords
+) -> tuple[Catalog, JobFeatures, str]:
+    """Load the first available dataset (compiled catalog preferred) and its feature index.
+
+    Raises FileNotFoundError if none of `candidates` exists.
+    """
+    for p in candidates:
+        compiled = p.with_suffix(CATALOG_SUFFIX)
+        if is_fresh(compiled, p):
+            try:
+                with span("load_catalog"):
+                    catalog = load_catalog(compiled)
+                with span("build_features"):
+                    return catalog, build_job_features(catalog, keywords), compiled.name
+            except (OSError, ValueError):
+                pass  # stale/corrupt build: fall back to the JSON
+        if p.exists():
+            with span("load_catalog"), p.open("r", encoding="utf-8") as f:
+                catalog = catalog_from_jobs(json.load(f))
+            with span("build_features"):
+                return catalog, build_job_features(catalog, keywords), p.name
+    raise FileNotFoundError("Jobs dataset not found. Put jobs_onet_mvp.json in the same folder as app.py.")
+
+
+def load_candidate_index(
+    catalog: Catalog, min_jobs: int = ANN_MIN_JOBS, config: ScoringConfig = DEFAULT_CONFIG
+) -> CandidateIndex | None:
+    """Candidate index for `config`, for catalogs of at least `min_jobs` jobs (None: score exhaustively)."""
+    if len(catalog) < min_jobs:
+        return None
+    with span("build_index"):
+        return build_index(catalog.matrix, config=config)
+
+# -----------------------------
+# Result categories
+# -----------------------------
+def categorize(score_pct: float) -> str:
+    if score_pct >= 80:
+        return "Best Fit"
+    if score_pct >= 65:
+        return "Strong Fit"
+    if score_pct >= 55:
+        return "Safe Fit"
+    return "Low Fit"
+
+# -----------------------------
+# Scoring helpers: strict alignment + skills boosts
+# -----------------------------
+# The numbers live in the scoring config (scoring.json, see scoring.py).
+def alignment_penalties(
+    aligned: np.ndarray, user_dom: list[str], enabled: bool, config: ScoringConfig = DEFAULT_CONFIG
+) -> np.ndarray:
+    """Per-job suppression given the `JobFeatures.aligned` mask."""
+    if not enabled or not user_dom:
+        # If user gave no domains, do not suppress.
+        return np.zeros(len(aligned))
+    # strong suppression (not absolute zero so list isn't empty)
+    return np.where(aligned, 0.0, config.outside_penalty)
+
+
+def skill_boosts(flags: np.ndarray, user_skills: list[str], config: ScoringConfig = DEFAULT_CONFIG) -> np.ndarray:
+    """Return per-job multiplicative boost factors, e.g., 1.00–1.15, from keyword flags."""
+    table = config.boost_table(user_skills)
+    return np.ones(len(flags)) if table is None else table[flags]
+
+
+def education_penalties(gap: np.ndarray, mode: str, config: ScoringConfig = DEFAULT_CONFIG) -> np.ndarray:
+    rule = config.education.get(mode)
+    if rule is None:
+        raise ValueError(f"scoring config {config.version} has no education rule for {mode!r}")
+    return rule.penalties(gap)
+
+# -----------------------------
+# Pipeline
+# -----------------------------
+@dataclass(frozen=True)
+class Scores:
+    """Per-job outputs of `score_jobs`, aligned with catalog order."""
+
+    final: np.ndarray  # adjusted fit score, 0–100
+    strength: np.ndarray  # final score plus the strengths-section bonus
+    edu_gap: np.ndarray
+    aligned: np.ndarray
+    index: np.ndarray | None = None  # catalog row of each entry when only candidates were scored
+
+    @property
+    def nbytes(self) -> int:
+        extra = 0 if self.index is None else self.index.nbytes
+        return self.final.nbytes + self.strength.nbytes + self.edu_gap.nbytes + self.aligned.nbytes + extra
+
+    def row(self, i: int) -> int:
+        """Catalog index of entry `i`."""
+        return i if self.index is None else int(self.index[i])
+
+
+def _education(user) -> float:
+    """C["education"] of a profile dict or `models.UserProfile`."""
+    return float(user["C"]["education"]) if isinstance(user, dict) else user.education
+
+
+def score_jobs(
+    user: dict | UserProfile,
+    catalog: Catalog,
+    features: JobFeatures,
+    domains: list[str],
+    skills: list[str],
+    edu_mode: str,
+    strict_alignment: bool,
+    scorer: IncrementalScorer | None = None,
+    candidates: np.ndarray | None = None,
+    config: ScoringConfig = DEFAULT_CONFIG,
+) -> Scores:
+    """Score `user` against every job: base fit, then education/alignment penalties and skill boosts.
+
+    Pass `candidates` (ascending catalog indices, e.g. a domain partition or
+    `ann.CandidateIndex.search` results) to score only those jobs; entries of
+    the returned `Scores` then map to catalog rows through `Scores.row`.
+    Pass the same `scorer` across calls to only recompute the base-fit
+    columns whose inputs changed since the last call; it must be built on
+    the scored rows (`catalog.matrix`, or `catalog.matrix.take(candidates)`)
+    and on `config`.
+    """
+    matrix = catalog.matrix
+    if candidates is not None:
+        with span("candidates.take"):
+            matrix = matrix.take(candidates) if scorer is None else None
+            features = features.take(candidates)
+    if scorer is not None and len(scorer.jobs) != len(features.required_edu):
+        raise ValueError("scorer was built on different rows than the ones being scored")
+    if scorer is not None and scorer.config.digest != config.digest:
+        raise ValueError("scorer was built with a different scoring config")
+
+    # 0–100, one per job
+    base_scores = scorer.score(user) if scorer is not None else fit_scores(user, matrix, config)
+    return adjust_scores(
+        base_scores, _education(user), features, domains, skills, edu_mode, strict_alignment, candidates, config
+    )
+
+
+def adjust_scores(
+    base_scores: np.ndarray,
+    education: float,
+    features: JobFeatures,
+    domains: list[str],
+    skills: list[str],
+    edu_mode: str,
+    strict_alignment: bool,
+    index: np.ndarray | None = None,
+    config: ScoringConfig = DEFAULT_CONFIG,
+) -> Scores:
+    """Apply education/alignment penalties and skill boosts to base fit scores (one per job of `features`).
+
+    Raises ValueError if `features` were flagged with other keyword rules than
+    `config` (see `JobFeatures.with_keywords`).
+    """
+    if features.keywords != config.keywords.digest:
+        raise ValueError(f"job features use keyword rules {features.keywords}, config {config.version} uses {config.keywords.digest}")
+    with span("penalties"):
+        gap = np.maximum(0.0, features.required_edu - education)
+        epen = education_penalties(gap, edu_mode, config)
+
+        aligned = features.aligned(domains)
+        apen = alignment_penalties(aligned, domains, strict_alignment, config)
+
+    with span("skill_boosts"):
+        boosted = base_scores * (1.0 - epen) * (1.0 - apen)
+        boosted = boosted * skill_boosts(features.keyword_flags, skills, config)
+
+        final = round1(np.minimum(100.0, boosted))
+
+        # prioritize roles likely to use the selected skills (e.g. writing)
+        bonus = config.bonus_table(skills)
+        strength = final.copy() if bonus is None else final + bonus[features.keyword_flags]
+
+    return Scores(final=final, strength=strength, edu_gap=gap, aligned=aligned, index=index)
+
+
+def rank(
+    scores: Scores,
+    domains: list[str],
+    strict_alignment: bool,
+    size: int = SECTION_SIZE,
+    suppressed_size: int = SUPPRESSED_SIZE,
+    with_suppressed: bool | None = None,
+) -> dict[str, np.ndarray]:
+    """Top `scores` entries per result section.
+
+    The suppressed section is included under strict alignment unless
+    `with_suppressed` says otherwise (e.g. `scores` only covers aligned
+    jobs; see `rank_suppressed`).
+    """
+    with span("rank"):
+        return dict(iter_rank(scores, domains, strict_alignment, size, suppressed_size, with_suppressed))
+
+
+def iter_rank(
+    scores: Scores,
+    domains: list[str],
+    strict_alignment: bool,
+    size: int = SECTION_SIZE,
+    suppressed_size: int = SUPPRESSED_SIZE,
+    with_suppressed: bool | None = None,
+):
+    """`rank` one section at a time, as `(name, entries)` in display order."""
+    return iter_sections(
+        scores.final,
+        scores.strength,
+        scores.edu_gap,
+        scores.aligned,
+        restrict=bool(strict_alignment and domains),
+        has_domains=bool(domains),
+        with_suppressed=strict_alignment if with_suppressed is None else with_suppressed,
+        size=size,
+        suppressed_size=suppressed_size,
+    )
+
+
+def aligned_partition(
+    features: JobFeatures,
+    domains: list[str],
+    strict_alignment: bool,
+    candidates: np.ndarray | None = None,
+) -> np.ndarray | None:
+    """Rows the aligned sections can show: the user's domain partitions under
+    strict alignment (within `candidates` if given), else None for all jobs.
+
+    Scoring just these rows gives the best/strengths/potential sections
+    exactly; the suppressed section then comes from `rank_suppressed`.
+    """
+    if not (strict_alignment and domains):
+        return None
+    rows = features.aligned_rows(domains)
+    return rows if candidates is None else np.intersect1d(rows, candidates, assume_unique=True)
+
+
+def rank_suppressed(
+    user: dict | UserProfile,
+    catalog: Catalog,
+    features: JobFeatures,
+    domains: list[str],
+    skills: list[str],
+    edu_mode: str,
+    size: int = SUPPRESSED_SIZE,
+    candidates: np.ndarray | None = None,
+    config: ScoringConfig = DEFAULT_CONFIG,
+) -> tuple[Scores, np.ndarray]:
+    """Score the jobs outside the user's domains (within `candidates` if given) and
+    return them with their top `size` entries: the strict-alignment suppressed section."""
+    with span("suppressed"):
+        rows = np.flatnonzero(~features.aligned(domains))
+        if candidates is not None:
+            rows = np.intersect1d(rows, candidates, assume_unique=True)
+        scores = score_jobs(user, catalog, features, domains, skills, edu_mode, True, candidates=rows, config=config)
+        return scores, top_k(scores.final, size)
+
+
+def result_row(catalog: Catalog, features: JobFeatures, scores: Scores, i: int) -> ScoredResult:
+    """Display record for entry `i` of `scores` (as returned by `rank`); `.as_dict()` serializes it."""
+    score = float(scores.final[i])
+    j = scores.row(i)
+    return ScoredResult(
+        job_id=catalog.job_ids[j],
+        title=catalog.titles[j] or "Unknown",
+        family=catalog.families[j] or "Unknown",
+        job_zone=int(catalog.job_zones[j]),
+        score=score,
+        edu_gap=round(float(scores.edu_gap[i]), 2),
+        domains=features.domains[j],
+        category=categorize(score),
+    )
+
+
+def find_candidates(
+    index: CandidateIndex,
+    user: dict | UserProfile,
+    features: JobFeatures,
+    domains: list[str],
+    strict_alignment: bool,
+    edu_mode: str,
+    n_candidates: int = N_CANDIDATES,
+    config: ScoringConfig = DEFAULT_CONFIG,
+) -> np.ndarray:
+    """Jobs worth scoring exactly for `user` under `config`, ascending catalog indices.
+
+    Retrieval keeps going until `n_candidates` jobs that escape the heavy
+    penalties are found: aligned jobs under strict alignment, and jobs with
+    no education gap in Strict education mode.
+    """
+    with span("candidates.search"):
+        mask = None
+        if strict_alignment and domains:
+            mask = features.aligned(domains)
+        if edu_mode == "Strict":
+            reachable = features.required_edu <= _education(user)
+            mask = reachable if mask is None else mask & reachable
+        return index.search(user, n_candidates, mask=mask, config=config)
+
+
+def scoring_key(
+    user: dict | UserProfile,
+    domains: list[str],
+    skills: list[str],
+    edu_mode: str,
+    strict_alignment: bool,
+    catalog_id: str = "",
+    quantum: float = 0.001,
+    config: ScoringConfig = DEFAULT_CONFIG,
+) -> str:
+    """Canonical hash of everything that affects scores and rankings.
+
+    Profile values are quantized to `quantum`. Inputs that cannot change the
+    result are left out: domains unless strict alignment is on (and then only
+    their taxonomy bits and whether any were given), skills without a boost
+    rule, and anything not passed in here (free-text tags, learning time).
+    """
+    def q(values: dict) -> dict:
+        return {k: round(float(v) / quantum) for k, v in values.items()}
+
+    if not isinstance(user, dict):
+        user = user.as_dict()
+
+    return canonical_hash({
+        "catalog": catalog_id,
+        "scoring": config.digest,
+        "P": q(user.get("P", {})),
+        "A": q(user.get("A", {})),
+        "C": q(user.get("C", {})),
+        "X": sorted(k for k, v in user.get("X", {}).items() if v),
+        "domains": [domain_mask(domains), bool(domains)] if strict_alignment else None,
+        "skills": sorted(s for s in set(skills) if s in config.scored_skills),
+        "edu_mode": edu_mode,
+        "strict": bool(strict_alignment),
+    })
+
+
+def _string_list(profile: dict, key: str) -> list[str]:
+    value = profile.get(key)
+    if value is None:
+        return []
+    if not isinstance(value, (list, tuple)) or not all(isinstance(v, str) for v in value):
+        raise ValueError(f"profile.{key} must be a list of strings")
+    return list(value)
+
+
+def profile_options(profile: dict) -> dict:
+    """Scoring options of a profile, with defaults and validation.
+
+    Raises ValueError for malformed profiles.
+    """
+    if not isinstance(profile, dict):
+        raise ValueError("profile must be an object")
+    for key in ("P", "A", "C", "X"):
+        if not isinstance(profile.get(key, {}), dict):
+            raise ValueError(f"profile.{key} must be an object")
+    if "education" not in profile.get("C", {}):
+        raise ValueError("profile.C.education is required")
+    edu_mode = profile.get("edu_mode", "Strict")
+    if edu_mode not in EDU_MODES:
+        raise ValueError(f"edu_mode must be one of {', '.join(EDU_MODES)}")
+    return {
+        "domains": _string_list(profile, "domains"),
+        "skills": _string_list(profile, "skills"),
+        "edu_mode": edu_mode,
+        "strict_alignment": bool(profile.get("strict_alignment", True)),
+    }
+
+
+def rank_profile(
+    profile: dict,
+    catalog: Catalog,
+    features: JobFeatures,
+    size: int = SECTION_SIZE,
+    suppressed_size: int = SUPPRESSED_SIZE,
+    index: CandidateIndex | None = None,
+    n_candidates: int = N_CANDIDATES,
+    config: ScoringConfig = DEFAULT_CONFIG,
+    sections: tuple[str, ...] = SECTIONS,
+) -> dict[str, list[dict]]:
+    """Score and rank one profile; returns JSON-serializable rows per section.
+
+    With a candidate `index` (built for `config`, see `store.Snapshot.index_for`),
+    only its `n_candidates` nearest jobs are scored.
+    Only `sections` are returned; without "suppressed", the jobs outside the
+    user's domains are not scored at all under strict alignment.
+    """
+    opts = profile_options(profile)
+    user = {k: profile.get(k, {}) for k in ("P", "A", "C", "X")}
+    domains, strict_alignment = opts["domains"], opts["strict_alignment"]
+    candidates = None
+    if index is not None:
+        candidates = find_candidates(
+            index, user, features, domains, strict_alignment, opts["edu_mode"], n_candidates, config=config
+        )
+    rows = aligned_partition(features, domains, strict_alignment, candidates)
+    scores = score_jobs(user, catalog, features, **opts, candidates=candidates if rows is None else rows, config=config)
+    with_suppressed = strict_alignment and "suppressed" in sections
+    ranked = rank(scores, domains, strict_alignment, size, suppressed_size, with_suppressed=with_suppressed and rows is None)
+    with span("result_rows"):
+        out = {
+            name: [result_row(catalog, features, scores, i).as_dict() for i in idx.tolist()]
+            for name, idx in ranked.items()
+            if name in sections
+        }
+    if with_suppressed and rows is not None:
+        suppressed_scores, top = rank_suppressed(
+            user, catalog, features, domains, opts["skills"], opts["edu_mode"], suppressed_size, candidates, config
+        )
+        out["suppressed"] = [result_row(catalog, features, suppressed_scores, i).as_dict() for i in top.tolist()]
+    return out
@@ -0,0 +1,174 @@
+"""Per-job derived features, computed once per catalog.
+
+Everything here depends only on the job (title, family, job zone), never on
+the user, so the app builds a `JobFeatures` index when the catalog loads and
+per-request scoring reduces to array lookups and bitmask tests. The keyword
+flags follow the `KeywordRules` of a scoring config (see scoring.py).
+"""
+
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+# Domain taxonomy; bit i of a domain mask is DOMAINS[i].
+DOMAINS = (
+    "Construction / Infrastructure",
+    "Engineering",
+    "Business / Operations",
+    "Finance",
+    "Policy / Public",
+    "Sustainability / ESG",
+    "Technology / IT",
+    "Health",
+    "Education",
+    "Writing / Communication",
+)
+DOMAIN_BITS = {d: 1 << i for i, d in enumerate(DOMAINS)}
+
+MAX_KEYWORD_FLAGS = 8  # keyword_flags is stored as uint8
+
+
+@dataclass(frozen=True)
+class KeywordRules:
+    """Named keyword flags: bit i is set for jobs whose title or family contains a word of rule i."""
+
+    names: tuple[str, ...]
+    title: tuple[tuple[str, ...], ...]  # per flag, words looked for in the lowercased title
+    family: tuple[tuple[str, ...], ...]  # ... and in the lowercased job family
+    digest: str  # identifies the rules; `JobFeatures.keywords` records it
+
+    def bit(self, name: str) -> int:
+        return 1 << self.names.index(name)
+
+
+def jobzone_required_edu(job_zone: int) -> float:
+    return {1: 0.30, 2: 0.45, 3: 0.60, 4: 0.75, 5: 0.90}.get(int(job_zone), 0.60)
+
+
+def job_domains(job: dict) -> list[str]:
+    """Derive rough domains from job family + title keywords (MVP)."""
+    fam = (job.get("job_family") or "").lower()
+    title = (job.get("title") or "").lower()
+    d = []
+
+    # family-based
+    if any(k in fam for k in ["construction", "architecture", "maintenance", "facility", "real estate", "building", "engineering"]):
+        d.append("Construction / Infrastructure")
+    if any(k in fam for k in ["engineering", "production", "installation", "repair"]):
+        d.append("Engineering")
+    if any(k in fam for k in ["business", "finance", "management", "office", "administration"]):
+        d.append("Business / Operations")
+    if "finance" in fam:
+        d.append("Finance")
+    if any(k in fam for k in ["education", "training", "library"]):
+        d.append("Education")
+    if any(k in fam for k in ["health", "medical", "healthcare"]):
+        d.append("Health")
+    if any(k in fam for k in ["computer", "it", "technology"]):
+        d.append("Technology / IT")
+    if any(k in fam for k in ["legal", "protective", "public", "community", "social"]):
+        d.append("Policy / Public")
+
+    # title keywords
+    if any(k in title for k in ["policy", "compliance", "planner", "planning", "regulatory"]):
+        d.append("Policy / Public")
+    if any(k in title for k in ["sustain", "esg", "environment", "climate", "circular"]):
+        d.append("Sustainability / ESG")
+    if any(k in title for k in ["writer", "writing", "editor", "proposal", "report", "communications"]):
+        d.append("Writing / Communication")
+    if any(k in title for k in ["software", "developer", "data", "analyst", "cyber", "network"]):
+        d.append("Technology / IT")
+
+    # de-duplicate
+    seen = set()
+    out = []
+    for x in d:
+        if x not in seen:
+            seen.add(x)
+            out.append(x)
+    return out
+
+
+def domain_mask(domains: list[str]) -> int:
+    """Bitmask of the taxonomy domains in `domains` (unknown tags contribute nothing)."""
+    mask = 0
+    for d in domains:
+        mask |= DOMAIN_BITS.get(d, 0)
+    return mask
+
+
+def keyword_flags(title: str, family: str, keywords: KeywordRules) -> int:
+    title = (title or "").lower()
+    fam = (family or "").lower()
+    flags = 0
+    for i, (title_words, family_words) in enumerate(zip(keywords.title, keywords.family)):
+        if any(k in title for k in title_words) or any(k in fam for k in family_words):
+            flags |= 1 << i
+    return flags
+
+
+def keyword_flag_array(catalog, keywords: KeywordRules) -> np.ndarray:
+    """`keyword_flags` of every job of a `catalog.Catalog`, as uint8."""
+    return np.array(
+        [keyword_flags(title, family, keywords) for title, family in zip(catalog.titles, catalog.families)],
+        dtype=np.uint8,
+    )
+
+
+@dataclass(frozen=True)
+class JobFeatures:
+    """User-independent per-job features, aligned with catalog order."""
+
+    domains: list[tuple[str, ...]]  # display labels, in job_domains order
+    domain_mask: np.ndarray  # uint16 bitmask over DOMAINS
+    required_edu: np.ndarray  # jobzone_required_edu(job_zone)
+    keyword_flags: np.ndarray  # uint8 bits of the `KeywordRules` below
+    keywords: str  # `KeywordRules.digest` the flags were computed with
+    partitions: dict[str, np.ndarray] | None = None  # DOMAINS label -> ascending job indices
+
+    def aligned(self, user_domains: list[str]) -> np.ndarray:
+        """Boolean mask of jobs sharing at least one domain with `user_domains`."""
+        return (self.domain_mask & domain_mask(user_domains)) != 0
+
+    def aligned_rows(self, user_domains: list[str]) -> np.ndarray:
+        """Ascending indices of the jobs `aligned` selects, read from the domain partitions."""
+        if self.partitions is None:
+            return np.flatnonzero(self.aligned(user_domains))
+        parts = [self.partitions[d] for d in dict.fromkeys(user_domains) if d in self.partitions]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return parts[0] if len(parts) == 1 else np.unique(np.concatenate(parts))
+
+    def take(self, rows: np.ndarray) -> "JobFeatures":
+        """Features of `rows` (catalog indices), in that order."""
+        return JobFeatures(
+            domains=[self.domains[i] for i in rows.tolist()],
+            domain_mask=self.domain_mask[rows],
+            required_edu=self.required_edu[rows],
+            keyword_flags=self.keyword_flags[rows],
+            keywords=self.keywords,
+        )
+
+    def with_keywords(self, catalog, keywords: KeywordRules) -> "JobFeatures":
+        """These features with keyword flags from `keywords` (self if they already are)."""
+        if keywords.digest == self.keywords:
+            return self
+        return replace(self, keyword_flags=keyword_flag_array(catalog, keywords), keywords=keywords.digest)
+
+
+def build_job_features(catalog, keywords: KeywordRules) -> JobFeatures:
+    """Derive the feature index for every job of a `catalog.Catalog`, with keyword flags from `keywords`."""
+    domains = []
+    masks = np.zeros(len(catalog), dtype=np.uint16)
+    flags = np.zeros(len(catalog), dtype=np.uint8)
+    for i, (title, family) in enumerate(zip(catalog.titles, catalog.families)):
+        doms = tuple(job_domains({"title": title, "job_family": family}))
+        domains.append(doms)
+        masks[i] = domain_mask(doms)
+        flags[i] = keyword_flags(title, family, keywords)
+    required = np.array([jobzone_required_edu(z) for z in catalog.job_zones.tolist()])
+    partitions = {d: np.flatnonzero(masks & bit) for d, bit in DOMAIN_BITS.items()}
+    return JobFeatures(
+        domains=domains, domain_mask=masks, required_edu=required, keyword_flags=flags, keywords=keywords.digest,
+        partitions=partitions,
+    )
@@ -0,0 +1,126 @@
+"""Assessment form inputs: normalizers and tag extraction.
+
+Everything the form needs before a profile is scored: choice lists, the
+mapping of form answers to C values, and the keyword tables that turn
+free text into domain, skill and credential tags. Plain Python (no numpy,
+no catalog), so the app can draw the form while the scoring engine loads.
+"""
+
+from keywords import KeywordMatcher
+
+EDU_MODES = ("Strict", "Flexible", "Transform")
+
+# -----------------------------
+# Normalizers
+# -----------------------------
+# Form choices -> C values (also the grid of education/experience what-ifs).
+EDU_LEVELS = {
+    "High school": 0.25,
+    "Associate / Diploma": 0.40,
+    "Bachelor’s": 0.55,
+    "Master’s": 0.70,
+    "PhD / Doctorate": 0.90,
+    "Other / Prefer not to say": 0.50,
+}
+EXPERIENCE_BUCKETS = {"0–2": 0.20, "3–5": 0.40, "6–10": 0.60, "10+": 0.80}
+
+
+def edu_to_01(level: str) -> float:
+    return EDU_LEVELS.get(level, 0.50)
+
+
+def exp_to_01(bucket: str) -> float:
+    return EXPERIENCE_BUCKETS.get(bucket, 0.40)
+
+
+def learning_to_01(choice: str) -> float:
+    mapping = {
+        "Prefer mastery of what I know": 0.30,
+        "Comfortable learning gradually": 0.60,
+        "Actively seek steep learning curves": 0.90,
+    }
+    return mapping.get(choice, 0.60)
+
+# -----------------------------
+# Domain extraction (Education/Training → domain tags)
+# -----------------------------
+DOMAIN_PATTERNS = {
+    "Construction / Infrastructure": [
+        r"civil", r"construction", r"infrastructure", r"structural", r"geotechn", r"transport", r"highway", r"bridge", r"tunnel",
+        r"architecture", r"real estate", r"facility", r"facilities", r"building", r"bim", r"project controls",
+    ],
+    "Engineering": [r"engineering", r"mechanical", r"electrical", r"industrial", r"chemical", r"manufact", r"systems"],
+    "Business / Operations": [r"business", r"management", r"operations", r"strategy", r"mba", r"supply chain", r"logistics"],
+    "Finance": [r"finance", r"accounting", r"cfa", r"audit", r"econom"],
+    "Policy / Public": [r"policy", r"public", r"government", r"regulation", r"urban", r"planning"],
+    "Sustainability / ESG": [r"sustain", r"esg", r"climate", r"circular"],
+    "Technology / IT": [r"computer", r"software", r"data", r"ai", r"machine learning", r"it", r"cyber", r"cloud"],
+    "Health": [r"nursing", r"medical", r"health", r"clinic", r"pharm"],
+    "Education": [r"teacher", r"teaching", r"education", r"curriculum"],
+    "Writing / Communication": [r"writing", r"writer", r"communication", r"proposal", r"report", r"editor", r"journal"],
+}
+
+
+# Degree/credential tags (shown as 'other' tags; not used for strict alignment).
+OTHER_TAG_PATTERNS = {
+    "PhD-level": [r"\bphd\b", r"doctor"],
+    "Master’s": [r"\bmsc\b", r"master"],
+    "Bachelor’s": [r"\bbsc\b", r"bachelor"],
+    "PMP": [r"\bpmp\b"],
+}
+
+
+def extract_domains_from_text(text: str) -> list[str]:
+    return DOMAIN_MATCHER.find(text)["domains"]
+
+
+def extract_other_tags(text: str) -> list[str]:
+    """Degree/credential tags from education free text (not used for strict alignment)."""
+    return OTHER_TAG_MATCHER.find(text)["other"]
+
+# -----------------------------
+# Skills selection (chips + free text)
+# -----------------------------
+SKILL_CHIPS = [
+    "Writing / Communication",
+    "Research",
+    "Project Management",
+    "Stakeholder Management",
+    "Analytical Thinking",
+    "Finance / Budgeting",
+    "Operations",
+    "Leadership",
+    "Technical Engineering",
+    "Design / Creative",
+    "Data / Coding",
+]
+
+SKILL_PATTERNS = {
+    "Writing / Communication": [r"writing", r"writer", r"proposal", r"report", r"communication", r"editing", r"editor"],
+    "Research": [r"research", r"academic", r"publication", r"journal", r"study"],
+    "Project Management": [r"project", r"pmp", r"schedule", r"controls", r"planning"],
+    "Stakeholder Management": [r"stakeholder", r"client", r"negotiat", r"facilitat"],
+    "Analytical Thinking": [r"analysis", r"analytical", r"data", r"model"],
+    "Finance / Budgeting": [r"budget", r"finance", r"cost", r"capex", r"opex"],
+    "Operations": [r"operations", r"process", r"delivery", r"lean"],
+    "Leadership": [r"leader", r"manage", r"director"],
+    "Technical Engineering": [r"engineering", r"civil", r"mechanical", r"electrical", r"structural"],
+    "Design / Creative": [r"design", r"creative", r"ux", r"graphic"],
+    "Data / Coding": [r"python", r"sql", r"coding", r"software", r"developer"],
+}
+
+
+def extract_skills_from_text(text: str) -> list[str]:
+    return SKILL_MATCHER.find(text)["skills"]
+
+
+def extract_tags(text: str) -> dict[str, list[str]]:
+    """Domain, skill and other tags of a text from one matcher (e.g. bulk CV/transcript text)."""
+    return TAG_MATCHER.find(text)
+
+
+# Pattern tables become compiled matchers, built on first use (see keywords.py).
+DOMAIN_MATCHER = KeywordMatcher({"domains": DOMAIN_PATTERNS})
+SKILL_MATCHER = KeywordMatcher({"skills": SKILL_PATTERNS})
+OTHER_TAG_MATCHER = KeywordMatcher({"other": OTHER_TAG_PATTERNS})
+TAG_MATCHER = KeywordMatcher({"domains": DOMAIN_PATTERNS, "skills": SKILL_PATTERNS, "other": OTHER_TAG_PATTERNS})
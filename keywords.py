@@ -0,0 +1,123 @@
+"""Compiled keyword matcher for tag extraction.
+
+Tag tables map a tag to keyword patterns: plain literals, optionally wrapped
+in `\\b` word boundaries (e.g. r"civil", r"\\bphd\\b"). `KeywordMatcher`
+compiles one or more tables into one regex per leading character, each shaped
+like a character trie (longest keyword preferred). Each regex starts with a
+literal, so `re` skips ahead to candidate positions in C, and its scan stops as
+soon as every tag its keywords can yield has been found; a table is read once
+per leading character rather than once per pattern.
+
+The scan reports the longest keyword starting at each position. Any other
+keyword starting there must be a prefix of it; those are resolved from a
+table precomputed at compile time (with word boundaries re-checked where a
+pattern asks for them), so every tag the per-pattern loop finds is found,
+overlapping keywords included.
+"""
+
+import itertools
+import re
+
+_META = set(".^$*+?{}[]\\|()")
+
+
+def _parse(pattern: str) -> tuple[str, bool, bool]:
+    left = pattern.startswith(r"\b")
+    right = pattern.endswith(r"\b") and len(pattern) > 2
+    literal = pattern[2 if left else 0:len(pattern) - 2 if right else len(pattern)]
+    if not literal or _META & set(literal):
+        raise ValueError(f"unsupported keyword pattern {pattern!r}: expected a literal, optionally within \\b...\\b")
+    return literal, left, right
+
+
+def _trie_regex(words: list[str], first: int = 0) -> str:
+    root: dict = {}
+    for i, w in enumerate(words, first):
+        node = root
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = i
+
+    def emit(node: dict) -> str:
+        # Longer continuations first, the keyword ending here last: the
+        # first alternative that matches is the longest keyword.
+        alts = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if "" in node:
+            alts.append(f"(?P<k{node['']}>)")
+        return alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+
+    return emit(root)
+
+
+class KeywordMatcher:
+    """Tags found in a text for several `{tag: [pattern, ...]}` tables at once.
+
+    `find` returns `{table_name: [tag, ...]}` with tags in table order.
+    Patterns are validated up front; the regexes are compiled by the first `find`.
+    """
+
+    def __init__(self, tables: dict[str, dict[str, list[str]]]):
+        self.tables = {name: list(table) for name, table in tables.items()}
+        specs: dict[tuple[str, bool, bool], set[tuple[str, str]]] = {}
+        for name, table in tables.items():
+            for tag, patterns in table.items():
+                for pattern in patterns:
+                    specs.setdefault(_parse(pattern), set()).add((name, tag))
+        self._specs = specs
+        self._scans = None  # compiled by the first `find`
+
+    def _compile(self) -> None:
+        specs = self._specs
+        words = sorted({literal for literal, _, _ in specs})
+
+        # For each keyword: tags implied whenever it is the longest match at a
+        # position (every unbounded pattern whose literal is a prefix of it),
+        # plus bounded patterns whose boundaries must be checked there.
+        implied: dict[str, tuple[frozenset, list]] = {}
+        for i, word in enumerate(words):
+            static: set[tuple[str, str]] = set()
+            checks = []
+            for (literal, left, right), tags in specs.items():
+                if not word.startswith(literal):
+                    continue
+                if left or right:
+                    rx = re.compile((r"\b" if left else "") + re.escape(literal) + (r"\b" if right else ""))
+                    checks.extend((tag, rx) for tag in tags)
+                else:
+                    static |= tags
+            implied[f"k{i}"] = (frozenset(static), checks)
+        self._implied = implied
+
+        # One trie per leading character (a contiguous run of the sorted
+        # words), paired with every tag its keywords can yield.
+        scans = []
+        first = 0
+        for _, group in itertools.groupby(words, key=lambda w: w[0]):
+            group = list(group)
+            keys = [f"k{i}" for i in range(first, first + len(group))]
+            tags = frozenset().union(*(implied[k][0] | {tag for tag, _ in implied[k][1]} for k in keys))
+            scans.append((re.compile(_trie_regex(group, first)), tags))
+            first += len(group)
+        self._scans = scans  # set last: other threads may read `_implied` once this is set
+
+    def find(self, text: str) -> dict[str, list[str]]:
+        found: set[tuple[str, str]] = set()
+        t = (text or "").lower()
+        if self._scans is None:
+            self._compile()
+        implied = self._implied
+        for rx, tags in self._scans:
+            search = rx.search
+            pos = 0
+            # Stop once nothing this trie can match would add a tag.
+            while not tags <= found:
+                m = search(t, pos)
+                if m is None:
+                    break
+                static, checks = implied[m.lastgroup]
+                found |= static
+                for tag, brx in checks:
+                    if tag not in found and brx.match(t, m.start()):
+                        found.add(tag)
+                pos = m.start() + 1  # keywords may overlap: resume right after the match start
+        return {name: [tag for tag in tags if (name, tag) in found] for name, tags in self.tables.items()}
@@ -1,6 +1,18 @@
+from dataclasses import dataclass
+from functools import partial
+
 import numpy as np
 
-W_P, W_A, W_C = 0.40, 0.35, 0.25
+from scoring import DEFAULT_CONFIG, ScoringConfig
+from telemetry import count, span
+
+# Canonical feature order for the packed (batch) representation.
+P_KEYS = ("independence", "ambiguity", "structure", "cognitive", "pace")
+A_KEYS = ("income", "purpose", "leadership", "flexibility", "balance")
+C_KEYS = ("education", "experience", "learning")
+X_KEYS = ("sales", "political", "travel")
+
+_MANY_BLOCK = 1 << 22  # (user, job, key) values per block in `fit_scores_many`
 
 
 def similarity(v1: dict, v2: dict) -> float:
@@ -29,21 +41,338 @@ def capability_score(user_c: dict, job_c: dict) -> float:
     return float(sum(scores) / len(scores))
 
 
-def exclusion_penalty(user_x: dict, job_x: dict) -> float:
-    """Penalty in [0,0.60]. Each conflict adds 0.15."""
+def exclusion_penalty(user_x: dict, job_x: dict, config: ScoringConfig = DEFAULT_CONFIG) -> float:
+    """Penalty in [0, cap]. Each conflict adds a step (default 0.15, capped at 0.60)."""
     penalty = 0.0
     for k, v in user_x.items():
         if bool(v) and bool(job_x.get(k, False)):
-            penalty += 0.15
-    return float(min(penalty, 0.60))
+            penalty += config.exclusion_step
+    return float(min(penalty, config.exclusion_cap))
+
 
+def fit_score(user, job, config: ScoringConfig = DEFAULT_CONFIG) -> float:
+    """Return fit score as percentage [0,100].
 
-def fit_score(user: dict, job: dict) -> float:
-    """Return fit score as percentage [0,100]."""
+    Reference implementation for a single job; see `fit_scores` for the
+    batch path used by the app. Also takes a `models.UserProfile` / `models.Job`.
+    Weights and the exclusion penalty come from `config` (see scoring.py).
+    """
+    if not isinstance(user, dict):
+        user = user.as_dict()
+    if not isinstance(job, dict):
+        job = job.as_dict()
     p = similarity(user.get("P", {}), job.get("P_job", {}))
     a = similarity(user.get("A", {}), job.get("A_job", {}))
     c = capability_score(user.get("C", {}), job.get("C_job", {}))
 
-    base = (W_P * p) + (W_A * a) + (W_C * c)
-    final = base * (1.0 - exclusion_penalty(user.get("X", {}), job.get("X_job", {})))
+    w_p, w_a, w_c = config.weights
+    base = (w_p * p) + (w_a * a) + (w_c * c)
+    final = base * (1.0 - exclusion_penalty(user.get("X", {}), job.get("X_job", {}), config))
     return round(final * 100.0, 1)
+
+
+# -----------------------------
+# Batch scoring
+# -----------------------------
+@dataclass(frozen=True)
+class JobMatrix:
+    """Dense per-job feature arrays, one row per job in catalog order.
+
+    P/A/C hold floats with NaN where a job lacks a key; X holds booleans.
+    """
+
+    p_keys: tuple[str, ...]
+    a_keys: tuple[str, ...]
+    c_keys: tuple[str, ...]
+    x_keys: tuple[str, ...]
+    P: np.ndarray
+    A: np.ndarray
+    C: np.ndarray
+    X: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.P.shape[0])
+
+    def take(self, rows: np.ndarray) -> "JobMatrix":
+        """The sub-matrix of `rows` (catalog indices), in that order."""
+        return JobMatrix(self.p_keys, self.a_keys, self.c_keys, self.x_keys, self.P[rows], self.A[rows], self.C[rows], self.X[rows])
+
+
+def _column_keys(jobs: list[dict], field: str, canonical: tuple[str, ...]) -> tuple[str, ...]:
+    keys = list(canonical)
+    for job in jobs:
+        for k in job.get(field, {}):
+            if k not in keys:
+                keys.append(k)
+    return tuple(keys)
+
+
+def _pack(jobs: list[dict], field: str, keys: tuple[str, ...]) -> np.ndarray:
+    out = np.full((len(jobs), len(keys)), np.nan)
+    for i, job in enumerate(jobs):
+        values = job.get(field, {})
+        for j, k in enumerate(keys):
+            if k in values:
+                out[i, j] = float(values[k])
+    return out
+
+
+def pack_jobs(jobs: list[dict]) -> JobMatrix:
+    """Pack P_job/A_job/C_job/X_job of every job into dense arrays (done once per catalog)."""
+    p_keys = _column_keys(jobs, "P_job", P_KEYS)
+    a_keys = _column_keys(jobs, "A_job", A_KEYS)
+    c_keys = _column_keys(jobs, "C_job", C_KEYS)
+    x_keys = _column_keys(jobs, "X_job", X_KEYS)
+    X = np.zeros((len(jobs), len(x_keys)), dtype=bool)
+    for i, job in enumerate(jobs):
+        flags = job.get("X_job", {})
+        for j, k in enumerate(x_keys):
+            X[i, j] = bool(flags.get(k, False))
+    return JobMatrix(
+        p_keys=p_keys,
+        a_keys=a_keys,
+        c_keys=c_keys,
+        x_keys=x_keys,
+        P=_pack(jobs, "P_job", p_keys),
+        A=_pack(jobs, "A_job", a_keys),
+        C=_pack(jobs, "C_job", c_keys),
+        X=X,
+    )
+
+
+def _user_vector(values: dict | np.ndarray, keys: tuple[str, ...], missing: float = np.nan) -> np.ndarray:
+    """`values` as an array in `keys` order; arrays are taken to be in that order already."""
+    if isinstance(values, np.ndarray):
+        return values
+    return np.array([float(values[k]) if k in values else missing for k in keys])
+
+
+def _reorder(v: np.ndarray, canonical: tuple[str, ...], keys: tuple[str, ...], missing) -> np.ndarray:
+    if keys == canonical:
+        return v
+    pos = {k: j for j, k in enumerate(canonical)}
+    return np.array([v[pos[k]] if k in pos else missing for k in keys], dtype=v.dtype)
+
+
+def user_vectors(user, jobs: JobMatrix) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """P, A, C and X of `user` as arrays in the key order of `jobs`.
+
+    `user` is a profile dict or a `models.UserProfile` (arrays in canonical
+    key order; keys only the catalog has count as missing).
+    """
+    if isinstance(user, dict):
+        x = user.get("X", {})
+        return (
+            _user_vector(user.get("P", {}), jobs.p_keys),
+            _user_vector(user.get("A", {}), jobs.a_keys),
+            _user_vector(user.get("C", {}), jobs.c_keys, 0.0),
+            np.array([bool(x.get(k, False)) for k in jobs.x_keys], dtype=bool),
+        )
+    return (
+        _reorder(user.P, P_KEYS, jobs.p_keys, np.nan),
+        _reorder(user.A, A_KEYS, jobs.a_keys, np.nan),
+        _reorder(user.C, C_KEYS, jobs.c_keys, 0.0),
+        _reorder(user.X, X_KEYS, jobs.x_keys, False),
+    )
+
+
+def similarities(user_v: dict | np.ndarray, job_v: np.ndarray, keys: tuple[str, ...]) -> np.ndarray:
+    """Batch `similarity` of one user vector against every row of `job_v`.
+
+    An (m, k) array of m user vectors gives (m, n_jobs) results.
+    """
+    u = _user_vector(user_v, keys)[..., None, :]
+    shared = ~np.isnan(job_v) & ~np.isnan(u)
+    diffs = np.where(shared, np.abs(job_v - u), 0.0)
+    n = shared.sum(axis=-1)
+    sim = np.maximum(0.0, 1.0 - diffs.sum(axis=-1) / np.maximum(n, 1))
+    return np.where(n > 0, sim, 0.5)
+
+
+def capability_scores(user_c: dict | np.ndarray, job_c: np.ndarray, keys: tuple[str, ...]) -> np.ndarray:
+    """Batch `capability_score` of one user (or an (m, k) stack of users) against every row of `job_c`."""
+    have = _user_vector(user_c, keys, 0.0)[..., None, :]
+    present = ~np.isnan(job_c)
+    req = np.where(present, job_c, 0.0).astype(np.float64)  # float32 catalogs still divide in float64
+    ratio = np.divide(have, req, out=np.ones(np.broadcast_shapes(have.shape, req.shape)), where=req > 0)
+    per_key = np.where(present, np.clip(ratio, 0.0, 1.0), 0.0)
+    n = present.sum(axis=-1)
+    return np.where(n > 0, per_key.sum(axis=-1) / np.maximum(n, 1), 0.5)
+
+
+def exclusion_penalties(
+    user_x: dict | np.ndarray, job_x: np.ndarray, keys: tuple[str, ...], config: ScoringConfig = DEFAULT_CONFIG
+) -> np.ndarray:
+    """Batch `exclusion_penalty` of one user (or an (m, k) stack of users) against every row of `job_x`."""
+    if isinstance(user_x, np.ndarray):
+        avoid = user_x
+    else:
+        avoid = np.array([bool(user_x.get(k, False)) for k in keys], dtype=bool)
+    conflicts = (job_x & avoid[..., None, :]).sum(axis=-1)
+    return config.exclusion_penalties(conflicts, len(keys))
+
+
+def round1(x: np.ndarray) -> np.ndarray:
+    """Round to 1 decimal exactly like Python's `round(v, 1)`.
+
+    np.round scales by 10 first, which can flip values sitting just below a
+    half (e.g. 82.35 is stored as 82.3499...); those few are redone in Python.
+    """
+    out = np.round(x, 1)
+    scaled = x * 10.0
+    near_half = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    if len(near_half):
+        out.flat[near_half] = [round(v, 1) for v in x.flat[near_half].tolist()]
+    return out
+
+
+def fit_scores(user, jobs: JobMatrix, config: ScoringConfig = DEFAULT_CONFIG) -> np.ndarray:
+    """Return fit scores as percentages [0,100] for every job in `jobs`.
+
+    `user` is a profile dict or a `models.UserProfile`. Vectorized
+    equivalent of calling `fit_score` per job; results agree exactly.
+    """
+    with span("fit_scores"):
+        u_p, u_a, u_c, u_x = user_vectors(user, jobs)
+        p = similarities(u_p, jobs.P, jobs.p_keys)
+        a = similarities(u_a, jobs.A, jobs.a_keys)
+        c = capability_scores(u_c, jobs.C, jobs.c_keys)
+
+        w_p, w_a, w_c = config.weights
+        base = (w_p * p) + (w_a * a) + (w_c * c)
+        final = base * (1.0 - exclusion_penalties(u_x, jobs.X, jobs.x_keys, config))
+        return round1(final * 100.0)
+
+
+def fit_scores_many(users: list, jobs: JobMatrix, config: ScoringConfig = DEFAULT_CONFIG) -> np.ndarray:
+    """`fit_scores` of several users in one batched pass: an (n_users, n_jobs) array.
+
+    Users are dicts or `models.UserProfile`. Each component is computed once
+    per distinct user vector, so variants of one profile that differ in a
+    single key (what-if grids) mostly share work. Temporaries are kept near
+    `_MANY_BLOCK` (user, job, key) values.
+    """
+    with span("fit_scores.many"):
+        if not len(users):
+            return np.empty((0, len(jobs)))
+        stacked = [np.stack(parts) for parts in zip(*(user_vectors(u, jobs) for u in users))]
+        p, a, c, x = (
+            _per_distinct_user(fn, u, job_v, keys)
+            for fn, u, job_v, keys in zip(
+                (similarities, similarities, capability_scores, partial(exclusion_penalties, config=config)),
+                stacked,
+                (jobs.P, jobs.A, jobs.C, jobs.X),
+                (jobs.p_keys, jobs.a_keys, jobs.c_keys, jobs.x_keys),
+            )
+        )
+        w_p, w_a, w_c = config.weights
+        base = (w_p * p) + (w_a * a) + (w_c * c)
+        final = base * (1.0 - x)
+        return round1(final * 100.0)
+
+
+def _per_distinct_user(fn, u: np.ndarray, job_v: np.ndarray, keys: tuple[str, ...]) -> np.ndarray:
+    """`fn(u, job_v, keys)` for an (m, k) user stack, evaluated once per distinct row."""
+    seen: dict[bytes, int] = {}
+    inverse = np.array([seen.setdefault(row.tobytes(), len(seen)) for row in u])
+    distinct = u[np.unique(inverse, return_index=True)[1]]
+    out = np.empty((len(distinct), job_v.shape[0]))
+    step = max(1, _MANY_BLOCK // max(1, job_v.shape[0] * job_v.shape[1]))
+    for s in range(0, len(distinct), step):
+        out[s:s + step] = fn(distinct[s:s + step], job_v, keys)
+    return out[inverse]
+
+
+# -----------------------------
+# Incremental scoring
+# -----------------------------
+class _Component:
+    """Per-key columns of one additive component, cached between calls.
+
+    `cols[j]` holds key j's contribution for every job; a new user vector
+    only recomputes the columns whose user value changed.
+    """
+
+    def __init__(self, job_v: np.ndarray, column):
+        self.job_v = job_v
+        self.column = column  # (job_col, user_value) -> (contribution, counted)
+        self.u = None
+        k, n = job_v.shape[1], job_v.shape[0]
+        self.cols = np.zeros((k, n))
+        self.counted = np.zeros((k, n), dtype=bool)
+        self.n = None
+
+    def update(self, u: np.ndarray) -> int:
+        """Refresh columns for user vector `u`; returns how many were recomputed."""
+        if self.u is None:
+            changed = range(len(u))
+        else:
+            same = (self.u == u) | (np.isnan(self.u) & np.isnan(u))
+            changed = np.flatnonzero(~same).tolist()
+        for j in changed:
+            self.cols[j], self.counted[j] = self.column(self.job_v[:, j], u[j])
+        if changed or self.n is None:
+            self.n = self.counted.sum(axis=0)
+        self.u = u.copy()  # may be the caller's UserProfile array
+        return len(changed)
+
+
+def _similarity_column(job_col: np.ndarray, u: float):
+    shared = ~np.isnan(job_col) & (u == u)
+    return np.where(shared, np.abs(job_col - u), 0.0), shared
+
+
+def _capability_column(job_col: np.ndarray, have: float):
+    present = ~np.isnan(job_col)
+    req = np.where(present, job_col, 0.0).astype(np.float64)
+    ratio = np.divide(have, req, out=np.ones_like(req), where=req > 0)
+    return np.where(present, np.clip(ratio, 0.0, 1.0), 0.0), present
+
+
+class IncrementalScorer:
+    """`fit_scores` for one user whose inputs change a few keys at a time.
+
+    P, A and C are additive over keys, so the per-key columns of the previous
+    call are kept and only keys whose value moved are recomputed; the
+    component means and the exclusion penalty are then re-applied. Results
+    are identical to `fit_scores` with the same `config`.
+    """
+
+    def __init__(self, jobs: JobMatrix, config: ScoringConfig = DEFAULT_CONFIG):
+        self.jobs = jobs
+        self.config = config
+        self._p = _Component(jobs.P, _similarity_column)
+        self._a = _Component(jobs.A, _similarity_column)
+        self._c = _Component(jobs.C, _capability_column)
+        self._x = None
+        self._penalty = None
+        self.recomputed = 0  # columns recomputed by the last call
+        self.columns = len(jobs.p_keys) + len(jobs.a_keys) + len(jobs.c_keys) + len(jobs.x_keys)
+
+    def score(self, user) -> np.ndarray:
+        """Fit scores for `user` (a profile dict or `models.UserProfile`)."""
+        with span("fit_scores.incremental"):
+            return self._score(user)
+
+    def _score(self, user) -> np.ndarray:
+        jobs = self.jobs
+        u_p, u_a, u_c, avoid = user_vectors(user, jobs)
+        recomputed = self._p.update(u_p)
+        recomputed += self._a.update(u_a)
+        recomputed += self._c.update(u_c)
+
+        if self._x is None or not np.array_equal(avoid, self._x):
+            recomputed += len(avoid) if self._x is None else int((avoid != self._x).sum())
+            self._penalty = self.config.exclusion_penalties((jobs.X & avoid).sum(axis=1), len(jobs.x_keys))
+            self._x = avoid
+        self.recomputed = recomputed
+        count("columns_recomputed", recomputed)
+
+        p = np.where(self._p.n > 0, np.maximum(0.0, 1.0 - self._p.cols.sum(axis=0) / np.maximum(self._p.n, 1)), 0.5)
+        a = np.where(self._a.n > 0, np.maximum(0.0, 1.0 - self._a.cols.sum(axis=0) / np.maximum(self._a.n, 1)), 0.5)
+        c = np.where(self._c.n > 0, self._c.cols.sum(axis=0) / np.maximum(self._c.n, 1), 0.5)
+
+        w_p, w_a, w_c = self.config.weights
+        base = (w_p * p) + (w_a * a) + (w_c * c)
+        final = base * (1.0 - self._penalty)
+        return round1(final * 100.0)
@@ -0,0 +1,139 @@
+"""Compact, typed records for jobs, user profiles and scored results.
+
+The JSON shapes (`job["P_job"]["independence"]`, `user["P"]["pace"]`, one
+dict per result row) cost a dict plus a boxed float per feature, per job.
+These records keep the features in fixed key order instead:
+
+    Job           a row of a `JobMatrix`, shared with the catalog (no copy)
+    UserProfile   P/A/C/X as small arrays in `P_KEYS`/`A_KEYS`/... order
+    ScoredResult  one result row, slotted; `as_dict()` gives the JSON shape
+
+`matcher` accepts `UserProfile` wherever it takes a user dict, and `Job`
+in `fit_score`. Measure the difference with
+`python -m benchmarks.bench_memory`.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from matcher import A_KEYS, C_KEYS, P_KEYS, X_KEYS, JobMatrix, pack_jobs
+
+
+@dataclass(frozen=True, slots=True)
+class Job:
+    """One job: its labels and row `row` of `matrix`."""
+
+    job_id: str
+    title: str
+    family: str
+    job_zone: int
+    matrix: JobMatrix
+    row: int
+
+    @classmethod
+    def from_dict(cls, job: dict) -> "Job":
+        """A standalone job from the JSON shape (packs a one-row matrix)."""
+        return cls(
+            job_id=job.get("job_id") or "",
+            title=job.get("title") or "",
+            family=job.get("job_family") or "",
+            job_zone=int(job.get("job_zone", 3)),
+            matrix=pack_jobs([job]),
+            row=0,
+        )
+
+    @property
+    def P(self) -> np.ndarray:
+        return self.matrix.P[self.row]
+
+    @property
+    def A(self) -> np.ndarray:
+        return self.matrix.A[self.row]
+
+    @property
+    def C(self) -> np.ndarray:
+        return self.matrix.C[self.row]
+
+    @property
+    def X(self) -> np.ndarray:
+        return self.matrix.X[self.row]
+
+    def as_dict(self) -> dict:
+        """The JSON shape (missing keys omitted), as `fit_score` and the dataset use it."""
+        m = self.matrix
+        job = {}
+        for key, value in (("job_id", self.job_id), ("title", self.title), ("job_family", self.family)):
+            if value:
+                job[key] = value
+        job["job_zone"] = self.job_zone
+        for field, keys, row in (("P_job", m.p_keys, self.P), ("A_job", m.a_keys, self.A), ("C_job", m.c_keys, self.C)):
+            job[field] = {k: float(v) for k, v in zip(keys, row.tolist()) if v == v}
+        job["X_job"] = {k: bool(v) for k, v in zip(m.x_keys, self.X.tolist())}
+        return job
+
+
+@dataclass(frozen=True, slots=True)
+class UserProfile:
+    """A user's scoring inputs in canonical key order.
+
+    Unanswered P/A keys are NaN (skipped by `similarity`); missing C keys
+    are 0.0 and missing X keys False, as the dict functions treat them.
+    """
+
+    P: np.ndarray  # P_KEYS
+    A: np.ndarray  # A_KEYS
+    C: np.ndarray  # C_KEYS
+    X: np.ndarray  # X_KEYS, bool
+
+    @classmethod
+    def from_dict(cls, user: dict) -> "UserProfile":
+        def vector(values: dict, keys: tuple[str, ...], missing: float) -> np.ndarray:
+            return np.array([float(values[k]) if k in values else missing for k in keys])
+
+        x = user.get("X", {})
+        return cls(
+            P=vector(user.get("P", {}), P_KEYS, np.nan),
+            A=vector(user.get("A", {}), A_KEYS, np.nan),
+            C=vector(user.get("C", {}), C_KEYS, 0.0),
+            X=np.array([bool(x.get(k, False)) for k in X_KEYS], dtype=bool),
+        )
+
+    @property
+    def education(self) -> float:
+        return float(self.C[C_KEYS.index("education")])
+
+    def as_dict(self) -> dict:
+        return {
+            "P": {k: v for k, v in zip(P_KEYS, self.P.tolist()) if v == v},
+            "A": {k: v for k, v in zip(A_KEYS, self.A.tolist()) if v == v},
+            "C": dict(zip(C_KEYS, self.C.tolist())),
+            "X": dict(zip(X_KEYS, self.X.tolist())),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class ScoredResult:
+    """One row of a result section."""
+
+    job_id: str
+    title: str
+    family: str
+    job_zone: int
+    score: float
+    edu_gap: float
+    domains: tuple[str, ...]  # shared with the feature index
+    category: str
+
+    def as_dict(self) -> dict:
+        """The JSON shape returned by the service and the bulk CLI."""
+        return {
+            "job_id": self.job_id,
+            "title": self.title,
+            "family": self.family,
+            "job_zone": self.job_zone,
+            "score": self.score,
+            "edu_gap": self.edu_gap,
+            "domains": list(self.domains),
+            "category": self.category,
+        }
@@ -0,0 +1,325 @@
+"""Build the job catalog from a local copy of the O*NET database (text release).
+
+    python onet_ingest.py db_29_0_text/                          # writes jobs_onet_mvp.json
+    python onet_ingest.py db_29_0_text/ -o data/jobs.json --base jobs_onet_mvp.json --compile
+
+Source files (tab-delimited, with a header row) and what they feed:
+
+    Occupation Data.txt                          job_id, title (job_family from the SOC major group)
+    Job Zones.txt                                job_zone
+    Work Styles.txt                              P_job, A_job.leadership   (importance, IM 1–5)
+    Work Values.txt                              A_job                     (extent, EX 1–7)
+    Education, Training, and Experience.txt      C_job                     (category distributions)
+
+Every file is streamed row by row and folded into per-occupation sums, so
+memory depends on the number of occupations, not on file size. Descriptor
+ratings are rescaled to 0–1 and averaged per feature key; category
+distributions (required education, related experience, on-the-job
+training) become the expected value of a 0–1 score per category, on the
+same scale as the app's answers. Rows flagged "Recommend Suppress" are
+skipped. Only occupations with a job zone are written.
+
+O*NET has no descriptors for the X_job exclusions; they are carried over
+from `--base` (an existing catalog JSON), which also fills any P/A/C key
+an occupation has no ratings for. Without a base, such keys are left out
+and the matcher treats them as missing.
+
+Incremental rebuilds: the folded sums of each source file are cached in
+`<output>.ingest/` with the file's size and mtime in a manifest. A rebuild
+re-reads only files that changed (or whose mapping tables below changed)
+and merges the cached sums of the others.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from cache import canonical_hash
+from catalog import compile_catalog
+
+SOURCES = {
+    "occupations": "Occupation Data.txt",
+    "job_zones": "Job Zones.txt",
+    "work_styles": "Work Styles.txt",
+    "work_values": "Work Values.txt",
+    "education": "Education, Training, and Experience.txt",
+}
+OPTIONAL_SOURCES = ("work_styles", "work_values", "education")
+
+SOC_FAMILIES = {
+    "11": "Management",
+    "13": "Business & Finance",
+    "15": "Computer & Mathematical",
+    "17": "Architecture & Engineering",
+    "19": "Life, Physical & Social Science",
+    "21": "Community & Social Service",
+    "23": "Legal",
+    "25": "Education",
+    "27": "Arts, Design, Entertainment, Sports & Media",
+    "29": "Healthcare Practitioners",
+    "31": "Healthcare Support",
+    "33": "Protective Service",
+    "35": "Food Preparation & Serving",
+    "37": "Building & Grounds Cleaning & Maintenance",
+    "39": "Personal Care & Service",
+    "41": "Sales",
+    "43": "Office & Administrative Support",
+    "45": "Farming, Fishing & Forestry",
+    "47": "Construction & Extraction",
+    "49": "Installation, Maintenance & Repair",
+    "51": "Production",
+    "53": "Transportation & Material Moving",
+}
+
+# Descriptor ratings: element name -> feature keys it contributes to.
+WORK_STYLES = {
+    "Independence": ["P.independence"],
+    "Adaptability/Flexibility": ["P.ambiguity"],
+    "Innovation": ["P.ambiguity"],
+    "Attention to Detail": ["P.structure"],
+    "Dependability": ["P.structure"],
+    "Analytical Thinking": ["P.cognitive"],
+    "Stress Tolerance": ["P.pace"],
+    "Achievement/Effort": ["P.pace"],
+    "Leadership": ["A.leadership"],
+}
+WORK_VALUES = {
+    "Recognition": ["A.income"],
+    "Achievement": ["A.purpose"],
+    "Relationships": ["A.purpose"],
+    "Independence": ["A.flexibility"],
+    "Working Conditions": ["A.balance"],
+}
+# source -> (scale id, scale min, scale max, element map)
+RATINGS = {
+    "work_styles": ("IM", 1.0, 5.0, WORK_STYLES),
+    "work_values": ("EX", 1.0, 7.0, WORK_VALUES),
+}
+
+# Category distributions (Education, Training, and Experience): scale id ->
+# (feature key, 0–1 score per category). Education follows edu_to_01 and
+# experience follows exp_to_01 in inputs.py.
+CATEGORIES = {
+    "RL": ("C.education", {
+        1: 0.15, 2: 0.25, 3: 0.35, 4: 0.35, 5: 0.40, 6: 0.55,
+        7: 0.60, 8: 0.70, 9: 0.75, 10: 0.85, 11: 0.90, 12: 0.95,
+    }),
+    "RW": ("C.experience", {
+        1: 0.05, 2: 0.08, 3: 0.10, 4: 0.12, 5: 0.15, 6: 0.20,
+        7: 0.30, 8: 0.45, 9: 0.60, 10: 0.70, 11: 0.80,
+    }),
+    "OJ": ("C.learning", {1: 0.30, 2: 0.35, 3: 0.40, 4: 0.45, 5: 0.55, 6: 0.65, 7: 0.75, 8: 0.85, 9: 0.90}),
+}
+
+# Cached folded sources are only reused while these tables are unchanged.
+MAPPING_VERSION = canonical_hash([SOC_FAMILIES, RATINGS, CATEGORIES])
+
+CODE = "O*NET-SOC Code"
+SUPPRESS = "Recommend Suppress"
+
+
+def _rows(path: Path, *columns: str):
+    """Stream the named columns of a tab-delimited O*NET file as tuples.
+
+    Columns missing from the header read as "" (e.g. "Recommend Suppress"
+    in files that have no such column).
+    """
+    with path.open("r", encoding="utf-8", errors="replace", newline="") as f:
+        reader = csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
+        header = next(reader, None)
+        if header is None:
+            return
+        if CODE not in header:
+            raise ValueError(f"{path.name}: missing {CODE!r} column")
+        pos = [header.index(c) if c in header else None for c in columns]
+        missing = [c for c, i in zip(columns, pos) if i is None and c != SUPPRESS]
+        if missing:
+            raise ValueError(f"{path.name}: missing column(s) {', '.join(missing)}")
+        width = len(header)
+        for row in reader:
+            if len(row) == width:
+                yield tuple("" if i is None else row[i] for i in pos)
+
+
+def fold_source(name: str, path: Path) -> dict[str, dict]:
+    """Fold one source file into `{code: {field: value}}`.
+
+    Rating fields hold `[weighted sum, weight]` pairs so partial results of
+    several files can be merged before averaging.
+    """
+    out: dict[str, dict] = {}
+    if name == "occupations":
+        for code, title in _rows(path, CODE, "Title"):
+            out[code] = {"title": title.strip()}
+    elif name == "job_zones":
+        for code, zone in _rows(path, CODE, "Job Zone"):
+            out[code] = {"job_zone": int(zone)}
+    elif name in RATINGS:
+        scale, lo, hi, elements = RATINGS[name]
+        for code, element, scale_id, value, suppress in _rows(path, CODE, "Element Name", "Scale ID", "Data Value", SUPPRESS):
+            keys = elements.get(element)
+            if not keys or scale_id != scale or suppress == "Y":
+                continue
+            v = min(1.0, max(0.0, (float(value) - lo) / (hi - lo)))
+            acc = out.setdefault(code, {})
+            for key in keys:
+                s = acc.setdefault(key, [0.0, 0.0])
+                s[0] += v
+                s[1] += 1.0
+    elif name == "education":
+        for code, scale_id, category, value, suppress in _rows(path, CODE, "Scale ID", "Category", "Data Value", SUPPRESS):
+            spec = CATEGORIES.get(scale_id)
+            if spec is None or suppress == "Y":
+                continue
+            key, scores = spec
+            score = scores.get(int(float(category)))
+            pct = float(value)
+            if score is None or pct <= 0:
+                continue
+            s = out.setdefault(code, {}).setdefault(key, [0.0, 0.0])
+            s[0] += score * pct
+            s[1] += pct
+    else:
+        raise ValueError(f"unknown O*NET source {name!r}")
+    return out
+
+
+def _fingerprint(path: Path) -> dict:
+    st = path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def load_partials(onet_dir: Path, cache_dir: Path, force: bool = False) -> tuple[dict[str, dict], list[str]]:
+    """Folded results per source, re-reading only changed files. Returns (partials, rebuilt source names)."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = cache_dir / "manifest.json"
+    manifest = {}
+    if manifest_path.exists() and not force:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest.get("mapping") != MAPPING_VERSION:
+            manifest = {}
+    entries = manifest.get("sources", {})
+
+    partials, rebuilt = {}, []
+    for name, filename in SOURCES.items():
+        path = onet_dir / filename
+        if not path.exists():
+            if name in OPTIONAL_SOURCES:
+                entries.pop(name, None)
+                continue
+            raise FileNotFoundError(f"{path} not found (required O*NET file)")
+        fp = _fingerprint(path)
+        part_path = cache_dir / f"{name}.json"
+        if entries.get(name) == fp and part_path.exists():
+            partials[name] = json.loads(part_path.read_text(encoding="utf-8"))
+            continue
+        partials[name] = fold_source(name, path)
+        _write_json(part_path, partials[name])
+        entries[name] = fp
+        rebuilt.append(name)
+
+    _write_json(manifest_path, {"mapping": MAPPING_VERSION, "sources": entries})
+    return partials, rebuilt
+
+
+def _mean(acc: dict, field: str) -> float | None:
+    s = acc.get(field)
+    if not s or s[1] <= 0:
+        return None
+    return round(s[0] / s[1], 2)
+
+
+def build_jobs(partials: dict[str, dict], base: list[dict] | None = None) -> list[dict]:
+    """Merge folded sources into catalog jobs (the jobs_onet_mvp.json schema), sorted by title."""
+    base_by_id = {job["job_id"]: job for job in base or []}
+    occupations = partials["occupations"]
+    zones = partials["job_zones"]
+    ratings: dict[str, dict] = {}
+    for name in OPTIONAL_SOURCES:
+        for code, fields in partials.get(name, {}).items():
+            acc = ratings.setdefault(code, {})
+            for field, (total, weight) in fields.items():
+                s = acc.setdefault(field, [0.0, 0.0])
+                s[0] += total
+                s[1] += weight
+
+    groups = {
+        "P_job": ("independence", "ambiguity", "structure", "cognitive", "pace"),
+        "A_job": ("income", "purpose", "leadership", "flexibility", "balance"),
+        "C_job": ("education", "experience", "learning"),
+    }
+    jobs = []
+    for code, occ in occupations.items():
+        if code not in zones:
+            continue
+        fallback = base_by_id.get(code, {})
+        acc = ratings.get(code, {})
+        job = {
+            "job_id": code,
+            "title": occ["title"],
+            "job_family": SOC_FAMILIES.get(code[:2], "Other"),
+            "job_zone": zones[code]["job_zone"],
+        }
+        for field, keys in groups.items():
+            prefix = field[0]
+            values = {}
+            for k in keys:
+                v = _mean(acc, f"{prefix}.{k}")
+                if v is None:
+                    v = fallback.get(field, {}).get(k)
+                if v is not None:
+                    values[k] = v
+            job[field] = values
+        job["X_job"] = dict(fallback.get("X_job") or {"sales": False, "political": False, "travel": False})
+        jobs.append(job)
+    jobs.sort(key=lambda j: (j["title"], j["job_id"]))
+    return jobs
+
+
+def _write_json(path: Path, obj, indent: int | None = None) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp, path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the job catalog from raw O*NET text files")
+    parser.add_argument("onet_dir", type=Path, help="directory of the O*NET text release")
+    parser.add_argument("-o", "--output", type=Path, default=Path("jobs_onet_mvp.json"))
+    parser.add_argument("--base", type=Path, help="existing catalog JSON for X_job flags and missing ratings")
+    parser.add_argument("--cache-dir", type=Path, help="folded-source cache (default: <output>.ingest)")
+    parser.add_argument("--force", action="store_true", help="re-read every source file")
+    parser.add_argument("--compile", action="store_true", help="also write the compiled catalog (catalog.py)")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    cache_dir = args.cache_dir or args.output.with_name(args.output.name + ".ingest")
+    try:
+        partials, rebuilt = load_partials(args.onet_dir, cache_dir, force=args.force)
+    except (FileNotFoundError, ValueError) as e:
+        sys.exit(str(e))
+    base = None
+    if args.base:
+        with args.base.open("r", encoding="utf-8") as f:
+            base = json.load(f)
+    jobs = build_jobs(partials, base)
+    _write_json(args.output, jobs, indent=2)
+
+    reused = [name for name in partials if name not in rebuilt]
+    print(
+        f"Wrote {args.output}: {len(jobs):,} occupations in {time.perf_counter() - t0:.2f}s"
+        f" · re-read: {', '.join(rebuilt) or 'none'} · cached: {', '.join(reused) or 'none'}",
+        file=sys.stderr,
+    )
+    if args.compile:
+        out = compile_catalog(args.output)
+        print(f"Wrote {out} ({out.stat().st_size:,} bytes)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Top-K selection for the result sections.
+
+The app shows at most 5–10 jobs per section, so instead of sorting the whole
+catalog (once per section) each section is a partial selection over a mask:
+O(N) to find the K-th best value, then a sort of just the survivors.
+"""
+
+import numpy as np
+
+SECTION_SIZE = 5
+SUPPRESSED_SIZE = 10
+SECTIONS = ("best", "strengths", "potential", "suppressed")  # display order
+
+
+def top_k(score: np.ndarray, k: int, mask: np.ndarray | None = None, tiebreak: np.ndarray | None = None) -> np.ndarray:
+    """Indices of the `k` best jobs, ordered as a stable descending sort would.
+
+    Order is `score` descending, then `tiebreak` descending (if given), then
+    catalog index ascending. Only jobs where `mask` is True are considered.
+    """
+    idx = np.arange(len(score)) if mask is None else np.flatnonzero(mask)
+    if k <= 0:
+        return idx[:0]
+    if len(idx) > k:
+        v = score[idx]
+        kth = np.partition(v, len(v) - k)[len(v) - k]
+        idx = idx[v >= kth]  # keep every tie at the boundary so ordering stays exact
+    keys = (idx, -score[idx]) if tiebreak is None else (idx, -tiebreak[idx], -score[idx])
+    return idx[np.lexsort(keys)[:k]]
+
+
+def iter_sections(
+    score: np.ndarray,
+    strength: np.ndarray,
+    edu_gap: np.ndarray,
+    aligned: np.ndarray,
+    restrict: bool,
+    has_domains: bool,
+    with_suppressed: bool = True,
+    size: int = SECTION_SIZE,
+    suppressed_size: int = SUPPRESSED_SIZE,
+):
+    """Top-K job indices per result section, one section at a time, as `(name, indices)` in display order.
+
+    `restrict` limits the aligned sections to `aligned` jobs (strict alignment
+    with user domains). The suppressed section lists jobs outside the user's
+    domains, or everything if the user gave none.
+    """
+    visible = aligned if restrict else np.ones(len(score), dtype=bool)
+    yield "best", top_k(score, size, visible)
+    yield "strengths", top_k(strength, size, visible, tiebreak=score)
+    yield "potential", top_k(score, size, visible & (np.round(edu_gap, 2) > 0.01))
+    if with_suppressed:
+        yield "suppressed", top_k(score, suppressed_size, ~aligned if has_domains else None)
@@ -0,0 +1,275 @@
+"""Scoring rules as data: fit weights, penalties and skill boosts.
+
+The numbers that turn fit components into a final score live in a versioned
+JSON file (`scoring.json`; A/B variants as `scoring.<variant>.json` next to
+it) rather than in code. `compile_config` turns one into a `ScoringConfig`
+once, at load time:
+
+    keywords        named keyword flags: words looked for in job titles / families
+    weights         W_P, W_A, W_C of the base fit
+    exclusion       penalty by number of conflicting avoid-flags (lookup array per catalog)
+    education       per edu mode, a flat penalty or a per-gap rate with a cap
+    alignment       suppression of jobs outside the user's domains
+    skill_boosts    per skill, multipliers for keyword flags (first hit wins), capped
+    strength_bonus  per skill, points added to keyword-flag hits in the Strengths ranking
+
+Boosts and bonuses refer to keyword flags by name and become arrays indexed
+by `JobFeatures.keyword_flags`, built once per selected-skill set, so scoring
+with a config is the same array arithmetic as with hard-coded numbers. The
+flags themselves are computed per catalog for the config's keywords
+(`JobFeatures.with_keywords`, `store.Snapshot.features_for`). `ConfigStore` re-reads a file
+once it changes, so a new config takes effect without a restart; anything
+derived from scores should be keyed by `ScoringConfig.digest`.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from cache import canonical_hash
+from features import MAX_KEYWORD_FLAGS, KeywordRules
+from inputs import EDU_MODES
+
+CONFIG_DIR = Path(__file__).parent
+DEFAULT_PATH = CONFIG_DIR / "scoring.json"
+CHECK_INTERVAL = 2.0  # seconds between re-stats of a config file
+
+_VARIANT = re.compile(r"[A-Za-z0-9_-]+")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class EducationRule:
+    """Penalty for a positive education gap: `min(cap, gap * per_gap)`, or a flat `cap`."""
+
+    per_gap: float | None  # None: flat
+    cap: float
+
+    def penalties(self, gap: np.ndarray) -> np.ndarray:
+        if self.per_gap is None:
+            pen = np.full(len(gap), self.cap)
+        else:
+            pen = np.minimum(self.cap, gap * self.per_gap)
+        return np.where(gap > 0, pen, 0.0)
+
+
+@dataclass(frozen=True)
+class ScoringConfig:
+    """A compiled scoring config; see the module docstring for the fields."""
+
+    version: str
+    digest: str  # hash of the config contents
+    keywords: KeywordRules
+    weights: tuple[float, float, float]  # P, A, C
+    exclusion_step: float
+    exclusion_cap: float
+    education: dict[str, EducationRule]
+    outside_penalty: float
+    boost_rules: tuple[tuple[str, tuple[tuple[int, float], ...]], ...]
+    boost_cap: float
+    bonus_rules: tuple[tuple[str, tuple[tuple[int, float], ...]], ...]
+    _tables: dict = field(default_factory=dict, repr=False, compare=False)
+
+    @property
+    def scored_skills(self) -> tuple[str, ...]:
+        """Skills that change scores; any other selected skill is display-only."""
+        skills = [s for s, _ in self.boost_rules]
+        return tuple(skills + [s for s, _ in self.bonus_rules if s not in skills])
+
+    def exclusion_penalties(self, conflicts: np.ndarray, n_keys: int) -> np.ndarray:
+        """Penalty for each count of conflicting avoid-flags, out of `n_keys` X keys."""
+        key = ("exclusion", n_keys)
+        table = self._tables.get(key)
+        if table is None:
+            table = np.minimum(np.arange(n_keys + 1) * self.exclusion_step, self.exclusion_cap)
+            table = self._tables.setdefault(key, table)
+        return table[conflicts]
+
+    def boost_table(self, skills: list[str]) -> np.ndarray | None:
+        """Boost factor per keyword-flag value for `skills` (None: no boost applies)."""
+        return self._table("boost", self.boost_rules, skills)
+
+    def bonus_table(self, skills: list[str]) -> np.ndarray | None:
+        """Strengths-ranking points per keyword-flag value for `skills` (None: no bonus applies)."""
+        return self._table("bonus", self.bonus_rules, skills)
+
+    def _table(self, kind: str, rules, skills: list[str]) -> np.ndarray | None:
+        chosen = tuple(i for i, (skill, _) in enumerate(rules) if skill in skills)
+        if not chosen:
+            return None
+        key = (kind, chosen)
+        table = self._tables.get(key)
+        if table is None:
+            flags = np.arange(1 << len(self.keywords.names))  # every keyword_flags combination
+            if kind == "boost":
+                table = np.ones(len(flags))
+                for i in chosen:
+                    table *= _first_hit(flags, rules[i][1], 1.0)
+                table = np.minimum(table, self.boost_cap)
+            else:
+                table = np.zeros(len(flags))
+                for i in chosen:
+                    table += _first_hit(flags, rules[i][1], 0.0)
+            table = self._tables.setdefault(key, table)
+        return table
+
+
+def _first_hit(flags: np.ndarray, matches: tuple[tuple[int, float], ...], default: float) -> np.ndarray:
+    """Per flag value, the value of the first matching (flag, value) rule, else `default`."""
+    out = default
+    for flag, value in reversed(matches):
+        out = np.where(flags & flag, value, out)
+    return out
+
+
+def _number(section: dict, key: str, where: str, low: float = 0.0, high: float | None = None) -> float:
+    value = section.get(key) if isinstance(section, dict) else None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{where}.{key} must be a number")
+    value = float(value)
+    if value < low or (high is not None and value > high):
+        raise ValueError(f"{where}.{key} must be between {low} and {high if high is not None else 'inf'}")
+    return value
+
+
+def _keyword_rules(section) -> KeywordRules:
+    if not isinstance(section, dict) or not section:
+        raise ValueError('keywords must map flag names to {"title": [...], "family": [...]}')
+    if len(section) > MAX_KEYWORD_FLAGS:
+        raise ValueError(f"keywords: at most {MAX_KEYWORD_FLAGS} flags")
+    title, family = [], []
+    for name, rule in section.items():
+        where = f"keywords[{name!r}]"
+        if not isinstance(rule, dict) or not rule or set(rule) - {"title", "family"}:
+            raise ValueError(f'{where} must be {{"title": [...], "family": [...]}} (either or both)')
+        for key, out in (("title", title), ("family", family)):
+            words = rule.get(key, [])
+            if not isinstance(words, list) or not all(isinstance(w, str) and w for w in words):
+                raise ValueError(f"{where}.{key} must be a list of words")
+            out.append(tuple(w.lower() for w in words))
+    return KeywordRules(names=tuple(section), title=tuple(title), family=tuple(family), digest=canonical_hash(section)[:16])
+
+
+def _flag_rules(section, where: str, keywords: KeywordRules) -> tuple[tuple[str, tuple[tuple[int, float], ...]], ...]:
+    if not isinstance(section, dict):
+        raise ValueError(f"{where} must be an object of skill -> [[flag, value], ...]")
+    rules = []
+    for skill, matches in section.items():
+        if not isinstance(matches, list):
+            raise ValueError(f"{where}[{skill!r}] must be a list of [flag, value]")
+        compiled = []
+        for match in matches:
+            if not (isinstance(match, list) and len(match) == 2 and match[0] in keywords.names):
+                raise ValueError(f"{where}[{skill!r}]: expected [flag, value] with flag in {', '.join(keywords.names)}")
+            compiled.append((keywords.bit(match[0]), _number({"value": match[1]}, "value", f"{where}[{skill!r}]")))
+        rules.append((skill, tuple(compiled)))
+    return tuple(rules)
+
+
+def compile_config(raw: dict) -> ScoringConfig:
+    """Validate a config as loaded from JSON and compile it. Raises ValueError if malformed."""
+    if not isinstance(raw, dict) or not isinstance(raw.get("version"), (str, int)):
+        raise ValueError("scoring config must be an object with a version")
+    weights = raw.get("weights")
+    exclusion = raw.get("exclusion")
+    education = raw.get("education")
+    if not isinstance(education, dict) or set(education) != set(EDU_MODES):
+        raise ValueError(f"education must map each edu mode ({', '.join(EDU_MODES)}) to a rule")
+    rules = {}
+    for mode, rule in education.items():
+        where = f"education[{mode!r}]"
+        if isinstance(rule, dict) and "flat" in rule:
+            rules[mode] = EducationRule(per_gap=None, cap=_number(rule, "flat", where, high=1.0))
+        else:
+            rules[mode] = EducationRule(per_gap=_number(rule, "per_gap", where), cap=_number(rule, "max", where, high=1.0))
+    boosts = raw.get("skill_boosts")
+    if not isinstance(boosts, dict):
+        raise ValueError("skill_boosts must be an object with max and rules")
+    keywords = _keyword_rules(raw.get("keywords"))
+
+    return ScoringConfig(
+        version=str(raw["version"]),
+        digest=canonical_hash(raw)[:16],
+        keywords=keywords,
+        weights=(_number(weights, "P", "weights"), _number(weights, "A", "weights"), _number(weights, "C", "weights")),
+        exclusion_step=_number(exclusion, "per_conflict", "exclusion"),
+        exclusion_cap=_number(exclusion, "max", "exclusion", high=1.0),
+        education=rules,
+        outside_penalty=_number(raw.get("alignment"), "outside_penalty", "alignment", high=1.0),
+        boost_rules=_flag_rules(boosts.get("rules"), "skill_boosts.rules", keywords),
+        boost_cap=_number(boosts, "max", "skill_boosts"),
+        bonus_rules=_flag_rules(raw.get("strength_bonus", {}), "strength_bonus", keywords),
+    )
+
+
+def load_config(path: Path = DEFAULT_PATH) -> ScoringConfig:
+    """Read and compile the config at `path`. Raises OSError or ValueError."""
+    with open(path, encoding="utf-8") as f:
+        return compile_config(json.load(f))
+
+
+DEFAULT_CONFIG = load_config()
+
+
+class ConfigStore:
+    """Serves the compiled config of each variant, reloading a file once it changes.
+
+    Variant None is `scoring.json`; variant "b" is `scoring.b.json` in the
+    same folder (e.g. one per tenant or A/B arm).
+    """
+
+    def __init__(self, directory: Path = CONFIG_DIR, check_interval: float = CHECK_INTERVAL):
+        self.directory = Path(directory)
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._configs: dict[str | None, tuple[ScoringConfig, str, float]] = {}  # variant -> (config, file version, checked)
+        self._lock = threading.Lock()
+
+    def path(self, variant: str | None = None) -> Path:
+        if variant is None:
+            return self.directory / DEFAULT_PATH.name
+        if not _VARIANT.fullmatch(variant):
+            raise ValueError(f"invalid scoring variant {variant!r}")
+        return self.directory / f"scoring.{variant}.json"
+
+    def current(self, variant: str | None = None) -> ScoringConfig:
+        """The latest config of `variant`.
+
+        Raises FileNotFoundError for an unknown variant and ValueError if its
+        first load is malformed; later bad edits keep the previous config.
+        """
+        entry = self._configs.get(variant)
+        if entry is not None and time.monotonic() - entry[2] < self.check_interval:
+            return entry[0]
+        with self._lock:
+            entry = self._configs.get(variant)
+            if entry is None or time.monotonic() - entry[2] >= self.check_interval:
+                entry = self._refresh(variant, entry)
+                self._configs[variant] = entry
+            return entry[0]
+
+    def _refresh(self, variant: str | None, entry):
+        path = self.path(variant)
+        try:
+            stat = path.stat()
+            version = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+            if entry is not None and entry[1] == version:
+                return entry[0], version, time.monotonic()
+            config = load_config(path)
+        except (OSError, ValueError) as e:
+            if entry is None:
+                raise
+            # e.g. a half-written edit: keep the loaded config, retry on the next check.
+            logger.warning("reload of %s failed, keeping version %s: %s", path, entry[0].version, e)
+            return entry[0], entry[1], time.monotonic()
+        if entry is not None:
+            self.reloads += 1
+            logger.info("reloaded %s: version %s -> %s", path.name, entry[0].version, config.version)
+        return config, version, time.monotonic()
@@ -0,0 +1,264 @@
+"""Batch scoring service: a small asyncio HTTP/JSON server over `engine`.
+
+    python service.py --port 8080
+
+Endpoints:
+
+    GET  /health   dataset name, version and job count, scoring config version (both are
+                   reloaded when their file changes)
+    GET  /stats    request/profile counters, measured throughput and per-stage timings
+                   (stage timings only with CAREER_FIT_TELEMETRY=1, see telemetry.py)
+    POST /rank     {"profiles": [profile, ...], "size": 5, "suppressed_size": 10, "scoring": "b", "save": true}
+                   -> {"results": [{"id": ..., "sections": {...}} | {"id": ..., "error": ...}], ...}
+
+"scoring" is optional and names a scoring config variant (`scoring.b.json`,
+e.g. per tenant or A/B arm; see scoring.py); the default is scoring.json.
+
+Profiles use the shape documented in engine.py; an optional "id" is echoed
+back. With "save": true, ranked profiles that have a string "id" are stored
+with their top results in the assessment database (see assessments.py), so
+`python assessments.py rescore` re-ranks them when the catalog changes; the
+response reports "saved". Scoring runs in a thread pool so the event loop keeps accepting
+connections while numpy does the work.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import telemetry
+from assessments import TOP_K, Assessment, AssessmentStore, rows_sections
+from engine import rank_profile
+from ranking import SECTION_SIZE, SUPPRESSED_SIZE
+from scoring import ConfigStore, ScoringConfig
+from store import CatalogStore
+
+MAX_BODY_BYTES = 32 * 1024 * 1024
+MAX_PROFILES_PER_REQUEST = 10_000
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ScoringService:
+    """Serves HTTP connections over the current catalog snapshot and scoring configs (reloaded when their files change)."""
+
+    def __init__(self, workers: int):
+        self.store = CatalogStore()
+        self.store.current()  # fail fast if there is no dataset
+        self.scoring = ConfigStore()
+        self.scoring.current()  # ... or no valid scoring config
+        self.assessments = AssessmentStore()  # the file is created by the first save
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="score")
+        self.started = time.time()
+        self.requests = 0
+        self.profiles = 0
+        self.errors = 0
+        self.scoring_seconds = 0.0
+
+    # -- scoring --------------------------------------------------------
+    def _rank_batch(
+        self, profiles: list, size: int, suppressed_size: int, config: ScoringConfig, save: bool = False
+    ) -> tuple[list[dict], int]:
+        """Results per profile, and how many were saved."""
+        snapshot = self.store.current()  # one version for the whole batch
+        out, saved = [], []
+        for n, profile in enumerate(profiles):
+            pid = profile.get("id", n) if isinstance(profile, dict) else n
+            try:
+                with telemetry.trace("rank_profile", enabled=telemetry.ENABLED):
+                    sections = rank_profile(
+                        profile, snapshot.catalog, snapshot.features_for(config), size, suppressed_size,
+                        index=snapshot.index_for(config), config=config,
+                    )
+                out.append({"id": pid, "sections": sections})
+            except (ValueError, TypeError, KeyError) as e:
+                out.append({"id": pid, "error": str(e)})
+                continue
+            if save and isinstance(pid, str):
+                top_k = min(size, TOP_K)
+                stored = {k: v for k, v in profile.items() if k != "id"}
+                saved.append(Assessment(pid, stored, rows_sections(sections, top_k), snapshot.id, config.digest, top_k))
+        if saved:
+            self.assessments.save(saved)
+        return out, len(saved)
+
+    async def rank(self, payload) -> dict:
+        if not isinstance(payload, dict) or not isinstance(payload.get("profiles"), list):
+            raise HTTPError(400, 'body must be {"profiles": [...]}')
+        profiles = payload["profiles"]
+        if len(profiles) > MAX_PROFILES_PER_REQUEST:
+            raise HTTPError(413, f"at most {MAX_PROFILES_PER_REQUEST} profiles per request")
+        try:
+            size = int(payload.get("size", SECTION_SIZE))
+            suppressed_size = int(payload.get("suppressed_size", SUPPRESSED_SIZE))
+        except (TypeError, ValueError):
+            raise HTTPError(400, "size and suppressed_size must be integers")
+        variant = payload.get("scoring")
+        if variant is not None and not isinstance(variant, str):
+            raise HTTPError(400, "scoring must be a config variant name")
+        try:
+            config = self.scoring.current(variant)
+        except FileNotFoundError:
+            raise HTTPError(400, f"unknown scoring variant {variant!r}")
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        save = payload.get("save", False)
+        if not isinstance(save, bool):
+            raise HTTPError(400, "save must be true or false")
+
+        t0 = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            results, saved = await loop.run_in_executor(
+                self.pool, self._rank_batch, profiles, size, suppressed_size, config, save
+            )
+        except sqlite3.Error as e:
+            raise HTTPError(503, f"assessments could not be saved: {e}")
+        elapsed = time.perf_counter() - t0
+
+        self.profiles += len(profiles)
+        self.errors += sum(1 for r in results if "error" in r)
+        self.scoring_seconds += elapsed
+        return {
+            "results": results,
+            "scoring": config.version,
+            "saved": saved,
+            "elapsed_ms": round(elapsed * 1000.0, 2),
+            "profiles_per_sec": round(len(profiles) / elapsed, 1) if elapsed > 0 else None,
+        }
+
+    def stats(self) -> dict:
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "profiles": self.profiles,
+            "profile_errors": self.errors,
+            "scoring_seconds": round(self.scoring_seconds, 3),
+            "profiles_per_sec": round(self.profiles / self.scoring_seconds, 1) if self.scoring_seconds else None,
+            "stages": telemetry.summary(),
+        }
+
+    # -- HTTP -------------------------------------------------------------
+    async def dispatch(self, method: str, path: str, body: bytes) -> dict:
+        path = path.split("?", 1)[0]
+        if path == "/health":
+            if method != "GET":
+                raise HTTPError(405, "use GET")
+            snapshot = self.store.current()
+            return {
+                "status": "ok",
+                "dataset": snapshot.name,
+                "version": snapshot.version,
+                "reloads": self.store.reloads,
+                "jobs": len(snapshot.catalog),
+                "candidate_index": snapshot.index is not None,
+                "scoring": self.scoring.current().version,
+                "scoring_reloads": self.scoring.reloads,
+            }
+        if path == "/stats":
+            if method != "GET":
+                raise HTTPError(405, "use GET")
+            return self.stats()
+        if path == "/rank":
+            if method != "POST":
+                raise HTTPError(405, "use POST")
+            try:
+                payload = json.loads(body or b"null")
+            except ValueError as e:
+                raise HTTPError(400, f"invalid JSON: {e}")
+            return await self.rank(payload)
+        raise HTTPError(404, f"no route for {path}")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "malformed request line"}, keep_alive=False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                self.requests += 1
+                try:
+                    length = int(headers.get("content-length", "0"))
+                    if length > MAX_BODY_BYTES:
+                        raise HTTPError(413, f"body larger than {MAX_BODY_BYTES} bytes")
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = 200, await self.dispatch(method, path, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                    keep_alive = keep_alive and e.status != 413
+                except ValueError:
+                    status, payload, keep_alive = 400, {"error": "invalid Content-Length"}, False
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: dict, keep_alive: bool) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(host: str, port: int, workers: int) -> None:
+    service = ScoringService(workers)
+    server = await asyncio.start_server(service.handle, host, port)
+    snapshot = service.store.current()
+    print(f"Serving {len(snapshot.catalog)} jobs from {snapshot.name} on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Career-fit batch scoring service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="scoring threads")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""Shared, read-only catalog store with versioned hot reload.
+
+Each process keeps one `CatalogStore` (the app in `st.cache_resource`, the
+service on its instance). It serves the current `Snapshot`: the catalog,
+feature index and candidate index of one version of the dataset. The big
+arrays are stored once per host, not once per process:
+
+- the JSON dataset is compiled once to `<name>.cfcat` (see catalog.py) and
+  memory-mapped, so every process reads the same page-cache copy;
+- the feature arrays are written once to `<name>.cffeat` next to it and
+  memory-mapped the same way, so `job_domains` runs once per dataset
+  version instead of once per process. Its keyword flags follow the
+  default scoring config; `Snapshot.features_for` re-flags them in memory
+  for configs with other keyword rules.
+
+The candidate index (very large catalogs only) is clustered with the
+default scoring weights; `Snapshot.index_for` builds one per other set of
+weights.
+
+Both files are written under a temp name and renamed into place. Processes
+that race to build them never see a partial file, and sessions still holding
+an old snapshot keep reading the old (unlinked) mapping. `current()`
+re-stats the dataset at most every `check_interval` seconds; once it has
+changed, the next call loads a new snapshot with a new `version`, without
+restarting the worker. The version is the size and mtime of the JSON the
+compiled catalog was built from (stamped in its header), so it always names
+the data actually served. Anything derived from a snapshot (result caches,
+incremental scorers, stored rankings) should be keyed by `snapshot.version`.
+
+If the dataset folder is not writable, the store falls back to
+`engine.load_jobs` and builds everything in-process.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+import telemetry
+from ann import CandidateIndex
+from catalog import SUFFIX as CATALOG_SUFFIX
+from catalog import Catalog, StringColumn, compile_catalog, is_fresh, load_catalog, source_stamp
+from engine import CATALOG_CANDIDATES, load_candidate_index, load_jobs
+from features import DOMAIN_BITS, JobFeatures, KeywordRules, build_job_features
+from scoring import DEFAULT_CONFIG, ScoringConfig
+
+CHECK_INTERVAL = 2.0  # seconds between dataset stat checks
+FEATURES_SUFFIX = ".cffeat"
+
+logger = logging.getLogger("career_fit.store")
+
+# Layout (little-endian, every section 8-byte aligned):
+#
+#   header      magic, version, n_jobs, catalog size, catalog mtime_ns, table size, keyword rules digest
+#   table       JSON list of the distinct domain tuples
+#   domain_id   uint16 index into the table per job
+#   mask        uint16 domain bitmask per job
+#   flags       uint8 keyword flags per job
+#   required    float64 required education per job
+#
+# The catalog size/mtime tie the file to the exact .cfcat it was built from,
+# the digest to the keyword rules its flags were computed with.
+_MAGIC = b"CFFEAT\x00\x00"
+_VERSION = 2
+_HEADER = struct.Struct("<8sIIqqI16s")
+
+
+def _pad(n: int) -> int:
+    return -n % 8
+
+
+def write_features(features: JobFeatures, path: Path, catalog_stat: os.stat_result) -> None:
+    """Write `features` for the compiled catalog with `catalog_stat`, atomically."""
+    table: dict[tuple[str, ...], int] = {}
+    ids = np.array([table.setdefault(tuple(d), len(table)) for d in features.domains], dtype="<u2")
+    blob = json.dumps(list(table)).encode("utf-8")
+    header = _HEADER.pack(
+        _MAGIC, _VERSION, len(ids), catalog_stat.st_size, catalog_stat.st_mtime_ns, len(blob),
+        features.keywords.encode("ascii"),
+    )
+    sections = [
+        header,
+        blob,
+        ids.tobytes(),
+        features.domain_mask.astype("<u2").tobytes(),
+        features.keyword_flags.astype("u1").tobytes(),
+        features.required_edu.astype("<f8").tobytes(),
+    ]
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as f:
+        for section in sections:
+            f.write(section + b"\x00" * _pad(len(section)))
+    os.replace(tmp, path)
+
+
+def read_features(path: Path, catalog_stat: os.stat_result, keywords: KeywordRules) -> JobFeatures:
+    """Memory-map a features file. Raises ValueError if it is invalid or built for another catalog or keyword rules."""
+    with Path(path).open("rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(buf) < _HEADER.size:
+        raise ValueError(f"{path}: truncated features header")
+    magic, version, n, size, mtime_ns, table_size, digest = _HEADER.unpack_from(buf, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"{path}: not a version {_VERSION} features file")
+    if (size, mtime_ns) != (catalog_stat.st_size, catalog_stat.st_mtime_ns):
+        raise ValueError(f"{path}: built for a different catalog")
+    if digest.rstrip(b"\x00").decode("ascii", "replace") != keywords.digest:
+        raise ValueError(f"{path}: built with different keyword rules")
+
+    pos = _HEADER.size + _pad(_HEADER.size)
+    table = [tuple(d) for d in json.loads(bytes(buf[pos:pos + table_size]).decode("utf-8"))]
+    pos += table_size + _pad(table_size)
+
+    def take(dtype: str) -> np.ndarray:
+        nonlocal pos
+        arr = np.frombuffer(buf, dtype=dtype, count=n, offset=pos)
+        pos += arr.nbytes + _pad(arr.nbytes)
+        return arr
+
+    try:
+        ids, masks, flags, required = take("<u2"), take("<u2"), take("u1"), take("<f8")
+    except ValueError as e:
+        raise ValueError(f"{path}: truncated features file ({e})") from e
+    return JobFeatures(
+        domains=StringColumn(table, ids),  # the column is generic over its table
+        domain_mask=masks,
+        required_edu=required,
+        keyword_flags=flags,
+        keywords=keywords.digest,
+        partitions={d: np.flatnonzero(masks & bit) for d, bit in DOMAIN_BITS.items()},
+    )
+
+
+def load_shared(source: Path, keywords: KeywordRules = DEFAULT_CONFIG.keywords) -> tuple[Catalog, JobFeatures]:
+    """Catalog and features of `source` from the host-wide compiled files, building them if stale.
+
+    `source` is a JSON dataset (compiled next to itself) or a `.cfcat` file.
+    Raises OSError if the files can neither be read nor written.
+    """
+    compiled = source.with_suffix(CATALOG_SUFFIX)
+    catalog = None
+    if is_fresh(compiled, source):
+        stat = compiled.stat()
+        try:
+            with telemetry.span("load_catalog"):
+                catalog = load_catalog(compiled)
+        except ValueError:
+            if compiled == source:
+                raise
+            # older format version or corrupt: rebuild it below
+    if catalog is None:
+        with telemetry.span("compile_catalog"):
+            compile_catalog(source, compiled)
+        stat = compiled.stat()
+        with telemetry.span("load_catalog"):
+            catalog = load_catalog(compiled)
+    path = compiled.with_suffix(FEATURES_SUFFIX)
+    try:
+        with telemetry.span("load_features"):
+            return catalog, read_features(path, stat, keywords)
+    except (OSError, ValueError):
+        pass  # missing, stale or corrupt: rebuild
+    with telemetry.span("build_features"):
+        features = build_job_features(catalog, keywords)
+    write_features(features, path, stat)
+    return catalog, features
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """One loaded version of the dataset."""
+
+    catalog: Catalog
+    features: JobFeatures
+    index: CandidateIndex | None  # None: catalog small enough to score exhaustively
+    name: str  # dataset file name
+    version: str  # changes whenever the dataset file does
+    _features: dict = field(default_factory=dict, repr=False, compare=False)  # keyword rules digest -> JobFeatures
+    _indexes: dict = field(default_factory=dict, repr=False, compare=False)  # P/A/C weights -> CandidateIndex
+
+    @property
+    def id(self) -> str:
+        """Identifies this version of the dataset (e.g. in cache keys and stored rankings)."""
+        return f"{self.name}:{self.version}"
+
+    def features_for(self, config: ScoringConfig) -> JobFeatures:
+        """`features` with the keyword flags of `config`, computed once per set of keyword rules."""
+        keywords = config.keywords
+        if keywords.digest == self.features.keywords:
+            return self.features
+        features = self._features.get(keywords.digest)
+        if features is None:
+            with telemetry.span("keyword_flags"):
+                features = self._features.setdefault(keywords.digest, self.features.with_keywords(self.catalog, keywords))
+        return features
+
+    def index_for(self, config: ScoringConfig) -> CandidateIndex | None:
+        """`index` clustered with the weights of `config`, built once per set of weights (None: score exhaustively)."""
+        if self.index is None or self.index.weights == config.weights:
+            return self.index
+        index = self._indexes.get(config.weights)
+        if index is None:
+            index = self._indexes.setdefault(config.weights, load_candidate_index(self.catalog, 0, config))
+        return index
+
+
+class CatalogStore:
+    """Serves the current `Snapshot` of the first dataset in `candidates`, reloading it when it changes."""
+
+    def __init__(self, candidates: list[Path] = CATALOG_CANDIDATES, check_interval: float = CHECK_INTERVAL):
+        self.candidates = candidates
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._snapshot: Snapshot | None = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _source(self) -> tuple[Path, str] | None:
+        """First dataset that exists (JSON preferred over its compiled catalog) and its version."""
+        for p in self.candidates:
+            for path in (p, p.with_suffix(CATALOG_SUFFIX)):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                return path, f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+        return None
+
+    def current(self) -> Snapshot:
+        """The latest snapshot. Raises FileNotFoundError if no dataset was ever found."""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked < self.check_interval:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None or time.monotonic() - self._checked >= self.check_interval:
+                self._refresh()
+                self._checked = time.monotonic()
+            return self._snapshot
+
+    def _refresh(self) -> None:
+        source = self._source()
+        if source is None:
+            if self._snapshot is None:
+                raise FileNotFoundError("Jobs dataset not found. Put jobs_onet_mvp.json in the same folder as app.py.")
+            return  # being replaced right now: keep serving the loaded version
+        path, version = source
+        if self._snapshot is not None and (self._snapshot.name, self._snapshot.version) == (path.name, version):
+            return
+        try:
+            self._snapshot = self._load(path, version)
+        except (OSError, ValueError) as e:
+            if self._snapshot is None:
+                raise
+            # e.g. the new file is still being written: keep the old version, retry on the next check.
+            logger.warning("reload of %s failed, keeping version %s: %s", path, self._snapshot.version, e)
+
+    def _load(self, path: Path, version: str) -> Snapshot:
+        with telemetry.trace("load_jobs"):
+            try:
+                catalog, features = load_shared(path)
+                stamp = source_stamp(path.with_suffix(CATALOG_SUFFIX))
+                if stamp is not None and path.suffix != CATALOG_SUFFIX:
+                    # The JSON the loaded catalog was compiled from, which may already
+                    # differ from the one stat'ed: the next check then reloads again.
+                    version = f"{stamp[1]:x}-{stamp[0]:x}"
+            except OSError:
+                if path.suffix == CATALOG_SUFFIX:
+                    raise
+                catalog, features, _ = load_jobs([path])  # read-only folder: build in-process
+            index = load_candidate_index(catalog)
+        if self._snapshot is not None:
+            self.reloads += 1
+            logger.info("reloaded %s: version %s -> %s", path.name, self._snapshot.version, version)
+        return Snapshot(catalog=catalog, features=features, index=index, name=path.name, version=version)
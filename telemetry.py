@@ -0,0 +1,162 @@
+"""Lightweight stage timers and counters for the scoring hot path.
+
+Code marks stages with `span(name)` and bumps counters with `count(name)`.
+Both only record while a `trace` is active in the current context (thread
+or task), so with tracing off a span costs one context-variable lookup.
+
+    with telemetry.trace("compute", sink=recent) as t:
+        with telemetry.span("score"):
+            ...
+    t.as_dict()  # {"name", "total_ms", "spans": [...], "counters": {...}}
+
+Finished traces are appended to `sink` (e.g. a bounded deque per session),
+folded into process-wide per-stage aggregates (`summary()`), and logged as
+one JSON line on the "career_fit.telemetry" logger. Set
+CAREER_FIT_TELEMETRY=1 to turn tracing on everywhere and print those lines
+to stderr.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+ENABLED = os.environ.get("CAREER_FIT_TELEMETRY", "").lower() not in ("", "0", "false", "no")
+
+logger = logging.getLogger("career_fit.telemetry")
+if ENABLED and not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+_current: ContextVar["Trace | None"] = ContextVar("career_fit_trace", default=None)
+
+
+class Trace:
+    """Spans and counters recorded during one request."""
+
+    __slots__ = ("name", "started", "t0", "total_ms", "spans", "counters")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.time()
+        self.t0 = time.perf_counter()
+        self.total_ms = 0.0
+        self.spans: list[tuple[str, float, float]] = []  # (name, start offset ms, duration ms)
+        self.counters: dict[str, int] = {}
+
+    def stage_ms(self) -> dict[str, float]:
+        """Total milliseconds per span name."""
+        out: dict[str, float] = {}
+        for name, _, ms in self.spans:
+            out[name] = out.get(name, 0.0) + ms
+        return out
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "started": round(self.started, 3),
+            "total_ms": round(self.total_ms, 3),
+            "spans": [{"name": n, "start_ms": round(s, 3), "ms": round(ms, 3)} for n, s, ms in sorted(self.spans, key=lambda x: x[1])],
+            "counters": dict(self.counters),
+        }
+
+
+class _Span:
+    __slots__ = ("trace", "name", "t0")
+
+    def __init__(self, trace: Trace, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        t1 = time.perf_counter()
+        self.trace.spans.append((self.name, (self.t0 - self.trace.t0) * 1000.0, (t1 - self.t0) * 1000.0))
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str):
+    """Context manager timing stage `name` within the active trace (no-op without one)."""
+    t = _current.get()
+    return _NULL_SPAN if t is None else _Span(t, name)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add `n` to counter `name` of the active trace (no-op without one)."""
+    t = _current.get()
+    if t is not None:
+        t.counters[name] = t.counters.get(name, 0) + n
+
+
+def active() -> bool:
+    return _current.get() is not None
+
+
+# Process-wide per-stage aggregates: name -> [calls, total ms, max ms].
+_totals: dict[str, list] = {}
+_lock = threading.Lock()
+
+
+def _record(t: Trace) -> None:
+    stages = t.stage_ms()
+    stages[t.name] = t.total_ms
+    with _lock:
+        for name, ms in stages.items():
+            agg = _totals.setdefault(name, [0, 0.0, 0.0])
+            agg[0] += 1
+            agg[1] += ms
+            agg[2] = max(agg[2], ms)
+
+
+def summary() -> dict[str, dict]:
+    """Calls, mean and max milliseconds per stage across all finished traces."""
+    with _lock:
+        return {
+            name: {"calls": calls, "mean_ms": round(total / calls, 3), "max_ms": round(peak, 3)}
+            for name, (calls, total, peak) in _totals.items()
+        }
+
+
+@contextmanager
+def trace(name: str, sink=None, enabled: bool = True):
+    """Record spans and counters for the enclosed block.
+
+    Yields the `Trace` (None when `enabled` is false, in which case nothing
+    is recorded). On exit the trace is appended to `sink` if given.
+    """
+    if not enabled:
+        yield None
+        return
+    t = Trace(name)
+    token = _current.set(t)
+    try:
+        yield t
+    finally:
+        t.total_ms = (time.perf_counter() - t.t0) * 1000.0
+        _current.reset(token)
+        if sink is not None:
+            sink.append(t)
+        _record(t)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(t.as_dict(), separators=(",", ":")))
@@ -0,0 +1,66 @@
+"""Batch, incremental and ranked scoring against the per-job `fit_score` reference."""
+
+import json
+import random
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import DATASET, synthetic_profiles
+from engine import adjust_scores, load_jobs, profile_options, rank, rank_profile
+from matcher import IncrementalScorer, fit_score, fit_scores, fit_scores_many
+
+PROFILES = 40
+STEPS = 60
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    with DATASET.open("r", encoding="utf-8") as f:
+        jobs = json.load(f)
+    catalog, features, _ = load_jobs([DATASET])
+    return jobs, catalog, features
+
+
+def _user(profile: dict) -> dict:
+    return {k: profile[k] for k in ("P", "A", "C", "X")}
+
+
+def _reference(user: dict, jobs: list[dict]) -> np.ndarray:
+    return np.array([fit_score(user, job) for job in jobs])
+
+
+def test_fit_scores_match_reference(dataset):
+    jobs, catalog, _ = dataset
+    users = [_user(p) for p in synthetic_profiles(PROFILES, seed=11)]
+    users.append({"P": {"pace": 0.2}, "A": {}, "C": {"education": 0.1}, "X": {"sales": True, "travel": True}})
+    expected = np.stack([_reference(u, jobs) for u in users])
+    assert np.array_equal(np.stack([fit_scores(u, catalog.matrix) for u in users]), expected)
+    assert np.array_equal(fit_scores_many(users, catalog.matrix), expected)
+
+
+def test_incremental_scorer_matches_reference(dataset):
+    jobs, catalog, _ = dataset
+    rng = random.Random(12)
+    user = _user(synthetic_profiles(1, seed=12)[0])
+    scorer = IncrementalScorer(catalog.matrix)
+    for _ in range(STEPS):
+        # One key per step, as a slider or checkbox change in the app.
+        part = rng.choice("PACX")
+        key = rng.choice(list(user[part]))
+        user[part] = dict(user[part], **{key: (not user[part][key]) if part == "X" else round(rng.random(), 2)})
+        assert np.array_equal(scorer.score(user), _reference(user, jobs)), (part, key)
+
+
+def test_rank_profile_matches_reference(dataset):
+    jobs, catalog, features = dataset
+    for profile in synthetic_profiles(PROFILES, seed=13):
+        opts = profile_options(profile)
+        user = _user(profile)
+        scores = adjust_scores(_reference(user, jobs), user["C"]["education"], features, **opts)
+        expected = {
+            name: [(catalog.job_ids[scores.row(i)], float(scores.final[i])) for i in idx.tolist()]
+            for name, idx in rank(scores, opts["domains"], opts["strict_alignment"]).items()
+        }
+        got = {name: [(row["job_id"], row["score"]) for row in rows] for name, rows in rank_profile(profile, catalog, features).items()}
+        assert got == expected, profile["id"]
@@ -0,0 +1,125 @@
+"""What-if sensitivity analysis: how the user's top jobs move under input changes.
+
+`what_if_variants` builds a grid of single-input changes to a profile
+(every education level, education flexibility and experience bucket, and
+±0.1 on each P/A value). `what_if` scores them all in one batched pass
+(`matcher.fit_scores_many`, then the usual penalties and boosts per
+variant) and reports, for each job of the current Best Fit, its score and
+Best Fit position under every variant.
+"""
+
+import copy
+from dataclasses import dataclass
+
+import numpy as np
+
+from catalog import Catalog
+from engine import adjust_scores
+from features import JobFeatures
+from inputs import EDU_LEVELS, EDU_MODES, EXPERIENCE_BUCKETS
+from matcher import fit_scores_many
+from ranking import SECTION_SIZE, top_k
+from scoring import DEFAULT_CONFIG, ScoringConfig
+from telemetry import span
+
+STEP = 0.1  # slider perturbation
+
+
+@dataclass(frozen=True)
+class Variant:
+    label: str
+    user: dict
+    edu_mode: str
+
+
+@dataclass(frozen=True)
+class WhatIf:
+    """Outcome of `what_if`; row 0 of every array is the unchanged profile."""
+
+    variants: list[Variant]
+    jobs: np.ndarray  # catalog rows of the current Best Fit, best first
+    score: np.ndarray  # (variants, jobs) final score of each of those jobs
+    rank: np.ndarray  # (variants, jobs) 1-based position in the Best Fit ordering
+    best: np.ndarray  # (variants,) catalog row ranked first under each variant (-1: none)
+
+
+def what_if_variants(user: dict, edu_mode: str, step: float = STEP) -> list[Variant]:
+    """The current profile followed by each single-input change that differs from it."""
+    variants = [Variant("Current profile", user, edu_mode)]
+
+    def vary(label: str, part: str, key: str, value: float) -> None:
+        if user.get(part, {}).get(key) == value:
+            return
+        changed = copy.deepcopy(user)
+        changed.setdefault(part, {})[key] = value
+        variants.append(Variant(label, changed, edu_mode))
+
+    for level, value in EDU_LEVELS.items():
+        vary(f"Education: {level}", "C", "education", value)
+    for bucket, value in EXPERIENCE_BUCKETS.items():
+        vary(f"Experience: {bucket} years", "C", "experience", value)
+    for mode in EDU_MODES:
+        if mode != edu_mode:
+            variants.append(Variant(f"Education flexibility: {mode}", user, mode))
+    for part in ("P", "A"):
+        for key, value in user.get(part, {}).items():
+            for delta in (-step, step):
+                moved = round(min(1.0, max(0.0, float(value) + delta)), 6)
+                vary(f"{key} {delta:+.1f}", part, key, moved)
+    return variants
+
+
+def what_if(
+    user: dict,
+    catalog: Catalog,
+    features: JobFeatures,
+    domains: list[str],
+    skills: list[str],
+    edu_mode: str,
+    strict_alignment: bool,
+    variants: list[Variant] | None = None,
+    top: int = SECTION_SIZE,
+    candidates: np.ndarray | None = None,
+    config: ScoringConfig = DEFAULT_CONFIG,
+) -> WhatIf:
+    """Score every variant (default: `what_if_variants`) and track the current Best Fit jobs.
+
+    With `candidates` (ascending catalog indices) only those jobs are scored,
+    as in `engine.score_jobs`.
+    """
+    if variants is None:
+        variants = what_if_variants(user, edu_mode)
+    matrix = catalog.matrix
+    if candidates is not None:
+        matrix, features = matrix.take(candidates), features.take(candidates)
+
+    base = fit_scores_many([v.user for v in variants], matrix, config)
+    with span("what_if.adjust"):
+        final = np.stack([
+            adjust_scores(
+                b, v.user["C"]["education"], features, domains, skills, v.edu_mode, strict_alignment, config=config
+            ).final
+            for b, v in zip(base, variants)
+        ])
+
+    with span("what_if.rank"):
+        visible = features.aligned(domains) if strict_alignment and domains else np.ones(len(matrix), dtype=bool)
+        jobs = top_k(final[0], top, visible)
+        # Best Fit order: score descending, then catalog order; hidden jobs never count.
+        shown = np.where(visible, final, -np.inf)
+        earlier = np.arange(len(matrix))
+        rank = np.zeros((len(variants), len(jobs)), dtype=np.int64)
+        for c, j in enumerate(jobs.tolist()):
+            s = final[:, j, None]
+            ahead = (shown > s) | ((shown == s) & (earlier < j))
+            rank[:, c] = ahead.sum(axis=1) + 1
+        best = np.full(len(variants), -1, dtype=np.int64)
+        for v, f in enumerate(final):
+            first = top_k(f, 1, visible)
+            if len(first):
+                best[v] = first[0]
+
+    score = final[:, jobs]
+    if candidates is not None:
+        jobs, best = candidates[jobs], np.where(best >= 0, candidates[best], -1)
+    return WhatIf(variants=variants, jobs=jobs, score=score, rank=rank, best=best)